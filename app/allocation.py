@@ -0,0 +1,336 @@
+"""
+Capacity-aware fan allocation (min-cost flow)
+Expected fans per country are spread over hotels so no hotel exceeds its
+capacity and the total score (the /best-hotels score, per fan) is minimal:
+
+    source -(demand)-> country -(score)-> hotel -(capacity)-> sink
+
+Countries are few and hotels many, so the residual graph is searched in a
+compressed form over countries only: country c reaches country c' through
+any hotel h that c' currently uses, at cost score[c, h] - score[c', h]
+(c takes the room, c' moves elsewhere). Successive shortest paths route
+the demand; a capacity or demand change evicts only the affected flow,
+reroutes it and cancels negative cycles, so a re-solve starts from the
+previous optimum instead of from scratch. Fans that fit nowhere go to an
+"unallocated" column with a large cost.
+"""
+import asyncio
+import threading
+
+import numpy as np
+from app.holds import capacity_generation
+from app.scoring import DEFAULT_WEIGHTS, Weights, compute_score
+
+# Cost per fan left without a room; far above any real score
+UNALLOCATED_COST = 1e6
+_EPSILON = 1e-6
+
+class FanAllocator:
+    """Min-cost assignment of country demand to hotel capacity, re-solvable incrementally"""
+
+    def __init__(self, rows, weights: Weights = DEFAULT_WEIGHTS):
+        """`rows` are ranking-export rows plus `capacity` (one per country/hotel/stadium candidate)"""
+        self.weights = weights
+        self.countries = sorted({row["country"] for row in rows})
+        self.hotels = sorted({row["name"] for row in rows})
+        self.country_ids = {name: i for i, name in enumerate(self.countries)}
+        self.hotel_ids = {name: i for i, name in enumerate(self.hotels)}
+        k, n = len(self.countries), len(self.hotels)
+
+        # Last column is the unallocated "hotel": open to everyone, never full
+        self.cost = np.full((k, n + 1), np.inf)
+        self.cost[:, n] = UNALLOCATED_COST
+        self.unallocated = n
+        self.stadium = {}
+        self.capacity = np.zeros(n + 1, dtype=np.int64)
+        for row in rows:
+            c, h = self.country_ids[row["country"]], self.hotel_ids[row["name"]]
+            score = compute_score(row["price"], row["distance_km"], row["rating"], weights)
+            # A hotel near two of a country's stadiums counts once, at its best score
+            if score < self.cost[c, h]:
+                self.cost[c, h] = score
+                self.stadium[c, h] = row["stadium_name"]
+            self.capacity[h] = int(row["capacity"] or 0)
+        self.base_capacity = self.capacity.copy()
+        self.demand = np.zeros(k, dtype=np.int64)
+        self.flow = np.zeros((k, n + 1), dtype=np.int64)
+        self.load = np.zeros(n + 1, dtype=np.int64)
+        self.augmentations = 0
+        self.cycles_cancelled = 0
+
+        # Compressed residual graph over countries plus the sink (index k):
+        # edge weights and the hotel each edge goes through. A country's
+        # column only changes when the set of hotels it uses changes.
+        self._weights = np.full((k + 1, k + 1), np.inf)
+        self._via = np.zeros((k + 1, k + 1), dtype=np.int64)
+        self._dirty = set(range(k))
+        # Each country's hotels cheapest first, and how far the full ones reach
+        self._order = np.argsort(self.cost, axis=1, kind="stable")
+        self._first_open = np.zeros(k, dtype=np.int64)
+        self._freed = set()
+
+    def _residual(self, h):
+        if h == self.unallocated:
+            return np.iinfo(np.int64).max
+        return int(self.capacity[h] - self.load[h])
+
+    def _move(self, c, h, amount):
+        """Change flow[c, h] by `amount`, keeping load and the cached graph in sync"""
+        before = self.flow[c, h]
+        self.flow[c, h] += amount
+        self.load[h] += amount
+        if (before == 0) != (self.flow[c, h] == 0):
+            self._dirty.add(c)
+        if amount < 0 and self.load[h] < self.capacity[h]:
+            self._freed.add(h)
+
+    def set_demand(self, country: str, fans: int):
+        """Change one country's expected fans; call solve() to re-optimize"""
+        c = self.country_ids.get(country)
+        if c is None:
+            raise ValueError(f"Unknown country '{country}'")
+        self.demand[c] = max(int(fans), 0)
+        # Drop surplus flow from the most expensive rooms first
+        excess = int(self.flow[c].sum() - self.demand[c])
+        for h in self._order[c][::-1]:
+            if excess <= 0:
+                break
+            take = min(excess, int(self.flow[c, h]))
+            if take:
+                self._move(c, h, -take)
+                excess -= take
+
+    def set_capacity(self, hotel: str, capacity: int):
+        """Change one hotel's capacity; call solve() to re-optimize"""
+        h = self.hotel_ids.get(hotel)
+        if h is None:
+            raise ValueError(f"Unknown hotel '{hotel}'")
+        capacity = max(int(capacity), 0)
+        if capacity > self.capacity[h]:
+            self._freed.add(h)
+        self.capacity[h] = capacity
+        # Evict the guests who paid the most score for this hotel
+        excess = int(self.load[h] - capacity)
+        for c in np.argsort(-self.cost[:, h], kind="stable"):
+            if excess <= 0:
+                break
+            take = min(excess, int(self.flow[c, h]))
+            if take:
+                self._move(c, h, -take)
+                excess -= take
+
+    def solve(self, demand: dict = None):
+        """Restore optimality after changes, then route all outstanding demand; returns summary()"""
+        for country, fans in (demand or {}).items():
+            self.set_demand(country, fans)
+        # Evictions can leave cheaper rearrangements behind; shortest paths
+        # are only well defined once they are gone
+        while self._cancel_negative_cycle():
+            pass
+        while True:
+            remaining = self.demand - self.flow.sum(axis=1)
+            if not remaining.any():
+                break
+            self._augment(remaining)
+        return self.summary()
+
+    def _transfers(self):
+        """Refresh the compressed residual graph and return (weights, via)"""
+        k = len(self.countries)
+        weights, via = self._weights, self._via
+        for target in self._dirty:
+            used = np.flatnonzero(self.flow[target])
+            if len(used) == 0:
+                weights[:, target] = np.inf
+                continue
+            # c -> h -> target: c takes a room target currently holds
+            swap = self.cost[:, used] - self.cost[target, used]
+            best = swap.argmin(axis=1)
+            weights[:k, target] = swap[np.arange(k), best]
+            via[:k, target] = used[best]
+            weights[target, target] = np.inf
+            # sink -> h -> target: target gives up a room entirely
+            worst = int(self.cost[target, used].argmax())
+            weights[k, target] = -self.cost[target, used[worst]]
+            via[k, target] = used[worst]
+        self._dirty.clear()
+        if any(self._residual(h) > 0 for h in self._freed):
+            # A room came free, cheaper hotels may be open again
+            self._first_open[:] = 0
+        self._freed.clear()
+        # c -> h -> sink through c's cheapest hotel with a free room
+        for c in range(k):
+            order, position = self._order[c], self._first_open[c]
+            while self._residual(order[position]) <= 0:
+                position += 1
+            self._first_open[c] = position
+            weights[c, k] = self.cost[c, order[position]]
+            via[c, k] = order[position]
+        return weights, via
+
+    def _augment(self, remaining):
+        """Push flow along one shortest source -> sink path"""
+        k = len(self.countries)
+        weights, via = self._transfers()
+        # Bellman-Ford from the source (countries with demand left start at 0)
+        dist = np.append(np.where(remaining > 0, 0.0, np.inf), np.inf)
+        parent = np.full(k + 1, -1)
+        columns = np.arange(k + 1)
+        for _ in range(k + 1):
+            candidates = dist[:, None] + weights
+            best = candidates.argmin(axis=0)
+            improved = candidates[best, columns] < dist - _EPSILON
+            if not improved.any():
+                break
+            dist = np.where(improved, candidates[best, columns], dist)
+            parent = np.where(improved, best, parent)
+
+        path = [k]
+        while parent[path[-1]] != -1 and len(path) <= k + 1:
+            path.append(int(parent[path[-1]]))
+        path.reverse()
+        amount = self._apply(path, via, limit=int(remaining[path[0]]))
+        self.augmentations += 1
+        return amount
+
+    def _apply(self, nodes, via, limit):
+        """Move `limit` (or the bottleneck) fans along a path or cycle of compressed edges"""
+        k = len(self.countries)
+        steps = [(u, v, int(via[u, v])) for u, v in zip(nodes, nodes[1:])]
+        amount = limit
+        for u, v, h in steps:
+            amount = min(amount, self._residual(h) if v == k else int(self.flow[v, h]))
+        for u, v, h in steps:
+            if u != k:
+                self._move(u, h, amount)
+            if v != k:
+                self._move(v, h, -amount)
+        return amount
+
+    def _cancel_negative_cycle(self):
+        """Find and cancel one negative residual cycle; False once the flow is optimal"""
+        k = len(self.countries)
+        weights, via = self._transfers()
+        dist = np.zeros(k + 1)
+        parent = np.full(k + 1, -1)
+        columns = np.arange(k + 1)
+        last = -1
+        for _ in range(k + 1):
+            candidates = dist[:, None] + weights
+            best = candidates.argmin(axis=0)
+            improved = candidates[best, columns] < dist - _EPSILON
+            if not improved.any():
+                return False
+            dist = np.where(improved, candidates[best, columns], dist)
+            parent = np.where(improved, best, parent)
+            last = int(np.flatnonzero(improved)[0])
+
+        # Still relaxing after k+1 rounds: walk back into the cycle
+        node = last
+        for _ in range(k + 1):
+            node = int(parent[node])
+        cycle = [node]
+        while True:
+            node = int(parent[node])
+            cycle.append(node)
+            if node == cycle[0]:
+                break
+        cycle.reverse()
+        if sum(weights[u, v] for u, v in zip(cycle, cycle[1:])) >= -_EPSILON:
+            return False
+        if self._apply(cycle, via, limit=np.iinfo(np.int64).max) == 0:
+            return False
+        self.cycles_cancelled += 1
+        return True
+
+    def assignments(self, country: str):
+        """Hotels used by one country, most fans first"""
+        c = self.country_ids[country]
+        rows = []
+        for h in np.flatnonzero(self.flow[c, :-1]):
+            rows.append({
+                "name": self.hotels[h],
+                "stadium_name": self.stadium[c, h],
+                "fans": int(self.flow[c, h]),
+                "score": float(self.cost[c, h]),
+            })
+        rows.sort(key=lambda row: (-row["fans"], row["score"], row["name"]))
+        return rows
+
+    def summary(self):
+        used = self.flow[:, :-1]
+        real = used > 0
+        return {
+            "total_fans": int(self.demand.sum()),
+            "allocated": int(used.sum()),
+            "unallocated": int(self.flow[:, -1].sum()),
+            "total_score": float((self.cost[:, :-1][real] * used[real]).sum()),
+            "hotels_used": int((self.load[:-1] > 0).sum()),
+            "hotels_full": int(((self.load[:-1] >= self.capacity[:-1]) & (self.capacity[:-1] > 0)).sum()),
+            "countries": {
+                country: {
+                    "demand": int(self.demand[c]),
+                    "allocated": int(self.flow[c, :-1].sum()),
+                    "unallocated": int(self.flow[c, -1]),
+                }
+                for c, country in enumerate(self.countries)
+            },
+        }
+
+# The last allocator is kept so the next request with the same data, hold
+# state and weights only re-solves what changed
+# (key, FanAllocator) from the last solve; the allocator is mutated by every
+# solve, so it is only touched under _current_lock
+_current = None
+_current_lock = threading.Lock()
+
+async def solve_allocation(load_rows, version: str, demand: dict, capacities: dict = None,
+                           weights: Weights = DEFAULT_WEIGHTS):
+    """Allocate `demand` (fans per country; missing countries get 0) with optional capacity overrides
+
+    `load_rows` is an async callable returning candidate rows with capacity;
+    it only runs when `version`, the weights or the capacities left by holds
+    (app.holds.capacity_generation) changed since the last call. The rows are
+    loaded on the event loop; the solve runs in a worker thread.
+    Raises ValueError for an unknown country or hotel.
+    """
+    rows = None
+    while True:
+        key = (version, capacity_generation(), weights)
+        if rows is None and (_current is None or _current[0] != key):
+            rows = await load_rows()
+        summary = await asyncio.to_thread(_solve, key, rows, demand, capacities, weights)
+        if summary is not None:
+            return summary
+        # Another solve replaced the cached allocator in the meantime; load rows and retry
+        rows = None
+
+def _solve(key, rows, demand: dict, capacities: dict, weights: Weights):
+    """Blocking part of solve_allocation; None when the cache is stale and `rows` were not loaded"""
+    global _current
+    with _current_lock:
+        if _current is None or _current[0] != key:
+            if rows is None:
+                return None
+            _current = (key, FanAllocator(rows, weights))
+        allocator = _current[1]
+
+        unknown = [country for country in demand if country not in allocator.country_ids]
+        if unknown:
+            raise ValueError(f"Unknown country(ies): {', '.join(unknown)}")
+        # Overrides are relative to the loaded capacities, not to the previous request
+        capacity = allocator.base_capacity.copy()
+        for hotel, rooms in (capacities or {}).items():
+            if hotel not in allocator.hotel_ids:
+                raise ValueError(f"Unknown hotel '{hotel}'")
+            capacity[allocator.hotel_ids[hotel]] = rooms
+        for h in np.flatnonzero(capacity[:-1] != allocator.capacity[:-1]):
+            allocator.set_capacity(allocator.hotels[h], capacity[h])
+        for country in allocator.countries:
+            allocator.set_demand(country, demand.get(country, 0))
+
+        summary = allocator.solve()
+        summary["assignments"] = {
+            country: allocator.assignments(country) for country in allocator.countries if demand.get(country)
+        }
+        return summary
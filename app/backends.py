@@ -0,0 +1,296 @@
+"""
+Pluggable recommendation backends
+Every backend answers the same queries with the same row shape
+(HotelResponse fields) through the RecommendationBackend protocol, and is
+picked by name with RECOMMENDATION_BACKEND (neo4j, memory or mock).
+"""
+from typing import AsyncIterator, Dict, List, Protocol, runtime_checkable
+import os
+import sys
+from app.database import close_drivers, ping_database, start_drivers
+from app.graph_memory import get_graph
+from app.holds import HOLD_TTL_SECONDS, HoldLedger
+from app.itinerary import ItineraryPlanner
+from app.scoring import DEFAULT_WEIGHTS, Weights
+from app.services import (
+    MATERIALIZE_RANKINGS,
+    dataset_version,
+    expire_holds_async,
+    get_best_hotels,
+    get_best_hotels_async,
+    get_best_hotels_batch_async,
+    get_itinerary_planner_async,
+    load_allocation_rows_async,
+    load_rankings_async,
+    place_hold_async,
+    ranking_index,
+    refresh_after_data_change,
+    release_hold_async,
+    stream_rankings_async,
+    update_hotel_price_async,
+)
+from app.services_mock import MOCK_DATA, MOCK_VERSION, get_best_hotels_batch_mock_async, get_best_hotels_mock, mock_hotels
+
+DEFAULT_BACKEND = os.getenv("RECOMMENDATION_BACKEND", "neo4j").lower()
+
+@runtime_checkable
+class RecommendationBackend(Protocol):
+    """What the API needs from a source of recommendations"""
+
+    name: str
+
+    async def start(self) -> None:
+        """Acquire resources (connections, indexes); raise if the backend is unusable"""
+
+    async def close(self) -> None:
+        """Release whatever start() acquired"""
+
+    async def ping(self) -> None:
+        """Cheap liveness probe; raise if the backend cannot serve queries"""
+
+    def best_hotels(self, country: str, max_price: float = None, limit: int = 5,
+                    weights: Weights = DEFAULT_WEIGHTS, normalize: str = "none", after=None) -> List[dict]:
+        """Ranked rows for one country, best first; `after` is a (score, name, stadium_name) key to page past"""
+
+    async def best_hotels_async(self, country: str, max_price: float = None, limit: int = 5,
+                                weights: Weights = DEFAULT_WEIGHTS, normalize: str = "none",
+                                after=None) -> List[dict]:
+        """Async variant of best_hotels"""
+
+    async def best_hotels_batch_async(self, queries: list) -> Dict[str, List[dict]]:
+        """Rows for several queries (dicts as built by the batch endpoint, optionally with `after`), keyed by country"""
+
+    def dataset_version(self) -> str:
+        """Changes whenever the data behind the answers changes (used for ETags)"""
+
+    async def itinerary_planner(self) -> ItineraryPlanner:
+        """Stadium x hotel cost model for multi-match itineraries"""
+
+    async def allocation_rows(self) -> List[dict]:
+        """Every candidate row plus hotel capacity, for app.allocation"""
+
+    async def place_hold(self, hotel: str, rooms: int, ttl_seconds: int = HOLD_TTL_SECONDS) -> dict:
+        """Take rooms off a hotel's capacity; None for an unknown hotel, InsufficientCapacity if full"""
+
+    async def release_hold(self, hold_id: str) -> dict:
+        """Give a hold's rooms back; None if it no longer exists"""
+
+    async def expire_holds(self) -> int:
+        """Release every hold past its TTL and return how many"""
+
+    def export_rankings(self, countries: list = None, max_price: float = None,
+                        weights: Weights = DEFAULT_WEIGHTS) -> AsyncIterator[dict]:
+        """Every candidate row with its `country`, by country name and then best first, streamed"""
+
+    async def update_hotel_price(self, hotel: str, price: float) -> List[str]:
+        """Change a hotel's price and return the countries re-ranked; None for an unknown hotel
+
+        Raises NotImplementedError on read-only backends.
+        """
+
+    async def invalidate(self) -> None:
+        """Drop cached answers and derived state after the data behind them was rewritten"""
+
+class Neo4jBackend:
+    """Cypher queries through app.services, with materialized rankings when enabled"""
+
+    name = "neo4j"
+
+    def __init__(self, materialize: bool = None):
+        self.materialize = MATERIALIZE_RANKINGS if materialize is None else materialize
+
+    async def start(self):
+        await start_drivers()
+        if self.materialize:
+            countries = await load_rankings_async()
+            print(f"✓ Materialized rankings for {len(countries)} countries")
+
+    async def close(self):
+        if self.materialize:
+            ranking_index.clear()
+        await close_drivers()
+
+    async def ping(self):
+        await ping_database()
+
+    def best_hotels(self, country, max_price=None, limit=5, weights=DEFAULT_WEIGHTS, normalize="none", after=None):
+        return get_best_hotels(country, max_price, limit, weights, normalize, after)
+
+    async def best_hotels_async(self, country, max_price=None, limit=5, weights=DEFAULT_WEIGHTS, normalize="none",
+                                after=None):
+        return await get_best_hotels_async(country, max_price, limit, weights, normalize, after)
+
+    async def best_hotels_batch_async(self, queries):
+        return await get_best_hotels_batch_async(queries)
+
+    def dataset_version(self):
+        return dataset_version()
+
+    async def itinerary_planner(self):
+        return await get_itinerary_planner_async()
+
+    async def allocation_rows(self):
+        return await load_allocation_rows_async()
+
+    async def place_hold(self, hotel, rooms, ttl_seconds=HOLD_TTL_SECONDS):
+        return await place_hold_async(hotel, rooms, ttl_seconds)
+
+    async def release_hold(self, hold_id):
+        return await release_hold_async(hold_id)
+
+    async def expire_holds(self):
+        return await expire_holds_async()
+
+    def export_rankings(self, countries=None, max_price=None, weights=DEFAULT_WEIGHTS):
+        return stream_rankings_async(countries, max_price, weights)
+
+    async def update_hotel_price(self, hotel, price):
+        return await update_hotel_price_async(hotel, price)
+
+    async def invalidate(self):
+        await refresh_after_data_change()
+
+class MemoryBackend:
+    """The in-memory graph from app.graph_memory"""
+
+    name = "memory"
+
+    def __init__(self, graph=None):
+        self.graph = graph
+        self.planner = None
+        self.ledger = None
+
+    async def start(self):
+        self.graph = self.graph or get_graph()
+        self.ledger = HoldLedger(self.graph.hotels)
+
+    async def close(self):
+        pass
+
+    async def ping(self):
+        pass
+
+    def best_hotels(self, country, max_price=None, limit=5, weights=DEFAULT_WEIGHTS, normalize="none", after=None):
+        return self.graph.best_hotels(country, max_price, limit, weights, normalize, after)
+
+    async def best_hotels_async(self, country, max_price=None, limit=5, weights=DEFAULT_WEIGHTS, normalize="none",
+                                after=None):
+        return self.graph.best_hotels(country, max_price, limit, weights, normalize, after)
+
+    async def best_hotels_batch_async(self, queries):
+        return {
+            query["country"]: self.graph.best_hotels(
+                query["country"], query["max_price"], query["limit"], query["weights"], query["normalize"],
+                query.get("after")
+            )
+            for query in queries
+        }
+
+    def dataset_version(self):
+        return self.graph.version()
+
+    async def itinerary_planner(self):
+        if self.planner is None:
+            self.planner = ItineraryPlanner.from_graph(self.graph)
+        return self.planner
+
+    async def allocation_rows(self):
+        return self.graph.allocation_rows()
+
+    async def place_hold(self, hotel, rooms, ttl_seconds=HOLD_TTL_SECONDS):
+        return self.ledger.place(hotel, rooms, ttl_seconds)
+
+    async def release_hold(self, hold_id):
+        return self.ledger.release(hold_id)
+
+    async def expire_holds(self):
+        return self.ledger.expire()
+
+    async def export_rankings(self, countries=None, max_price=None, weights=DEFAULT_WEIGHTS):
+        names = sorted(country.name for country in self.graph.countries)
+        for country in names if countries is None else sorted(set(countries) & set(names)):
+            for row in self.graph.best_hotels(country, max_price, sys.maxsize, weights):
+                yield {"country": country, **row}
+
+    async def update_hotel_price(self, hotel, price):
+        reranked = self.graph.update_hotel(hotel, price=price)
+        if reranked is not None:
+            self.planner = None
+        return reranked
+
+    async def invalidate(self):
+        self.graph.invalidate()
+        self.planner = None
+
+class MockBackend:
+    """Static sample rows from app.services_mock (precomputed scores, weights ignored)"""
+
+    name = "mock"
+    planner = None
+    ledger = None
+
+    async def start(self):
+        # Holds decrement the sample hotels' capacities
+        self.ledger = HoldLedger(mock_hotels())
+
+    async def close(self):
+        pass
+
+    async def ping(self):
+        pass
+
+    def best_hotels(self, country, max_price=None, limit=5, weights=DEFAULT_WEIGHTS, normalize="none", after=None):
+        return get_best_hotels_mock(country, max_price, limit, after)
+
+    async def best_hotels_async(self, country, max_price=None, limit=5, weights=DEFAULT_WEIGHTS, normalize="none",
+                                after=None):
+        return self.best_hotels(country, max_price, limit, weights, normalize, after)
+
+    async def best_hotels_batch_async(self, queries):
+        return await get_best_hotels_batch_mock_async(queries)
+
+    def dataset_version(self):
+        return MOCK_VERSION
+
+    async def itinerary_planner(self):
+        # The sample rows carry no coordinates; plan over the bundled dataset instead
+        if self.planner is None:
+            self.planner = ItineraryPlanner.from_graph(get_graph())
+        return self.planner
+
+    async def allocation_rows(self):
+        return get_graph().allocation_rows()
+
+    async def place_hold(self, hotel, rooms, ttl_seconds=HOLD_TTL_SECONDS):
+        return self.ledger.place(hotel, rooms, ttl_seconds)
+
+    async def release_hold(self, hold_id):
+        return self.ledger.release(hold_id)
+
+    async def expire_holds(self):
+        return self.ledger.expire()
+
+    async def export_rankings(self, countries=None, max_price=None, weights=DEFAULT_WEIGHTS):
+        for country in sorted(MOCK_DATA if countries is None else set(countries) & set(MOCK_DATA)):
+            for row in get_best_hotels_mock(country, max_price, sys.maxsize):
+                yield {"country": country, **row}
+
+    async def update_hotel_price(self, hotel, price):
+        raise NotImplementedError("The mock backend is read-only")
+
+    async def invalidate(self):
+        # The sample rows never change; nothing is cached
+        pass
+
+BACKENDS = {
+    "neo4j": Neo4jBackend,
+    "memory": MemoryBackend,
+    "mock": MockBackend,
+}
+
+def create_backend(name: str = None) -> RecommendationBackend:
+    """Backend instance by name (defaults to RECOMMENDATION_BACKEND)"""
+    name = (name or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
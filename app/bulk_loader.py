@@ -0,0 +1,108 @@
+"""
+Batched bulk loader for Neo4j
+Rows are sent as `UNWIND $rows` batches, each in its own explicit write
+transaction, instead of one auto-commit session.run per row.
+"""
+from itertools import islice
+import os
+import time
+
+DEFAULT_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "5000"))
+# Hotels within this distance of a stadium get a HAS_NEARBY_HOTEL edge
+NEARBY_RADIUS_KM = float(os.getenv("NEARBY_RADIUS_KM", "15"))
+# Average city travel speed used to derive travel_time_min from distance
+CITY_SPEED_KMH = 30.0
+
+CREATE_COUNTRIES_QUERY = """
+UNWIND $rows AS row
+CREATE (:Country {name: row.name})
+"""
+
+CREATE_STADIUMS_QUERY = """
+UNWIND $rows AS row
+CREATE (:Stadium {
+    name: row.name,
+    city: row.city,
+    capacity: row.capacity,
+    location: point({latitude: row.latitude, longitude: row.longitude})
+})
+"""
+
+CREATE_HOTELS_QUERY = """
+UNWIND $rows AS row
+CREATE (:Hotel {
+    name: row.name,
+    city: row.city,
+    price: row.price,
+    rating: row.rating,
+    capacity: row.capacity,
+    location: point({latitude: row.latitude, longitude: row.longitude})
+})
+"""
+
+PLAYS_AT_QUERY = """
+UNWIND $rows AS row
+MATCH (c:Country {name: row.country}), (s:Stadium {name: row.stadium})
+MERGE (c)-[:PLAYS_AT]->(s)
+"""
+
+# Links each stadium row to every hotel within $radius_m using the point
+# index on Hotel.location, so edge creation never pairs whole cities.
+# Travel time assumes CITY_SPEED_KMH plus a 5 minute buffer.
+NEARBY_HOTELS_BY_RADIUS_QUERY = """
+UNWIND $rows AS row
+MATCH (s:Stadium {name: row.stadium})
+MATCH (h:Hotel)
+WHERE point.distance(h.location, s.location) <= $radius_m
+WITH s, h, round(point.distance(h.location, s.location) / 1000.0, 1) AS distance_km
+MERGE (s)-[r:HAS_NEARBY_HOTEL]->(h)
+SET r.distance_km = distance_km,
+    r.travel_time_min = toInteger(round(distance_km / $speed_kmh * 60.0)) + 5
+"""
+
+def link_nearby_hotels(session, stadiums, radius_km: float = None, batch_size: int = 100):
+    """Create HAS_NEARBY_HOTEL edges from each named stadium to hotels within radius_km"""
+    radius_km = radius_km or NEARBY_RADIUS_KM
+    return load_batches(
+        session,
+        NEARBY_HOTELS_BY_RADIUS_QUERY,
+        ({"stadium": name} for name in stadiums),
+        batch_size=batch_size,
+        label="stadiums linked",
+        radius_m=radius_km * 1000,
+        speed_kmh=CITY_SPEED_KMH
+    )
+
+def batched(rows, size: int):
+    """Yield lists of up to `size` rows from any iterable without materializing it"""
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def _write_batch(tx, query, batch, params):
+    tx.run(query, rows=batch, **params).consume()
+
+def load_batches(session, query: str, rows, batch_size: int = None, label: str = "rows", total: int = None, **params):
+    """Run `query` (which must UNWIND $rows) over `rows` in batched write transactions
+
+    `rows` may be a generator; `total` is only used for progress output and
+    any extra keyword arguments are passed as query parameters.
+    Returns the number of rows written.
+    """
+    batch_size = batch_size or DEFAULT_BATCH_SIZE
+    start = time.perf_counter()
+    loaded = 0
+    for batch in batched(rows, batch_size):
+        session.execute_write(_write_batch, query, batch, params)
+        loaded += len(batch)
+        elapsed = time.perf_counter() - start
+        progress = f"{loaded}/{total}" if total else f"{loaded}"
+        print(f"  ... {label}: {progress} ({loaded / elapsed:,.0f} rows/sec)", end="\r", flush=True)
+
+    elapsed = time.perf_counter() - start
+    rate = loaded / elapsed if elapsed > 0 else 0.0
+    print(f"✓ Loaded {loaded} {label} in {elapsed:.2f}s ({rate:,.0f} rows/sec)" + " " * 10)
+    return loaded
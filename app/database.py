@@ -1,6 +1,8 @@
-from neo4j import GraphDatabase
+from contextlib import AsyncExitStack, ExitStack
+from neo4j import AsyncGraphDatabase, GraphDatabase
 import os
 from dotenv import load_dotenv
+from app.metrics import registry
 
 load_dotenv()
 
@@ -8,10 +10,140 @@ NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
-driver = GraphDatabase.driver(
-    NEO4J_URI,
-    auth=(NEO4J_USER, NEO4J_PASSWORD)
-)
+def _env_number(name, default, cast=float):
+    value = os.getenv(name)
+    return cast(value) if value not in (None, "") else default
 
-def get_session():
-    return driver.session()
+# Connection pool settings (all optional, defaults match the driver's own)
+MAX_POOL_SIZE = _env_number("NEO4J_MAX_POOL_SIZE", 100, int)
+MAX_CONNECTION_LIFETIME = _env_number("NEO4J_MAX_CONNECTION_LIFETIME", 3600.0)
+CONNECTION_TIMEOUT = _env_number("NEO4J_CONNECTION_TIMEOUT", 30.0)
+CONNECTION_ACQUISITION_TIMEOUT = _env_number("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", 60.0)
+LIVENESS_CHECK_TIMEOUT = _env_number("NEO4J_LIVENESS_CHECK_TIMEOUT", None)
+FETCH_SIZE = _env_number("NEO4J_FETCH_SIZE", 1000, int)
+WARM_CONNECTIONS = _env_number("NEO4J_WARM_CONNECTIONS", 4, int)
+
+_driver = None
+_async_driver = None
+
+def driver_config():
+    """Pool and session defaults shared by the sync and async drivers"""
+    config = {
+        "max_connection_pool_size": MAX_POOL_SIZE,
+        "max_connection_lifetime": MAX_CONNECTION_LIFETIME,
+        "connection_timeout": CONNECTION_TIMEOUT,
+        "connection_acquisition_timeout": CONNECTION_ACQUISITION_TIMEOUT,
+        "fetch_size": FETCH_SIZE,
+    }
+    if LIVENESS_CHECK_TIMEOUT is not None:
+        config["liveness_check_timeout"] = LIVENESS_CHECK_TIMEOUT
+    return config
+
+def get_driver():
+    """Return the sync driver, creating it on first use"""
+    global _driver
+    if _driver is None:
+        _driver = GraphDatabase.driver(
+            NEO4J_URI,
+            auth=(NEO4J_USER, NEO4J_PASSWORD),
+            **driver_config()
+        )
+    return _driver
+
+def get_async_driver():
+    """Return the async driver used by the async endpoints, creating it on first use"""
+    global _async_driver
+    if _async_driver is None:
+        _async_driver = AsyncGraphDatabase.driver(
+            NEO4J_URI,
+            auth=(NEO4J_USER, NEO4J_PASSWORD),
+            **driver_config()
+        )
+    return _async_driver
+
+def get_session(**config):
+    return get_driver().session(**config)
+
+def get_async_session(**config):
+    return get_async_driver().session(**config)
+
+def warm_pool(connections: int = WARM_CONNECTIONS):
+    """Open `connections` sync connections at once so they sit idle in the pool"""
+    # Each open transaction pins its own connection, so holding them together
+    # forces the pool to grow instead of reusing a single connection
+    with ExitStack() as stack:
+        for _ in range(min(connections, MAX_POOL_SIZE)):
+            session = stack.enter_context(get_session())
+            tx = stack.enter_context(session.begin_transaction())
+            tx.run("RETURN 1").consume()
+
+async def warm_async_pool(connections: int = WARM_CONNECTIONS):
+    """Async counterpart of warm_pool"""
+    async with AsyncExitStack() as stack:
+        for _ in range(min(connections, MAX_POOL_SIZE)):
+            session = await stack.enter_async_context(get_async_session())
+            tx = await stack.enter_async_context(await session.begin_transaction())
+            await (await tx.run("RETURN 1")).consume()
+
+async def start_drivers():
+    """Verify connectivity and warm both pools; called from the FastAPI lifespan"""
+    get_driver().verify_connectivity()
+    await get_async_driver().verify_connectivity()
+    if WARM_CONNECTIONS > 0:
+        warm_pool()
+        await warm_async_pool()
+
+async def ping_database():
+    """Cheapest round-trip through the async pool; raises if Neo4j is unreachable"""
+    async with get_async_session() as session:
+        result = await session.run("RETURN 1")
+        await result.consume()
+
+async def close_drivers():
+    """Close both drivers; called from the FastAPI lifespan on shutdown"""
+    global _driver, _async_driver
+    if _async_driver is not None:
+        await _async_driver.close()
+        _async_driver = None
+    if _driver is not None:
+        _driver.close()
+        _driver = None
+
+def _pool_snapshot(driver):
+    if driver is None:
+        return None
+    pool = driver._pool
+    connections = [c for queue in list(pool.connections.values()) for c in list(queue)]
+    in_use = sum(1 for c in connections if c.in_use)
+    return {
+        "max_size": MAX_POOL_SIZE,
+        "open": len(connections),
+        "in_use": in_use,
+        "idle": len(connections) - in_use,
+        "pending": sum(pool.connections_reservations.values()),
+    }
+
+def get_pool_stats():
+    """Snapshot of connection counts for both driver pools"""
+    # The driver has no public pool API, so this reads its pool bookkeeping
+    return {
+        "sync": _pool_snapshot(_driver),
+        "async": _pool_snapshot(_async_driver),
+        "config": {
+            "max_connection_lifetime": MAX_CONNECTION_LIFETIME,
+            "connection_acquisition_timeout": CONNECTION_ACQUISITION_TIMEOUT,
+            "liveness_check_timeout": LIVENESS_CHECK_TIMEOUT,
+            "fetch_size": FETCH_SIZE,
+            "warm_connections": WARM_CONNECTIONS,
+        },
+    }
+
+@registry.register_collector
+def pool_metrics():
+    """Connection pool gauges for /metrics"""
+    stats = get_pool_stats()
+    for field in ("open", "in_use", "idle", "pending"):
+        samples = [({"driver": name}, snapshot[field]) for name, snapshot in stats.items()
+                   if name != "config" and snapshot is not None]
+        yield f"neo4j_pool_{field}_connections", "gauge", f"Connections {field.replace('_', ' ')} in the pool", samples
+    yield "neo4j_pool_max_connections", "gauge", "Configured pool size", [({}, MAX_POOL_SIZE)]
@@ -0,0 +1,90 @@
+"""
+Africa Cup of Nations (CAN) 2025 Morocco dataset
+Shared by the populate scripts and anything else that needs the tournament data.
+"""
+
+# Participating countries
+COUNTRIES = [
+    "Nigeria",
+    "Morocco",
+    "Senegal",
+    "Egypt",
+    "Cameroon",
+    "Algeria",
+    "Tunisia",
+    "Ivory Coast"
+]
+
+# Stadiums in Morocco
+STADIUMS = [
+    {"name": "Mohammed V Stadium", "city": "Casablanca", "capacity": 45891, "latitude": 33.5828, "longitude": -7.6469},
+    {"name": "Prince Moulay Abdellah Stadium", "city": "Rabat", "capacity": 52000, "latitude": 33.9598, "longitude": -6.8894},
+    {"name": "Grand Stade de Marrakech", "city": "Marrakech", "capacity": 45240, "latitude": 31.7058, "longitude": -7.9801},
+    {"name": "Ibn Battuta Stadium", "city": "Tangier", "capacity": 45000, "latitude": 35.7381, "longitude": -5.8581},
+    {"name": "Adrar Stadium", "city": "Agadir", "capacity": 45480, "latitude": 30.4274, "longitude": -9.5372}
+]
+
+# Hotels in Moroccan cities
+HOTELS = [
+    # Casablanca Hotels
+    {"name": "Hotel Atlas", "city": "Casablanca", "price": 120, "rating": 3.8, "capacity": 200, "latitude": 33.595, "longitude": -7.618},
+    {"name": "Hyatt Regency Casablanca", "city": "Casablanca", "price": 150, "rating": 4.5, "capacity": 300, "latitude": 33.5992, "longitude": -7.6182},
+    {"name": "Ibis Casa Voyageurs", "city": "Casablanca", "price": 80, "rating": 3.6, "capacity": 150, "latitude": 33.5937, "longitude": -7.5913},
+    {"name": "Kenzi Tower Hotel", "city": "Casablanca", "price": 135, "rating": 4.2, "capacity": 250, "latitude": 33.587, "longitude": -7.633},
+
+    # Rabat Hotels
+    {"name": "Sofitel Rabat Jardin des Roses", "city": "Rabat", "price": 200, "rating": 4.7, "capacity": 250, "latitude": 34.0061, "longitude": -6.8446},
+    {"name": "Hotel Le Diwan Rabat", "city": "Rabat", "price": 130, "rating": 4.0, "capacity": 180, "latitude": 34.0177, "longitude": -6.8372},
+    {"name": "Riad Dar Rabat", "city": "Rabat", "price": 90, "rating": 3.9, "capacity": 100, "latitude": 34.025, "longitude": -6.836},
+    {"name": "Movenpick Hotel Mansour Eddahbi", "city": "Rabat", "price": 165, "rating": 4.4, "capacity": 220, "latitude": 33.995, "longitude": -6.85},
+
+    # Marrakech Hotels
+    {"name": "Kenzi Menara Palace", "city": "Marrakech", "price": 160, "rating": 4.3, "capacity": 220, "latitude": 31.614, "longitude": -8.012},
+    {"name": "La Mamounia", "city": "Marrakech", "price": 300, "rating": 4.9, "capacity": 150, "latitude": 31.6214, "longitude": -7.9978},
+    {"name": "Riad Marrakech Medina", "city": "Marrakech", "price": 70, "rating": 3.7, "capacity": 80, "latitude": 31.63, "longitude": -7.988},
+    {"name": "Palais Namaskar", "city": "Marrakech", "price": 280, "rating": 4.8, "capacity": 120, "latitude": 31.68, "longitude": -8.06},
+    {"name": "Hotel Les Jardins de la Koutoubia", "city": "Marrakech", "price": 145, "rating": 4.1, "capacity": 200, "latitude": 31.627, "longitude": -7.993},
+
+    # Tangier Hotels
+    {"name": "Hilton Garden Inn Tangier City Center", "city": "Tangier", "price": 140, "rating": 4.2, "capacity": 200, "latitude": 35.7706, "longitude": -5.8141},
+    {"name": "Hotel El Minzah", "city": "Tangier", "price": 120, "rating": 4.0, "capacity": 150, "latitude": 35.7847, "longitude": -5.8127},
+    {"name": "Ibis Tangier", "city": "Tangier", "price": 85, "rating": 3.5, "capacity": 100, "latitude": 35.769, "longitude": -5.808},
+    {"name": "Farah Tanger Hotel", "city": "Tangier", "price": 110, "rating": 3.8, "capacity": 180, "latitude": 35.776, "longitude": -5.805},
+    {"name": "Hotel Tanger With Spa", "city": "Tangier", "price": 160, "rating": 4.3, "capacity": 200, "latitude": 35.773, "longitude": -5.8},
+    {"name": "Riad Tangier Medina", "city": "Tangier", "price": 95, "rating": 3.9, "capacity": 120, "latitude": 35.787, "longitude": -5.811},
+
+    # Agadir Hotels
+    {"name": "Royal Atlas Hotel", "city": "Agadir", "price": 150, "rating": 4.3, "capacity": 250, "latitude": 30.41, "longitude": -9.603},
+    {"name": "Sofitel Agadir Thalassa Sea & Spa", "city": "Agadir", "price": 220, "rating": 4.7, "capacity": 200, "latitude": 30.398, "longitude": -9.605},
+    {"name": "Ibis Agadir", "city": "Agadir", "price": 75, "rating": 3.6, "capacity": 120, "latitude": 30.415, "longitude": -9.599},
+    {"name": "Atlantic Palace Resort", "city": "Agadir", "price": 180, "rating": 4.4, "capacity": 300, "latitude": 30.413, "longitude": -9.601},
+    {"name": "Club Med Agadir", "city": "Agadir", "price": 250, "rating": 4.6, "capacity": 400, "latitude": 30.418, "longitude": -9.604},
+    {"name": "Oasis Agadir Hotel", "city": "Agadir", "price": 130, "rating": 4.1, "capacity": 180, "latitude": 30.425, "longitude": -9.593},
+
+    # Additional Casablanca Hotels
+    {"name": "Sheraton Casablanca", "city": "Casablanca", "price": 170, "rating": 4.6, "capacity": 350, "latitude": 33.5936, "longitude": -7.6217},
+    {"name": "Royal Mansour Casablanca", "city": "Casablanca", "price": 210, "rating": 4.8, "capacity": 200, "latitude": 33.599, "longitude": -7.615},
+
+    # Additional Marrakech Hotels
+    {"name": "Bahia Palace Riad", "city": "Marrakech", "price": 110, "rating": 4.0, "capacity": 100, "latitude": 31.6218, "longitude": -7.9829},
+]
+
+# (country, stadium) pairs: each country plays at specific stadiums
+PLAYS_AT = [
+    ("Nigeria", "Mohammed V Stadium"),
+    ("Nigeria", "Prince Moulay Abdellah Stadium"),
+    ("Morocco", "Mohammed V Stadium"),
+    ("Morocco", "Grand Stade de Marrakech"),
+    ("Senegal", "Ibn Battuta Stadium"),
+    ("Senegal", "Mohammed V Stadium"),
+    ("Egypt", "Prince Moulay Abdellah Stadium"),
+    ("Egypt", "Grand Stade de Marrakech"),
+    ("Cameroon", "Adrar Stadium"),
+    ("Cameroon", "Ibn Battuta Stadium"),
+    ("Algeria", "Mohammed V Stadium"),
+    ("Algeria", "Adrar Stadium"),
+    ("Tunisia", "Grand Stade de Marrakech"),
+    ("Tunisia", "Prince Moulay Abdellah Stadium"),
+    ("Ivory Coast", "Ibn Battuta Stadium"),
+    ("Ivory Coast", "Adrar Stadium"),
+]
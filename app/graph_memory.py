@@ -0,0 +1,252 @@
+"""
+In-memory graph backend
+Holds the CAN dataset as a compact graph: __slots__ node records plus CSR
+(offset/target index array) adjacency for PLAYS_AT and HAS_NEARBY_HOTEL.
+HAS_NEARBY_HOTEL edges are derived exactly like the bulk loader does it
+(haversine distance as Neo4j's point.distance computes it, same radius and
+rounding), and queries follow the same ranking semantics and tie-breaks as
+BEST_HOTELS_QUERY, so results match a freshly populated database.
+"""
+from array import array
+from decimal import ROUND_HALF_UP, Decimal
+import heapq
+import math
+import numpy as np
+from app import dataset
+from app.bulk_loader import CITY_SPEED_KMH, NEARBY_RADIUS_KM
+from app.rankings import dataset_digest
+from app.scoring import DEFAULT_WEIGHTS, CandidateStore, Weights, compute_score
+
+# Radius Neo4j uses for WGS-84 point.distance
+EARTH_RADIUS_M = 6378140.0
+
+class Country:
+    __slots__ = ("id", "name")
+
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+class Stadium:
+    __slots__ = ("id", "name", "city", "capacity", "latitude", "longitude")
+
+    def __init__(self, id, name, city, capacity, latitude, longitude):
+        self.id = id
+        self.name = name
+        self.city = city
+        self.capacity = capacity
+        self.latitude = latitude
+        self.longitude = longitude
+
+class Hotel:
+    __slots__ = ("id", "name", "city", "price", "rating", "capacity", "latitude", "longitude")
+
+    def __init__(self, id, name, city, price, rating, capacity, latitude, longitude):
+        self.id = id
+        self.name = name
+        self.city = city
+        self.price = price
+        self.rating = rating
+        self.capacity = capacity
+        self.latitude = latitude
+        self.longitude = longitude
+
+def point_distance_m(lat1, lon1, lat2, lon2):
+    """Haversine distance in metres, as Neo4j's point.distance computes it for WGS-84 points"""
+    d_lat = math.radians(lat2 - lat1)
+    d_lon = math.radians(lon2 - lon1)
+    a = (math.sin(d_lat / 2) ** 2
+         + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(d_lon / 2) ** 2)
+    return EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+def cypher_round(value, precision=0):
+    """Cypher round(): half-up on the decimal representation"""
+    quantum = Decimal(1).scaleb(-precision)
+    return float(Decimal(repr(value)).quantize(quantum, rounding=ROUND_HALF_UP))
+
+def csr(sources, edges):
+    """Offsets/targets arrays for edges grouped by source id (targets keep insertion order)"""
+    counts = [0] * (sources + 1)
+    for source, _ in edges:
+        counts[source + 1] += 1
+    for i in range(sources):
+        counts[i + 1] += counts[i]
+    offsets = array("i", counts)
+    targets = array("i", bytes(4 * len(edges)))
+    position = list(counts[:-1])
+    for source, target in edges:
+        targets[position[source]] = target
+        position[source] += 1
+    return offsets, targets
+
+class InMemoryGraph:
+    """Countries, stadiums and hotels with index-array adjacency"""
+
+    def __init__(self, countries, stadiums, hotels, plays_at, radius_km: float = None):
+        radius_m = (radius_km or NEARBY_RADIUS_KM) * 1000
+        self.countries = [Country(i, name) for i, name in enumerate(countries)]
+        self.stadiums = [
+            Stadium(i, s["name"], s["city"], s["capacity"], s["latitude"], s["longitude"])
+            for i, s in enumerate(stadiums)
+        ]
+        self.hotels = [
+            Hotel(i, h["name"], h["city"], h["price"], h["rating"], h["capacity"], h["latitude"], h["longitude"])
+            for i, h in enumerate(hotels)
+        ]
+        self.country_ids = {country.name: country.id for country in self.countries}
+        self.stadium_ids = {stadium.name: stadium.id for stadium in self.stadiums}
+        self.hotel_ids = {hotel.name: hotel.id for hotel in self.hotels}
+
+        # PLAYS_AT is MERGEd by the loader, so duplicate pairs collapse
+        pairs = sorted({(self.country_ids[country], self.stadium_ids[stadium]) for country, stadium in plays_at})
+        self.plays_at_offsets, self.plays_at_targets = csr(len(self.countries), pairs)
+
+        # Each stadium is checked against every hotel at once with a vectorized
+        # haversine; only the hotels it keeps (with a little slack for rounding
+        # differences between NumPy and math) are measured again exactly
+        hotel_lat = np.radians([hotel.latitude for hotel in self.hotels])
+        hotel_lon = np.radians([hotel.longitude for hotel in self.hotels])
+        cos_hotel_lat = np.cos(hotel_lat)
+        nearby = []
+        distances = []
+        for stadium in self.stadiums:
+            lat, lon = math.radians(stadium.latitude), math.radians(stadium.longitude)
+            a = np.sin((lat - hotel_lat) / 2) ** 2 + cos_hotel_lat * math.cos(lat) * np.sin((lon - hotel_lon) / 2) ** 2
+            meters = EARTH_RADIUS_M * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+            for h in np.flatnonzero(meters <= radius_m + 1.0).tolist():
+                hotel = self.hotels[h]
+                exact = point_distance_m(hotel.latitude, hotel.longitude, stadium.latitude, stadium.longitude)
+                if exact <= radius_m:
+                    nearby.append((stadium.id, hotel.id))
+                    distances.append(cypher_round(exact / 1000.0, 1))
+        self.nearby_offsets, self.nearby_targets = csr(len(self.stadiums), nearby)
+        # Edge properties are parallel to nearby_targets (edges were generated in source order)
+        self.nearby_distance_km = array("d", distances)
+        self.nearby_travel_time_min = array(
+            "i", (int(cypher_round(d / CITY_SPEED_KMH * 60.0)) + 5 for d in distances)
+        )
+        self._store = None
+        self._version = None
+
+    @classmethod
+    def from_dataset(cls, radius_km: float = None):
+        """Graph of the same data populate_morocco_can.py loads"""
+        return cls(dataset.COUNTRIES, dataset.STADIUMS, dataset.HOTELS, dataset.PLAYS_AT, radius_km)
+
+    def stadiums_for(self, country_id):
+        start, end = self.plays_at_offsets[country_id], self.plays_at_offsets[country_id + 1]
+        return self.plays_at_targets[start:end]
+
+    def candidates(self, country: str):
+        """(hotel, stadium, distance_km) for every Country-PLAYS_AT-Stadium-HAS_NEARBY_HOTEL-Hotel path"""
+        country_id = self.country_ids.get(country)
+        if country_id is None:
+            return
+        for stadium_id in self.stadiums_for(country_id):
+            stadium = self.stadiums[stadium_id]
+            for edge in range(self.nearby_offsets[stadium_id], self.nearby_offsets[stadium_id + 1]):
+                yield self.hotels[self.nearby_targets[edge]], stadium, self.nearby_distance_km[edge]
+
+    def best_hotels(self, country: str, max_price: float = None, limit: int = 5,
+                    weights: Weights = DEFAULT_WEIGHTS, normalize: str = "none", after=None):
+        """Same rows and order as BEST_HOTELS_QUERY (or the normalized CandidateStore path)
+
+        `after` is a (score, name, stadium_name) key: only rows ranked after it are returned.
+        """
+        if normalize != "none":
+            return self.store().top_k(country, limit, weights, max_price, normalize, after=after)
+
+        scored = (
+            (compute_score(hotel.price, distance_km, hotel.rating, weights), hotel.name, stadium.name,
+             hotel, distance_km)
+            for hotel, stadium, distance_km in self.candidates(country)
+            if max_price is None or hotel.price <= max_price
+        )
+        if after is not None:
+            scored = (candidate for candidate in scored if candidate[:3] > after)
+        return [
+            {
+                "name": name,
+                "stadium_name": stadium_name,
+                "city": hotel.city,
+                "price": hotel.price,
+                "rating": hotel.rating,
+                "distance_km": distance_km,
+                "score": score,
+            }
+            for score, name, stadium_name, hotel, distance_km in heapq.nsmallest(limit, scored, key=lambda c: c[:3])
+        ]
+
+    def export_rows(self, countries: list = None):
+        """Rows shaped like RANKING_EXPORT_QUERY"""
+        names = [country.name for country in self.countries] if countries is None else countries
+        return [
+            {
+                "country": country,
+                "name": hotel.name,
+                "stadium_name": stadium.name,
+                "city": hotel.city,
+                "price": hotel.price,
+                "rating": hotel.rating,
+                "distance_km": distance_km,
+            }
+            for country in names
+            for hotel, stadium, distance_km in self.candidates(country)
+        ]
+
+    def allocation_rows(self):
+        """export_rows() plus hotel capacity (ALLOCATION_EXPORT_QUERY shape)"""
+        capacity = {hotel.name: hotel.capacity for hotel in self.hotels}
+        return [dict(row, capacity=capacity[row["name"]]) for row in self.export_rows()]
+
+    def store(self):
+        """CandidateStore over all candidates, built on first use (normalized queries)"""
+        if self._store is None:
+            self._store = CandidateStore(self.export_rows())
+        return self._store
+
+    def version(self):
+        """Content hash of the candidates; equals the Neo4j rankings' version for the same data"""
+        if self._version is None:
+            self._version = dataset_digest(self.store())
+        return self._version
+
+    def update_hotel(self, name: str, **fields):
+        """Change hotel properties (price, rating, ...) in place
+
+        Returns the countries whose rankings include the hotel, or None for an unknown hotel.
+        """
+        hotel_id = self.hotel_ids.get(name)
+        if hotel_id is None:
+            return None
+        hotel = self.hotels[hotel_id]
+        for field, value in fields.items():
+            setattr(hotel, field, value)
+        self.invalidate()
+        return sorted(
+            country.name for country in self.countries
+            if any(candidate is hotel for candidate, _, _ in self.candidates(country.name))
+        )
+
+    def invalidate(self):
+        """Drop the candidate store and version derived from the data after it changed"""
+        self._store = None
+        self._version = None
+
+    def stats(self):
+        return {
+            "countries": len(self.countries),
+            "stadiums": len(self.stadiums),
+            "hotels": len(self.hotels),
+            "plays_at": len(self.plays_at_targets),
+            "has_nearby_hotel": len(self.nearby_targets),
+        }
+
+_graph = None
+
+def get_graph():
+    """The process-wide graph, built from app.dataset on first use"""
+    global _graph
+    if _graph is None:
+        _graph = InMemoryGraph.from_dataset()
+    return _graph
@@ -0,0 +1,101 @@
+"""
+Background liveness probe for the recommendation backend
+A task runs the probe (RETURN 1 through the async pool for Neo4j) every
+HEALTH_CHECK_INTERVAL seconds and caches the outcome, so /ready and
+/health answer from memory and orchestrator probes add no database load.
+"""
+import asyncio
+import os
+import time
+from app.metrics import registry
+
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "5"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))
+
+class HealthMonitor:
+    """Cached result of a periodically run async probe"""
+
+    def __init__(self, interval: float = HEALTH_CHECK_INTERVAL, timeout: float = HEALTH_CHECK_TIMEOUT):
+        self.interval = interval
+        self.timeout = timeout
+        self.probe = None
+        self.ok = False
+        self.error = None
+        self.latency = None
+        self.checked_at = None
+        self.consecutive_failures = 0
+        self._task = None
+
+    @property
+    def ready(self):
+        """Last probe passed and is recent (a stuck probe loop counts as unhealthy)"""
+        if not self.ok or self.checked_at is None:
+            return False
+        return time.monotonic() - self.checked_at <= self.interval * 3 + self.timeout
+
+    async def check(self):
+        """Run the probe once and record the outcome"""
+        start = time.monotonic()
+        try:
+            if self.probe is not None:
+                await asyncio.wait_for(self.probe(), self.timeout)
+            self.ok = True
+            self.error = None
+            self.consecutive_failures = 0
+        except asyncio.TimeoutError:
+            self._failed(f"probe timed out after {self.timeout}s")
+        except Exception as e:
+            self._failed(str(e) or type(e).__name__)
+        self.latency = time.monotonic() - start
+        self.checked_at = time.monotonic()
+        return self.ok
+
+    def _failed(self, error):
+        self.ok = False
+        self.error = error
+        self.consecutive_failures += 1
+
+    async def start(self, probe=None):
+        """Check once, then keep probing in the background; `probe=None` is always healthy"""
+        await self.stop()
+        self.probe = probe
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            was_ok = self.ok
+            if await self.check() and not was_ok:
+                print("✓ Backend health check passing again")
+            elif was_ok and not self.ok:
+                print(f"⚠️  Backend health check failed: {self.error}")
+
+    def status(self):
+        return {
+            "ready": self.ready,
+            "last_error": self.error,
+            "consecutive_failures": self.consecutive_failures,
+            "probe_latency_ms": round(self.latency * 1000, 2) if self.latency is not None else None,
+            "checked_seconds_ago": round(time.monotonic() - self.checked_at, 1) if self.checked_at else None,
+            "interval_seconds": self.interval,
+        }
+
+health_monitor = HealthMonitor()
+
+@registry.register_collector
+def health_metrics():
+    """Readiness gauges for /metrics"""
+    yield "backend_ready", "gauge", "1 when the last backend probe passed", [({}, int(health_monitor.ready))]
+    yield "backend_probe_latency_seconds", "gauge", "Duration of the last backend probe", [({}, health_monitor.latency)]
+    yield ("backend_probe_consecutive_failures", "gauge", "Failed probes in a row",
+           [({}, health_monitor.consecutive_failures)])
@@ -0,0 +1,147 @@
+"""
+Room holds for booking partners
+A hold takes rooms off Hotel.capacity immediately and gives them back when
+it is released or when it expires (HOLD_TTL_SECONDS). Against Neo4j every
+hold is one conditional write that locks the hotel before reading its
+capacity (app.services); the in-memory backends use HoldLedger, which does
+the same check-and-decrement under a lock. HoldReaper returns the rooms of
+expired holds in the background.
+"""
+import asyncio
+from datetime import datetime, timezone
+import os
+import threading
+import time
+import uuid
+from app.metrics import registry
+
+HOLD_TTL_SECONDS = int(os.getenv("HOLD_TTL_SECONDS", "900"))
+HOLD_REAP_INTERVAL = float(os.getenv("HOLD_REAP_INTERVAL", "30"))
+
+class InsufficientCapacity(Exception):
+    """The hotel has fewer rooms left than the hold asked for"""
+
+    def __init__(self, hotel, requested, remaining):
+        super().__init__(f"Hotel '{hotel}' has {remaining} rooms left, {requested} requested")
+        self.remaining = remaining
+
+class HoldStats:
+    def __init__(self):
+        self.placed = 0
+        self.rejected = 0
+        self.released = 0
+        self.expired = 0
+
+    def stats(self):
+        return {"placed": self.placed, "rejected": self.rejected, "released": self.released, "expired": self.expired}
+
+hold_stats = HoldStats()
+
+# Bumped whenever a hold changes a hotel's capacity in this process; holds
+# leave the dataset version alone, so capacity-dependent caches (the fan
+# allocator) key on this as well
+_capacity_generation = 0
+
+def capacity_changed():
+    global _capacity_generation
+    _capacity_generation += 1
+
+def capacity_generation():
+    return _capacity_generation
+
+def new_hold_id():
+    return uuid.uuid4().hex
+
+def expiry_iso(expires_at_ms):
+    return datetime.fromtimestamp(expires_at_ms / 1000, tz=timezone.utc).isoformat()
+
+class HoldLedger:
+    """Holds against in-process hotel records (anything with name and a mutable capacity)"""
+
+    def __init__(self, hotels):
+        self.hotels = {hotel.name: hotel for hotel in hotels}
+        self.holds = {}
+        self._lock = threading.Lock()
+
+    def place(self, hotel: str, rooms: int, ttl_seconds: int = HOLD_TTL_SECONDS):
+        """Take `rooms` off the hotel; None if it does not exist, InsufficientCapacity if it is full"""
+        record = self.hotels.get(hotel)
+        if record is None:
+            return None
+        with self._lock:
+            if record.capacity < rooms:
+                hold_stats.rejected += 1
+                raise InsufficientCapacity(hotel, rooms, record.capacity)
+            record.capacity -= rooms
+            hold_id = new_hold_id()
+            expires_at = int(time.time() * 1000) + ttl_seconds * 1000
+            self.holds[hold_id] = (hotel, rooms, expires_at)
+            hold_stats.placed += 1
+            capacity_changed()
+            remaining = record.capacity
+        return {"id": hold_id, "hotel": hotel, "rooms": rooms, "expires_at": expiry_iso(expires_at),
+                "remaining_capacity": remaining}
+
+    def release(self, hold_id: str):
+        """Give a hold's rooms back; None if it does not exist (released or expired)"""
+        with self._lock:
+            hold = self.holds.pop(hold_id, None)
+            if hold is None:
+                return None
+            hotel, rooms, _ = hold
+            self.hotels[hotel].capacity += rooms
+            hold_stats.released += 1
+            capacity_changed()
+            remaining = self.hotels[hotel].capacity
+        return {"id": hold_id, "hotel": hotel, "rooms": rooms, "remaining_capacity": remaining}
+
+    def expire(self):
+        """Release every hold past its expiry; returns how many"""
+        now = int(time.time() * 1000)
+        with self._lock:
+            expired = [hold_id for hold_id, (_, _, expires_at) in self.holds.items() if expires_at <= now]
+            for hold_id in expired:
+                hotel, rooms, _ = self.holds.pop(hold_id)
+                self.hotels[hotel].capacity += rooms
+            hold_stats.expired += len(expired)
+            if expired:
+                capacity_changed()
+        return len(expired)
+
+class HoldReaper:
+    """Background task that expires holds every `interval` seconds"""
+
+    def __init__(self, interval: float = HOLD_REAP_INTERVAL):
+        self.interval = interval
+        self._task = None
+
+    async def start(self, expire):
+        """`expire` is an async callable returning the number of holds it released"""
+        await self.stop()
+        self._task = asyncio.create_task(self._run(expire))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, expire):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await expire()
+            except Exception as e:
+                # The next run retries; holds only stay a little longer
+                print(f"⚠️  Could not expire holds: {e}")
+
+hold_reaper = HoldReaper()
+
+@registry.register_collector
+def hold_metrics():
+    """Hold counters for /metrics"""
+    for counter, value in hold_stats.stats().items():
+        yield f"holds_{counter}_total", "counter", f"Room holds {counter}", [({}, value)]
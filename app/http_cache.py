@@ -0,0 +1,33 @@
+"""
+HTTP caching helpers for recommendation responses
+A response is fully determined by the dataset version and the query
+parameters, so its ETag can be computed before any query runs and a
+matching If-None-Match is answered with 304 straight away.
+"""
+from typing import Optional
+import hashlib
+import json
+import os
+
+# Seconds clients and edge caches may reuse a response without revalidating
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+
+def make_etag(version: str, *params):
+    """Strong ETag for the response to `params` under dataset `version`"""
+    payload = json.dumps([version, params], default=str, separators=(",", ":"))
+    return '"' + hashlib.sha1(payload.encode()).hexdigest()[:24] + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str):
+    """Whether an If-None-Match header covers `etag` (weak comparison, as RFC 9110 requires)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+def cache_headers(etag: str):
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE}" if HTTP_CACHE_MAX_AGE > 0 else "no-cache",
+    }
@@ -0,0 +1,195 @@
+"""
+Multi-match itinerary optimizer
+A team plays a sequence of matches at different stadiums. For each match
+(leg) the fan needs a hotel; the cost of staying at hotel h for a match at
+stadium s is
+
+    nights_per_match * price(h) + minute_cost * 2 * travel_time_min(s, h)
+
+and every change of hotel between legs adds switch_penalty. The stadium x
+hotel travel matrix is built once per dataset (HAS_NEARBY_HOTEL
+travel_time_min where the edge exists, an intercity estimate otherwise),
+so a request is a small dynamic program over (legs x hotels): per leg the
+best predecessor is either the same hotel or the overall cheapest one plus
+the penalty. mode="base" keeps one hotel for the whole tournament.
+"""
+import os
+import numpy as np
+from app.bulk_loader import CITY_SPEED_KMH
+from app.graph_memory import EARTH_RADIUS_M
+
+NIGHTS_PER_MATCH = int(os.getenv("ITINERARY_NIGHTS_PER_MATCH", "2"))
+# Dollar value of one minute of travel (each match is a round trip)
+MINUTE_COST = float(os.getenv("ITINERARY_MINUTE_COST", "0.5"))
+# Cost of checking out and moving to another hotel between matches
+SWITCH_PENALTY = float(os.getenv("ITINERARY_SWITCH_PENALTY", "50"))
+# Road speed between cities, for hotels that are not near the stadium
+INTERCITY_SPEED_KMH = float(os.getenv("INTERCITY_SPEED_KMH", "80"))
+
+MODES = ("flexible", "base")
+
+def distance_matrix_km(stadium_coords, hotel_coords):
+    """Haversine distances (same radius as Neo4j point.distance) between every stadium and hotel"""
+    s_lat, s_lon = np.radians(stadium_coords).T[:, :, None]
+    h_lat, h_lon = np.radians(hotel_coords).T[:, None, :]
+    a = np.sin((h_lat - s_lat) / 2) ** 2 + np.cos(s_lat) * np.cos(h_lat) * np.sin((h_lon - s_lon) / 2) ** 2
+    return EARTH_RADIUS_M * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a)) / 1000.0
+
+class ItineraryPlanner:
+    """Precomputed stadium x hotel travel times for every hotel near any stadium"""
+
+    def __init__(self, stadiums, hotels, edges, plays_at):
+        """`stadiums`/`hotels` are dicts with name, city, latitude, longitude (+ price, rating for hotels),
+        `edges` are (stadium, hotel, travel_time_min) and `plays_at` (country, stadium) pairs"""
+        self.stadiums = sorted(stadiums, key=lambda s: s["name"])
+        # Name order makes the lowest index win ties, like the ranking queries
+        self.hotels = sorted(hotels, key=lambda h: h["name"])
+        self.stadium_ids = {s["name"]: i for i, s in enumerate(self.stadiums)}
+        self.hotel_ids = {h["name"]: i for i, h in enumerate(self.hotels)}
+        self.price = np.array([h["price"] for h in self.hotels], dtype=np.float64)
+
+        self.schedule = {}
+        for country, stadium in plays_at:
+            if stadium in self.stadium_ids and stadium not in self.schedule.setdefault(country, []):
+                self.schedule[country].append(stadium)
+        for stadiums_played in self.schedule.values():
+            stadiums_played.sort()
+
+        if self.hotels and self.stadiums:
+            distances = distance_matrix_km(
+                [(s["latitude"], s["longitude"]) for s in self.stadiums],
+                [(h["latitude"], h["longitude"]) for h in self.hotels],
+            )
+            # Same shape as the loader's estimate: road time plus a 5 minute buffer
+            speed = np.where(distances <= 50.0, CITY_SPEED_KMH, INTERCITY_SPEED_KMH)
+            self.travel_min = np.round(distances / speed * 60.0) + 5
+        else:
+            self.travel_min = np.zeros((len(self.stadiums), len(self.hotels)))
+        for stadium, hotel, minutes in edges:
+            if stadium in self.stadium_ids and hotel in self.hotel_ids:
+                self.travel_min[self.stadium_ids[stadium], self.hotel_ids[hotel]] = minutes
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Planner over an app.graph_memory.InMemoryGraph"""
+        stadiums = [
+            {"name": s.name, "city": s.city, "latitude": s.latitude, "longitude": s.longitude}
+            for s in graph.stadiums
+        ]
+        edges = []
+        near = set()
+        for stadium in graph.stadiums:
+            start, end = graph.nearby_offsets[stadium.id], graph.nearby_offsets[stadium.id + 1]
+            for edge in range(start, end):
+                hotel = graph.hotels[graph.nearby_targets[edge]]
+                near.add(hotel.id)
+                edges.append((stadium.name, hotel.name, graph.nearby_travel_time_min[edge]))
+        hotels = [
+            {"name": h.name, "city": h.city, "price": h.price, "rating": h.rating,
+             "latitude": h.latitude, "longitude": h.longitude}
+            for h in graph.hotels if h.id in near
+        ]
+        plays_at = [
+            (country.name, graph.stadiums[target].name)
+            for country in graph.countries
+            for target in graph.stadiums_for(country.id)
+        ]
+        return cls(stadiums, hotels, edges, plays_at)
+
+    def countries(self):
+        return sorted(self.schedule)
+
+    def plan(self, country: str, stadiums: list = None, mode: str = "flexible", max_price: float = None,
+             nights: int = NIGHTS_PER_MATCH, minute_cost: float = MINUTE_COST,
+             switch_penalty: float = SWITCH_PENALTY):
+        """Cheapest hotel per leg for `country`'s matches (its PLAYS_AT stadiums unless `stadiums` is given)
+
+        Returns None if no hotel fits max_price; raises ValueError for an
+        unknown country, stadium or mode.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode '{mode}' (choose from {', '.join(MODES)})")
+        if stadiums is None:
+            if country not in self.schedule:
+                raise ValueError(f"No matches found for country '{country}'")
+            stadiums = self.schedule[country]
+        unknown = [name for name in stadiums if name not in self.stadium_ids]
+        if unknown:
+            raise ValueError(f"Unknown stadium(s): {', '.join(unknown)}")
+        if not stadiums or not self.hotels:
+            return None
+
+        legs = [self.stadium_ids[name] for name in stadiums]
+        travel = self.travel_min[legs]
+        cost = nights * self.price + minute_cost * 2 * travel
+        if max_price is not None:
+            cost[:, self.price > max_price] = np.inf
+
+        if mode == "base":
+            totals = cost.sum(axis=0)
+            best = int(np.argmin(totals))
+            if not np.isfinite(totals[best]):
+                return None
+            path = [best] * len(legs)
+        else:
+            path = self._cheapest_path(cost, switch_penalty)
+            if path is None:
+                return None
+        return self._itinerary(country, mode, stadiums, legs, path, cost, travel, switch_penalty)
+
+    def _cheapest_path(self, cost, switch_penalty):
+        """Viterbi over legs: stay at the same hotel, or switch from the cheapest one plus the penalty"""
+        total = cost[0].copy()
+        came_from = []
+        for leg in range(1, len(cost)):
+            cheapest = int(np.argmin(total))
+            switch = total[cheapest] + switch_penalty
+            stay = total <= switch
+            came_from.append(np.where(stay, np.arange(len(total)), cheapest))
+            total = cost[leg] + np.where(stay, total, switch)
+        hotel = int(np.argmin(total))
+        if not np.isfinite(total[hotel]):
+            return None
+        path = [hotel]
+        for back in reversed(came_from):
+            hotel = int(back[hotel])
+            path.append(hotel)
+        return path[::-1]
+
+    def _itinerary(self, country, mode, stadiums, legs, path, cost, travel, switch_penalty):
+        changes = sum(1 for a, b in zip(path, path[1:]) if a != b)
+        rows = []
+        for leg, (stadium, hotel) in enumerate(zip(stadiums, path)):
+            h = self.hotels[hotel]
+            rows.append({
+                "match": leg + 1,
+                "stadium_name": stadium,
+                "stadium_city": self.stadiums[legs[leg]]["city"],
+                "hotel_name": h["name"],
+                "hotel_city": h["city"],
+                "price": float(h["price"]),
+                "rating": float(h["rating"]),
+                "travel_time_min": int(travel[leg, hotel]),
+                "cost": round(float(cost[leg, hotel]), 2),
+            })
+        total = sum(float(cost[leg, hotel]) for leg, hotel in enumerate(path)) + changes * switch_penalty
+        return {
+            "country": country,
+            "mode": mode,
+            "total_cost": round(total, 2),
+            "hotel_changes": changes,
+            "total_travel_min": sum(row["travel_time_min"] for row in rows) * 2,
+            "legs": rows,
+        }
+
+    def plan_all(self, **options):
+        """Itinerary for every country with a schedule"""
+        return {country: self.plan(country, **options) for country in self.countries()}
+
+    def stats(self):
+        return {
+            "stadiums": len(self.stadiums),
+            "hotels": len(self.hotels),
+            "countries": len(self.schedule),
+            "matrix_cells": int(self.travel_min.size),
+        }
@@ -1,85 +1,58 @@
-from fastapi import FastAPI, Query, HTTPException
-from app.schemas import HotelResponse
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from app.backends import DEFAULT_BACKEND, MemoryBackend, create_backend
+from app.health import health_monitor
+from app.holds import hold_reaper
+from app.metrics import metrics_middleware
+from app.routes import MODES, router
 import os
 
-# Try to import the real service, fall back to mock if Neo4j is not available
-USE_MOCK = os.getenv("USE_MOCK", "false").lower() == "true"
-
-if USE_MOCK:
-    from app.services_mock import get_best_hotels_mock as get_best_hotels
-    print("⚠️  Running in MOCK mode - using sample data instead of Neo4j")
+# Backend is chosen by RECOMMENDATION_BACKEND (neo4j, memory or mock);
+# USE_MOCK / USE_MEMORY_GRAPH are kept as shortcuts
+if os.getenv("USE_MOCK", "false").lower() == "true":
+    BACKEND_NAME = "mock"
+elif os.getenv("USE_MEMORY_GRAPH", "false").lower() == "true":
+    BACKEND_NAME = "memory"
 else:
+    BACKEND_NAME = DEFAULT_BACKEND
+
+backend = create_backend(BACKEND_NAME)
+MODE = MODES[backend.name]
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the configured backend, falling back to the in-memory graph if Neo4j is unavailable"""
+    global backend, MODE
     try:
-        from app.services import get_best_hotels
-        print("✓ Connected to Neo4j database")
+        await backend.start()
+        print(f"✓ Using the {backend.name} backend")
     except Exception as e:
-        print(f"⚠️  Could not connect to Neo4j: {e}")
-        print("⚠️  Falling back to MOCK mode - using sample data")
-        from app.services_mock import get_best_hotels_mock as get_best_hotels
-        USE_MOCK = True
+        if backend.name == "memory":
+            raise
+        print(f"⚠️  Could not start the {backend.name} backend: {e}")
+        print("⚠️  Falling back to MEMORY mode - using the in-memory graph")
+        await backend.close()
+        backend = MemoryBackend()
+        await backend.start()
+    MODE = MODES[backend.name]
+    app.state.backend = backend
+    await health_monitor.start(backend.ping)
+    await hold_reaper.start(backend.expire_holds)
+    yield
+    await hold_reaper.stop()
+    await health_monitor.stop()
+    await backend.close()
 
 app = FastAPI(
     title="Hotel Recommendation API - CAN Edition",
     description="Find the best hotels near stadiums where your national team will play during the Africa Cup of Nations",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-@app.get("/", tags=["Root"])
-def root():
-    """Root endpoint with API information"""
-    return {
-        "message": "Hotel Recommendation API for Africa Cup of Nations (CAN)",
-        "mode": "MOCK" if USE_MOCK else "LIVE",
-        "docs": "/docs",
-        "endpoints": {
-            "best_hotels": "/best-hotels?country=Egypt&max_price=150&limit=5"
-        },
-        "available_countries": ["Egypt", "Morocco", "Algeria", "Senegal", "Cameroon", "Nigeria", "Tunisia", "Ivory Coast"] if not USE_MOCK else ["Egypt", "Morocco", "Algeria", "Senegal"]
-    }
-
-@app.get("/best-hotels", response_model=List[HotelResponse], tags=["Hotels"])
-def best_hotels(
-    country: str = Query(..., description="Name of the country (e.g., Egypt, Morocco)"),
-    max_price: Optional[float] = Query(None, description="Maximum price per night (optional)"),
-    limit: int = Query(5, ge=1, le=20, description="Number of hotels to return")
-):
-    """
-    Get the best hotel recommendations for a specific country.
-    
-    The hotels are ranked based on:
-    - **Price** (40% weight): Lower is better
-    - **Distance** (40% weight): Closer to stadium is better
-    - **Rating** (20% weight): Higher is better
-    
-    Returns hotels sorted by score (lower score = better match).
-    """
-    try:
-        results = get_best_hotels(country, max_price, limit)
-        
-        if not results:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No hotels found for country '{country}'. Available countries: Egypt, Morocco, Algeria, Senegal, Cameroon, Nigeria, Tunisia, Ivory Coast"
-            )
-        
-        return results
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving hotels: {str(e)}"
-        )
+app.middleware("http")(metrics_middleware)
 
-@app.get("/health", tags=["System"])
-def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "mode": "MOCK" if USE_MOCK else "LIVE",
-        "database": "Mock data" if USE_MOCK else "Neo4j connected"
-    }
+app.include_router(router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,154 @@
+"""
+Prometheus-style metrics in the text exposition format
+Histograms are recorded as requests and Cypher queries happen; gauges
+(pool, cache, rankings) are read from registered collectors at scrape time.
+No client library is needed: GET /metrics returns render().
+"""
+from starlette.routing import Match
+import threading
+import time
+
+# Upper bounds in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Starlette appends the charset
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values"""
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+        for labelvalues, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts + [count - sum(counts)]):
+                cumulative += bucket_count
+                labels = _labels(self.labelnames + ("le",), labelvalues + (_number(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.histograms = []
+        self.collectors = []
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        histogram = Histogram(name, help, labelnames, buckets)
+        self.histograms.append(histogram)
+        return histogram
+
+    def register_collector(self, collector):
+        """`collector()` yields (name, type, help, [(labels dict, value), ...]) at scrape time"""
+        self.collectors.append(collector)
+        return collector
+
+    def render(self):
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+        for collector in self.collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                # A broken collector must not take the whole scrape down
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+cypher_query_duration = registry.histogram(
+    "neo4j_query_duration_seconds", "Client-side Cypher latency (run to last record)", ("query",)
+)
+cypher_result_available_after = registry.histogram(
+    "neo4j_result_available_after_seconds", "Server time until the first record was available", ("query",)
+)
+cypher_result_consumed_after = registry.histogram(
+    "neo4j_result_consumed_after_seconds", "Server time to stream all records after they became available", ("query",)
+)
+
+def observe_query(name, seconds, summary=None):
+    """Record one Cypher execution; `summary` is the driver's ResultSummary"""
+    cypher_query_duration.observe(seconds, name)
+    if summary is None:
+        return
+    if summary.result_available_after is not None:
+        cypher_result_available_after.observe(summary.result_available_after / 1000, name)
+    if summary.result_consumed_after is not None:
+        cypher_result_consumed_after.observe(summary.result_consumed_after / 1000, name)
+
+def route_template(request):
+    """Route path (e.g. /admin/hotels/{hotel_name}/price) so label values stay bounded"""
+    partial = None
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            # Path matched but the method did not (405)
+            partial = route.path
+    return partial or "unmatched"
+
+async def metrics_middleware(request, call_next):
+    """Time every request into http_request_duration_seconds"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        http_request_duration.observe(
+            time.perf_counter() - start, request.method, route_template(request), str(status)
+        )
+
+def render():
+    return registry.render()
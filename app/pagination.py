@@ -0,0 +1,42 @@
+"""
+Opaque keyset cursors for /best-hotels
+A cursor is the (score, name, stadium_name) key of the last row on a page
+plus a fingerprint of the query it came from, base64url encoded. The next
+page holds the rows ranked strictly after that key and is found with a seek
+(a Cypher predicate, a bisect in the materialized rankings), never by
+skipping the earlier pages, so page 50 costs the same as page 1.
+"""
+import base64
+import hashlib
+import json
+
+def query_fingerprint(*query):
+    """Short hash of the parameters that define a ranking order"""
+    return hashlib.sha1(json.dumps(query, default=str).encode()).hexdigest()[:12]
+
+def row_key(row):
+    """Seek key of a result row, in ranking order"""
+    return (float(row["score"]), row["name"], row["stadium_name"])
+
+def encode_cursor(row, *query):
+    payload = json.dumps([*row_key(row), query_fingerprint(*query)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, *query):
+    """The (score, name, stadium_name) key a cursor points after; ValueError if it is invalid or from another query"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, name, stadium_name, fingerprint = json.loads(payload)
+        key = (float(score), str(name), str(stadium_name))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if fingerprint != query_fingerprint(*query):
+        raise ValueError("Cursor belongs to a different query (country, max_price, weights and normalize must not change)")
+    return key
+
+def paginate(rows, limit: int, *query):
+    """Split `limit + 1` fetched rows into the page and the cursor for the next one (None on the last page)"""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(page[-1], *query)
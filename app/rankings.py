@@ -0,0 +1,214 @@
+"""
+Materialized per-country hotel rankings
+Every country has a single ranking order (score ASC over its PLAYS_AT ->
+HAS_NEARBY_HOTEL expansion); any limit/max_price query is a prefix or a
+filtered prefix of it, so it can be answered from memory.
+"""
+from bisect import bisect_right
+from collections import defaultdict
+import hashlib
+import heapq
+import threading
+from app.scoring import DEFAULT_WEIGHTS, CandidateStore
+
+def rank_key(row):
+    """Score order with the same tie-breakers as BEST_HOTELS_QUERY"""
+    return (row["score"], row["name"], row["stadium_name"])
+
+def country_digest(store, country):
+    """Content hash of one country's rows in a CandidateStore (kept in tie-break order, so row order never matters)"""
+    start, end = store.offsets[country]
+    digest = hashlib.sha1()
+    for row in store.rows[start:end]:
+        digest.update(repr((
+            row["country"], row["name"], row["stadium_name"], row["city"],
+            float(row["price"]), float(row["rating"]), float(row["distance_km"]),
+        )).encode())
+    return digest.hexdigest()
+
+def combine_digests(digests):
+    """Dataset version from per-country digests, so one country's change only re-hashes that country"""
+    digest = hashlib.sha1()
+    for country in sorted(digests):
+        digest.update(f"{country}:{digests[country]}\n".encode())
+    return digest.hexdigest()[:16]
+
+def dataset_digest(store):
+    """Content hash of a CandidateStore's rows; the same data gives the same digest in every process"""
+    return combine_digests({country: country_digest(store, country) for country in store.offsets})
+
+class CountryRanking:
+    """One country's candidates, sorted by score and indexed by price"""
+
+    def __init__(self, rows):
+        self.by_score = sorted(rows, key=rank_key)
+        # Stable sort keeps score order among equally priced rows
+        self.by_price = sorted(self.by_score, key=lambda row: row["price"])
+        self.prices = [row["price"] for row in self.by_price]
+
+    def __len__(self):
+        return len(self.by_score)
+
+    def top(self, max_price: float = None, limit: int = 5, after=None):
+        """Best `limit` rows with price <= max_price, ranked after the key `after` if given
+
+        `after` is a rank_key() tuple; the page starts at its bisect position,
+        so a deep page costs the same as the first one.
+        """
+        start = 0 if after is None else bisect_right(self.by_score, after, key=rank_key)
+        if max_price is None:
+            return self.by_score[start:start + limit]
+
+        affordable = bisect_right(self.prices, max_price)
+        if affordable == len(self.prices):
+            return self.by_score[start:start + limit]
+        if affordable == 0:
+            return []
+
+        if affordable * 2 < len(self.prices):
+            # Few rows qualify: select from the cheap end of the price index
+            candidates = self.by_price[:affordable]
+            if after is not None:
+                candidates = (row for row in candidates if rank_key(row) > after)
+            return heapq.nsmallest(limit, candidates, key=rank_key)
+
+        # Most rows qualify: walking the score order finds `limit` of them quickly
+        results = []
+        for i in range(start, len(self.by_score)):
+            row = self.by_score[i]
+            if row["price"] <= max_price:
+                results.append(row)
+                if len(results) == limit:
+                    break
+        return results
+
+class RankingIndex:
+    """Per-country rankings built from a bulk export and refreshed incrementally
+
+    Each country also keeps its own CandidateStore, so queries with custom
+    weights are scored in memory as well, and a change to one country
+    re-scores, re-sorts and re-hashes that country only.
+    """
+
+    def __init__(self):
+        self._rankings = {}
+        self._stores = {}
+        self._digests = {}
+        self._export_rows = {}
+        self._countries_by_hotel = defaultdict(set)
+        self._lock = threading.Lock()
+        self.version = None
+        self.loaded = False
+
+    def build(self, rows):
+        """Replace every country's ranking from export rows (with a `country` key)"""
+        export_rows = defaultdict(list)
+        for row in rows:
+            export_rows[row["country"]].append(row)
+
+        with self._lock:
+            # Countries missing from the export are dropped; readers keep being served throughout
+            self._rerank({**{country: [] for country in self._export_rows}, **export_rows})
+            self.loaded = True
+        return sorted(export_rows)
+
+    def refresh(self, rows, countries):
+        """Rebuild only `countries` from export rows; other rankings are untouched"""
+        export_rows = {country: [] for country in countries}
+        for row in rows:
+            if row["country"] in export_rows:
+                export_rows[row["country"]].append(row)
+
+        with self._lock:
+            self._rerank(export_rows)
+        return sorted(export_rows)
+
+    def update_hotel(self, hotel_name: str, **fields):
+        """Apply changed hotel properties (price, rating, ...) and re-sort the affected countries only"""
+        with self._lock:
+            affected = sorted(self._countries_by_hotel.get(hotel_name, ()))
+            self._rerank({
+                # Copy rows so results already handed out are not mutated
+                country: [
+                    dict(row, **fields) if row["name"] == hotel_name else row
+                    for row in self._export_rows[country]
+                ]
+                for country in affected
+            })
+        return affected
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def countries(self):
+        return sorted(self._rankings)
+
+    def top(self, country: str, max_price: float = None, limit: int = 5, after=None):
+        """Ranked rows for a country (after the key `after`, if given), or an empty list for unknown countries"""
+        ranking = self._rankings.get(country)
+        if ranking is None:
+            return []
+        return ranking.top(max_price, limit, after)
+
+    def top_k(self, country: str, limit: int, weights=DEFAULT_WEIGHTS, max_price: float = None,
+              normalize: str = "none", after=None):
+        """Rows scored with custom weights or normalization, from the country's candidate arrays"""
+        store = self._stores.get(country)
+        if store is None:
+            return []
+        return store.top_k(country, limit, weights, max_price, normalize, after=after)
+
+    def stats(self):
+        rankings = self._rankings
+        return {
+            "loaded": self.loaded,
+            "version": self.version,
+            "countries": len(rankings),
+            "rows": sum(len(ranking) for ranking in rankings.values()),
+        }
+
+    def _reset(self):
+        self._rankings = {}
+        self._stores = {}
+        self._digests = {}
+        self._export_rows = {}
+        self._countries_by_hotel = defaultdict(set)
+        self.version = None
+        self.loaded = False
+
+    def _rerank(self, export_rows):
+        """Swap in new export rows for the given countries (empty rows drop a country)
+
+        Only those countries get new candidate arrays, rankings and digests;
+        the others are shared with the previous state. Readers never see a
+        half-built country because the dicts are replaced, not mutated.
+        """
+        rankings, stores = dict(self._rankings), dict(self._stores)
+        digests, merged = dict(self._digests), dict(self._export_rows)
+        for country, rows in export_rows.items():
+            for row in merged.get(country, ()):
+                countries = self._countries_by_hotel.get(row["name"])
+                if countries is not None:
+                    countries.discard(country)
+                    if not countries:
+                        del self._countries_by_hotel[row["name"]]
+            if not rows:
+                for state in (rankings, stores, digests, merged):
+                    state.pop(country, None)
+                continue
+
+            store = CandidateStore(rows)
+            scores = store.scores(DEFAULT_WEIGHTS)
+            rankings[country] = CountryRanking([store.result_row(i, scores[i]) for i in range(len(store))])
+            stores[country] = store
+            digests[country] = country_digest(store, country)
+            merged[country] = rows
+            for row in rows:
+                self._countries_by_hotel[row["name"]].add(country)
+
+        self._export_rows = merged
+        self._stores = stores
+        self._rankings = rankings
+        self._digests = digests
+        self.version = combine_digests(digests)
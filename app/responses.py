@@ -0,0 +1,114 @@
+"""
+Fast JSON responses for the hotel endpoints
+Rows are coerced to HotelRow records and serialized with orjson, skipping
+FastAPI's response_model re-validation and jsonable_encoder pass. Set
+VALIDATE_RESPONSES=true to validate against HotelResponse as before.
+
+Exports stream NDJSON or CSV from an async iterator of rows, a chunk of
+EXPORT_CHUNK_ROWS rows at a time, so memory does not grow with the export.
+"""
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from typing import Dict, List
+import csv
+import io
+import orjson
+import os
+from app.schemas import HotelResponse, HotelRow
+
+VALIDATE_RESPONSES = os.getenv("VALIDATE_RESPONSES", "false").lower() == "true"
+
+hotel_list_adapter = TypeAdapter(List[HotelResponse])
+hotel_batch_adapter = TypeAdapter(Dict[str, List[HotelResponse]])
+
+def hotel_rows(rows):
+    if VALIDATE_RESPONSES:
+        return hotel_list_adapter.dump_python(hotel_list_adapter.validate_python(rows), mode="json")
+    return [HotelRow.from_row(row) for row in rows]
+
+def hotels_response(rows, headers: dict = None):
+    """JSON response for a list of hotel rows"""
+    return ORJSONResponse(hotel_rows(rows), headers=headers)
+
+def hotel_batch_response(results: dict, headers: dict = None):
+    """JSON response for batch results keyed by country"""
+    if VALIDATE_RESPONSES:
+        content = hotel_batch_adapter.dump_python(hotel_batch_adapter.validate_python(results), mode="json")
+    else:
+        content = {country: [HotelRow.from_row(row) for row in rows] for country, rows in results.items()}
+    return ORJSONResponse(content, headers=headers)
+
+EXPORT_FIELDS = ["country", "rank", "name", "stadium_name", "city", "price", "rating", "distance_km", "score"]
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "500"))
+
+def export_record(row, rank):
+    """One export row with the same types as HotelResponse plus country and rank"""
+    return {
+        "country": row["country"],
+        "rank": rank,
+        "name": row["name"],
+        "stadium_name": row["stadium_name"],
+        "city": row["city"],
+        "price": float(row["price"]),
+        "rating": float(row["rating"]),
+        "distance_km": float(row["distance_km"]),
+        "score": float(row["score"]),
+    }
+
+async def export_chunks(first, rows, fmt: str, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """Encoded chunks for `first` followed by the rest of `rows`; rank restarts with each country"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    lines = []
+
+    def take():
+        if fmt == "ndjson":
+            data = b"".join(lines)
+            lines.clear()
+            return data
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    if fmt == "csv":
+        writer.writerow(EXPORT_FIELDS)
+    pending = 0
+    country, rank = None, 0
+    row = first
+    try:
+        while row is not None:
+            if row["country"] != country:
+                country, rank = row["country"], 0
+            rank += 1
+            record = export_record(row, rank)
+            if fmt == "csv":
+                writer.writerow(record.values())
+            else:
+                lines.append(orjson.dumps(record) + b"\n")
+            pending += 1
+            # The first row goes out on its own so the client sees data straight away
+            if pending >= chunk_rows or row is first:
+                yield take()
+                pending = 0
+            row = await anext(rows, None)
+        data = take()
+        if data:
+            yield data
+    finally:
+        # A client that disconnects mid-export must not leave the session open
+        await rows.aclose()
+
+async def export_response(rows, fmt: str, filename: str):
+    """Stream `rows` (an async iterator of dicts with a `country` key) as NDJSON or CSV
+
+    The first row is fetched before the response starts, so a query that
+    fails outright still produces an error status instead of an empty 200.
+    """
+    first = await anext(rows, None)
+    return StreamingResponse(
+        export_chunks(first, rows, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
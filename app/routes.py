@@ -0,0 +1,363 @@
+"""
+API endpoints shared by app.main (Neo4j only) and app.main_flexible (any backend)
+Each app builds its RecommendationBackend, stores it on app.state.backend in
+its lifespan and includes this router, so an endpoint is written once.
+"""
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.admin import require_admin
+from app.allocation import solve_allocation
+from app.backends import RecommendationBackend
+from app.database import get_pool_stats
+from app.health import health_monitor
+from app.holds import HOLD_TTL_SECONDS, InsufficientCapacity
+from app.http_cache import cache_headers, etag_matches, make_etag
+from app.itinerary import MINUTE_COST, NIGHTS_PER_MATCH, SWITCH_PENALTY
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render as render_metrics
+from app.pagination import decode_cursor, paginate
+from app.responses import export_response, hotel_batch_response, hotels_response
+from app.schemas import (
+    AllocationRequest, AllocationResponse, BatchRequest, HoldReleaseResponse, HoldRequest, HoldResponse,
+    HotelResponse, ItineraryResponse,
+)
+from app.scoring import resolve_weights
+from app.services import best_hotels_cache, best_hotels_flight, best_hotels_flight_async, ranking_index
+from typing import Dict, List, Literal, Optional
+import json
+
+MODES = {"neo4j": "LIVE", "memory": "MEMORY", "mock": "MOCK"}
+
+router = APIRouter()
+
+def current_backend(request: Request) -> RecommendationBackend:
+    """The backend the serving app started (app.state.backend)"""
+    return request.app.state.backend
+
+@router.get("/", tags=["Root"])
+def root(backend: RecommendationBackend = Depends(current_backend)):
+    """Root endpoint with API information"""
+    mode = MODES[backend.name]
+    return {
+        "message": "Hotel Recommendation API for Africa Cup of Nations (CAN)",
+        "mode": mode,
+        "docs": "/docs",
+        "endpoints": {
+            "best_hotels": "/best-hotels?country=Egypt&max_price=150&limit=5",
+            "best_hotels_batch": "POST /best-hotels/batch",
+            "itinerary": "/itinerary?country=Morocco&mode=flexible",
+            "allocation": "POST /allocation",
+            "holds": "POST /holds, DELETE /holds/{hold_id}",
+            "export_rankings": "/export/rankings?format=ndjson"
+        },
+        "available_countries": ["Egypt", "Morocco", "Algeria", "Senegal", "Cameroon", "Nigeria", "Tunisia", "Ivory Coast"] if mode != "MOCK" else ["Egypt", "Morocco", "Algeria", "Senegal"]
+    }
+
+@router.get("/best-hotels", response_model=List[HotelResponse], tags=["Hotels"])
+async def best_hotels(
+    request: Request,
+    country: str = Query(..., description="Name of the country (e.g., Egypt, Morocco)"),
+    max_price: Optional[float] = Query(None, description="Maximum price per night (optional)"),
+    limit: int = Query(5, ge=1, le=20, description="Number of hotels to return"),
+    w_price: Optional[float] = Query(None, ge=0, description="Price weight (default 0.4)"),
+    w_distance: Optional[float] = Query(None, ge=0, description="Distance weight (default 0.4)"),
+    w_rating: Optional[float] = Query(None, ge=0, description="Rating weight (default 0.2)"),
+    normalize: Literal["none", "minmax", "zscore"] = Query("none", description="Per-country normalization of the score terms"),
+    cursor: Optional[str] = Query(None, description="Next page: the X-Next-Cursor header of the previous page"),
+    backend: RecommendationBackend = Depends(current_backend)
+):
+    """
+    Get the best hotel recommendations for a specific country.
+    
+    The hotels are ranked based on:
+    - **Price** (40% weight): Lower is better
+    - **Distance** (40% weight): Closer to stadium is better
+    - **Rating** (20% weight): Higher is better
+    
+    The weights can be overridden per request. Raw prices dominate the
+    score, so `normalize=minmax` (0-1 per country) or `normalize=zscore`
+    makes the three terms comparable.
+    
+    Returns hotels sorted by score (lower score = better match).
+    
+    When more hotels follow, the response has an `X-Next-Cursor` header;
+    send it back as `cursor` with the same other parameters for the next
+    page. Pages are found by seeking past the previous page's last hotel, so
+    a deep page costs the same as the first.
+    
+    Responses carry an `ETag` tied to the dataset version; sending it back in
+    `If-None-Match` returns `304 Not Modified` without running the query.
+    """
+    weights = resolve_weights(w_price, w_distance, w_rating)
+    query = (country, max_price, weights, normalize)
+    try:
+        after = decode_cursor(cursor, *query) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    etag = make_etag(backend.dataset_version(), country, max_price, limit, weights, normalize, cursor)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers(etag))
+
+    try:
+        # One row more than the page shows whether another page follows
+        results = await backend.best_hotels_async(country, max_price, limit + 1, weights, normalize, after)
+        
+        if not results and after is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No hotels found for country '{country}'. Available countries: Egypt, Morocco, Algeria, Senegal, Cameroon, Nigeria, Tunisia, Ivory Coast"
+            )
+        
+        page, next_cursor = paginate(results, limit, *query)
+        headers = cache_headers(etag)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return hotels_response(page, headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error retrieving hotels: {str(e)}"
+        )
+
+@router.post("/best-hotels/batch", response_model=Dict[str, List[HotelResponse]], tags=["Hotels"])
+async def best_hotels_batch(request: BatchRequest, backend: RecommendationBackend = Depends(current_backend)):
+    """
+    Get hotel recommendations for several countries in one call.
+    
+    Each query accepts the same filters as `/best-hotels`, including `cursor`.
+    The response is keyed by country; countries without matching hotels map
+    to an empty list. Countries with more hotels to come are listed in the
+    `X-Next-Cursors` header, a JSON object mapping each to its next cursor.
+    """
+    countries = [query.country for query in request.queries]
+    if len(set(countries)) != len(countries):
+        raise HTTPException(status_code=400, detail="Each country may appear only once per batch")
+    
+    queries = []
+    for query in request.queries:
+        weights = resolve_weights(query.w_price, query.w_distance, query.w_rating)
+        try:
+            after = decode_cursor(query.cursor, query.country, query.max_price, weights, query.normalize) if query.cursor else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"{query.country}: {e}")
+        queries.append({
+            "country": query.country,
+            "max_price": query.max_price,
+            # One row more than the page shows whether another page follows
+            "limit": query.limit + 1,
+            "weights": weights,
+            "normalize": query.normalize,
+            "after": after
+        })
+    try:
+        results = await backend.best_hotels_batch_async(queries)
+        pages, next_cursors = {}, {}
+        for requested, query in zip(request.queries, queries):
+            country = query["country"]
+            pages[country], next_cursor = paginate(
+                results.get(country, []), requested.limit,
+                country, query["max_price"], query["weights"], query["normalize"]
+            )
+            if next_cursor:
+                next_cursors[country] = next_cursor
+        headers = {"X-Next-Cursors": json.dumps(next_cursors)} if next_cursors else None
+        return hotel_batch_response(pages, headers=headers)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error retrieving hotels: {str(e)}"
+        )
+
+@router.get("/itinerary", response_model=ItineraryResponse, tags=["Hotels"])
+async def itinerary(
+    country: str = Query(..., description="Name of the country (e.g., Egypt, Morocco)"),
+    stadium: Optional[List[str]] = Query(None, description="Match sequence as stadium names, in order (default: the country's stadiums)"),
+    mode: Literal["flexible", "base"] = Query("flexible", description="flexible: hotel per match; base: one hotel for every match"),
+    max_price: Optional[float] = Query(None, description="Maximum price per night (optional)"),
+    nights: int = Query(NIGHTS_PER_MATCH, ge=1, le=14, description="Nights booked per match"),
+    minute_cost: float = Query(MINUTE_COST, ge=0, description="Cost of one minute of travel"),
+    switch_penalty: float = Query(SWITCH_PENALTY, ge=0, description="Cost of changing hotel between matches"),
+    backend: RecommendationBackend = Depends(current_backend)
+):
+    """
+    Plan hotels for all of a country's matches at once.
+    
+    Each match costs `nights * price` plus the round trip to the stadium
+    (`minute_cost` per minute, from the stored travel times), and every hotel
+    change adds `switch_penalty`. The cheapest combination is returned;
+    `mode=base` keeps the fan in one hotel for the whole tournament.
+    """
+    try:
+        planner = await backend.itinerary_planner()
+        plan = planner.plan(country, stadium, mode, max_price, nights, minute_cost, switch_penalty)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error planning itinerary: {str(e)}"
+        )
+    if plan is None:
+        raise HTTPException(status_code=404, detail=f"No hotels fit the itinerary for country '{country}'")
+    return plan
+
+@router.post("/allocation", response_model=AllocationResponse, tags=["Hotels"])
+async def allocation(request: AllocationRequest, backend: RecommendationBackend = Depends(current_backend)):
+    """
+    Spread expected fans over hotels without exceeding any hotel's capacity.
+    
+    `demand` maps countries to expected fans (countries left out get none).
+    The assignment minimizes the total score (same score as `/best-hotels`,
+    per fan); fans that fit in no nearby hotel are reported as unallocated.
+    `capacities` overrides individual hotel capacities for this request.
+    Repeated requests re-solve incrementally from the previous allocation.
+    """
+    if any(fans < 0 for fans in request.demand.values()) or any(
+        rooms < 0 for rooms in (request.capacities or {}).values()
+    ):
+        raise HTTPException(status_code=400, detail="Demand and capacities must not be negative")
+    weights = resolve_weights(request.w_price, request.w_distance, request.w_rating)
+    try:
+        return await solve_allocation(backend.allocation_rows, backend.dataset_version(), request.demand, request.capacities, weights)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error allocating fans: {str(e)}"
+        )
+
+@router.get("/export/rankings", tags=["Export"])
+async def export_rankings(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson (one JSON object per line) or csv"),
+    country: Optional[List[str]] = Query(None, description="Countries to export, repeatable (default: all)"),
+    max_price: Optional[float] = Query(None, description="Maximum price per night (optional)"),
+    w_price: Optional[float] = Query(None, ge=0, description="Price weight (default 0.4)"),
+    w_distance: Optional[float] = Query(None, ge=0, description="Distance weight (default 0.4)"),
+    w_rating: Optional[float] = Query(None, ge=0, description="Rating weight (default 0.2)"),
+    backend: RecommendationBackend = Depends(current_backend)
+):
+    """
+    Stream the full ranking of every country for bulk consumers.
+    
+    Rows are ordered by country, then best score first, with a per-country
+    `rank`; there is no `limit`. The body is streamed from the database
+    cursor, so memory stays flat however large the export is and the first
+    rows arrive before the query has finished.
+    """
+    weights = resolve_weights(w_price, w_distance, w_rating)
+    try:
+        return await export_response(backend.export_rankings(country, max_price, weights), format, "rankings")
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error exporting rankings: {str(e)}"
+        )
+
+@router.post("/holds", response_model=HoldResponse, status_code=201, tags=["Holds"])
+async def place_hold(request: HoldRequest, backend: RecommendationBackend = Depends(current_backend)):
+    """
+    Hold rooms at a hotel for a booking partner.
+    
+    The rooms come off the hotel's capacity immediately and go back when the
+    hold is released (`DELETE /holds/{hold_id}`) or expires after
+    `ttl_seconds`. Returns 409 when the hotel has fewer rooms left than
+    requested; concurrent holds can never take a hotel below zero.
+    """
+    try:
+        hold = await backend.place_hold(request.hotel, request.rooms, request.ttl_seconds or HOLD_TTL_SECONDS)
+    except InsufficientCapacity as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error placing hold: {str(e)}"
+        )
+    if hold is None:
+        raise HTTPException(status_code=404, detail=f"Hotel '{request.hotel}' not found")
+    return hold
+
+@router.delete("/holds/{hold_id}", response_model=HoldReleaseResponse, tags=["Holds"])
+async def release_hold(hold_id: str, backend: RecommendationBackend = Depends(current_backend)):
+    """Release a hold and give its rooms back to the hotel"""
+    try:
+        hold = await backend.release_hold(hold_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error releasing hold: {str(e)}"
+        )
+    if hold is None:
+        raise HTTPException(status_code=404, detail=f"Hold '{hold_id}' not found (released or expired)")
+    return hold
+
+@router.get("/health", tags=["System"])
+def health_check(backend: RecommendationBackend = Depends(current_backend)):
+    """Health check endpoint (cached result of the background backend probe)"""
+    healthy = health_monitor.ready
+    mode = MODES[backend.name]
+    database = {"MOCK": "Mock data", "MEMORY": "In-memory graph"}.get(mode, "Neo4j connected")
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={
+            "status": "healthy" if healthy else "unhealthy",
+            "mode": mode,
+            "database": database if healthy else f"Backend unreachable: {health_monitor.error}",
+            "checks": health_monitor.status()
+        }
+    )
+
+@router.get("/live", tags=["System"])
+def liveness():
+    """Liveness probe: the process is up and serving requests (never touches the backend)"""
+    return {"status": "alive"}
+
+@router.get("/ready", tags=["System"])
+def readiness():
+    """Readiness probe: 503 until the last background backend probe passed"""
+    status = health_monitor.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@router.get("/pool-stats", tags=["System"])
+def pool_stats():
+    """Connection pool statistics for the sync and async Neo4j drivers"""
+    return get_pool_stats()
+
+@router.get("/cache-stats", tags=["System"])
+def cache_stats():
+    """Result cache counters, request coalescing and materialized ranking size"""
+    return {
+        "results": best_hotels_cache.stats(),
+        "singleflight": {
+            "sync": best_hotels_flight.stats(),
+            "async": best_hotels_flight_async.stats()
+        },
+        "rankings": ranking_index.stats()
+    }
+
+@router.get("/metrics", response_class=PlainTextResponse, tags=["System"])
+def metrics():
+    """Prometheus metrics: request and Cypher latency histograms, pool, cache and ranking gauges"""
+    return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+@router.post("/admin/invalidate-cache", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def invalidate_cache(backend: RecommendationBackend = Depends(current_backend)):
+    """Drop cached recommendations and rebuild rankings after the dataset has been rewritten"""
+    await backend.invalidate()
+    return {"status": "invalidated"}
+
+@router.put("/admin/hotels/{hotel_name}/price", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def update_hotel_price(
+    hotel_name: str,
+    price: float = Query(..., gt=0),
+    backend: RecommendationBackend = Depends(current_backend)
+):
+    """Change a hotel's price; only the rankings of countries it serves are re-sorted"""
+    try:
+        reranked = await backend.update_hotel_price(hotel_name, price)
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    if reranked is None:
+        raise HTTPException(status_code=404, detail=f"Hotel '{hotel_name}' not found")
+    return {"hotel": hotel_name, "price": price, "reranked_countries": reranked}
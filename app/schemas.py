@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
 
 class HotelResponse(BaseModel):
     name: str
@@ -8,3 +10,105 @@ class HotelResponse(BaseModel):
     rating: float
     distance_km: float
     score: float
+
+@dataclass(slots=True)
+class HotelRow:
+    """HotelResponse fields as a plain typed record for the unvalidated fast path"""
+    name: str
+    stadium_name: str
+    city: str
+    price: float
+    rating: float
+    distance_km: float
+    score: float
+
+    @classmethod
+    def from_row(cls, row):
+        """Coerce a result dict (Cypher record or in-memory row) to the response types"""
+        return cls(
+            row["name"],
+            row["stadium_name"],
+            row["city"],
+            float(row["price"]),
+            float(row["rating"]),
+            float(row["distance_km"]),
+            float(row["score"]),
+        )
+
+class BatchQuery(BaseModel):
+    country: str
+    max_price: Optional[float] = None
+    limit: int = Field(5, ge=1, le=20)
+    w_price: Optional[float] = Field(None, ge=0)
+    w_distance: Optional[float] = Field(None, ge=0)
+    w_rating: Optional[float] = Field(None, ge=0)
+    normalize: Literal["none", "minmax", "zscore"] = "none"
+    cursor: Optional[str] = None
+
+class BatchRequest(BaseModel):
+    queries: List[BatchQuery] = Field(..., min_length=1, max_length=50)
+
+class ItineraryLeg(BaseModel):
+    match: int
+    stadium_name: str
+    stadium_city: str
+    hotel_name: str
+    hotel_city: str
+    price: float
+    rating: float
+    travel_time_min: int
+    cost: float
+
+class ItineraryResponse(BaseModel):
+    country: str
+    mode: Literal["flexible", "base"]
+    total_cost: float
+    hotel_changes: int
+    total_travel_min: int
+    legs: List[ItineraryLeg]
+
+class AllocationRequest(BaseModel):
+    demand: Dict[str, int] = Field(..., description="Expected fans per country")
+    capacities: Optional[Dict[str, int]] = Field(None, description="Capacity overrides per hotel")
+    w_price: Optional[float] = Field(None, ge=0)
+    w_distance: Optional[float] = Field(None, ge=0)
+    w_rating: Optional[float] = Field(None, ge=0)
+
+class AllocationAssignment(BaseModel):
+    name: str
+    stadium_name: str
+    fans: int
+    score: float
+
+class CountryAllocation(BaseModel):
+    demand: int
+    allocated: int
+    unallocated: int
+
+class AllocationResponse(BaseModel):
+    total_fans: int
+    allocated: int
+    unallocated: int
+    total_score: float
+    hotels_used: int
+    hotels_full: int
+    countries: Dict[str, CountryAllocation]
+    assignments: Dict[str, List[AllocationAssignment]]
+
+class HoldRequest(BaseModel):
+    hotel: str = Field(..., description="Hotel name")
+    rooms: int = Field(1, ge=1, le=50, description="Rooms to hold")
+    ttl_seconds: Optional[int] = Field(None, ge=1, le=86400, description="Seconds until the hold expires")
+
+class HoldResponse(BaseModel):
+    id: str
+    hotel: str
+    rooms: int
+    expires_at: str
+    remaining_capacity: int
+
+class HoldReleaseResponse(BaseModel):
+    id: str
+    hotel: str
+    rooms: int
+    remaining_capacity: int
@@ -0,0 +1,176 @@
+"""
+Vectorized hotel scoring
+score = price * w_price + distance_km * w_distance - rating * w_rating
+(lower is better). Candidates are held in columnar NumPy arrays so every
+candidate of every country is scored in one pass for any weight profile.
+
+The terms can optionally be normalized per country ("minmax" or "zscore")
+so the weights are comparable; the normalized columns are computed once
+when the store is built, so a normalized query costs the same as a raw one.
+"""
+from typing import NamedTuple
+import numpy as np
+
+class Weights(NamedTuple):
+    price: float = 0.4
+    distance: float = 0.4
+    rating: float = 0.2
+
+DEFAULT_WEIGHTS = Weights()
+
+NORMALIZATIONS = ("none", "minmax", "zscore")
+
+def resolve_weights(price: float = None, distance: float = None, rating: float = None):
+    """Weights from optional per-request overrides, defaulting each missing term"""
+    return Weights(
+        DEFAULT_WEIGHTS.price if price is None else price,
+        DEFAULT_WEIGHTS.distance if distance is None else distance,
+        DEFAULT_WEIGHTS.rating if rating is None else rating,
+    )
+
+def compute_score(price, distance_km, rating, weights: Weights = DEFAULT_WEIGHTS):
+    """Score one candidate; same expression and evaluation order as the Cypher query"""
+    return price * weights.price + distance_km * weights.distance - rating * weights.rating
+
+def column_stats(values):
+    """min/max/mean/std of one country's column, as used for normalization"""
+    if len(values) == 0:
+        return {"min": 0.0, "max": 0.0, "mean": 0.0, "std": 0.0}
+    return {
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+    }
+
+def candidate_key(row):
+    """Tie-break order for equal scores, matching the Cypher ORDER BY"""
+    return (row["name"], row["stadium_name"])
+
+class CandidateStore:
+    """All hotel-stadium candidates, grouped by country in contiguous array slices"""
+
+    def __init__(self, rows):
+        by_country = {}
+        for row in rows:
+            by_country.setdefault(row["country"], []).append(row)
+
+        self.rows = []
+        self.offsets = {}
+        for country in sorted(by_country):
+            # Rows are kept in tie-break order so lower index wins equal scores
+            country_rows = sorted(by_country[country], key=candidate_key)
+            self.offsets[country] = (len(self.rows), len(self.rows) + len(country_rows))
+            self.rows.extend(country_rows)
+
+        self.price = np.array([row["price"] for row in self.rows], dtype=np.float64)
+        self.distance = np.array([row["distance_km"] for row in self.rows], dtype=np.float64)
+        self.rating = np.array([row["rating"] for row in self.rows], dtype=np.float64)
+
+        raw = {"price": self.price, "distance": self.distance, "rating": self.rating}
+        self.stats = {
+            country: {name: column_stats(values[start:end]) for name, values in raw.items()}
+            for country, (start, end) in self.offsets.items()
+        }
+        self.columns = {"none": (self.price, self.distance, self.rating)}
+        for mode in NORMALIZATIONS[1:]:
+            self.columns[mode] = tuple(self._normalized(name, values, mode) for name, values in raw.items())
+
+    def __len__(self):
+        return len(self.rows)
+
+    def countries(self):
+        return list(self.offsets)
+
+    def scores(self, weights: Weights = DEFAULT_WEIGHTS, normalize: str = "none"):
+        """Scores for every candidate of every country in one vectorized pass"""
+        price, distance, rating = self.columns[normalize]
+        return price * weights.price + distance * weights.distance - rating * weights.rating
+
+    def _normalized(self, name, values, mode):
+        """Column rescaled with each country's own statistics"""
+        normalized = np.zeros_like(values)
+        for country, (start, end) in self.offsets.items():
+            stats = self.stats[country][name]
+            if mode == "minmax":
+                spread = stats["max"] - stats["min"]
+                if spread > 0:
+                    normalized[start:end] = (values[start:end] - stats["min"]) / spread
+            elif stats["std"] > 0:
+                normalized[start:end] = (values[start:end] - stats["mean"]) / stats["std"]
+        return normalized
+
+    def country_scores(self, country: str, weights: Weights = DEFAULT_WEIGHTS, normalize: str = "none"):
+        """Scores for one country's slice only"""
+        start, end = self.offsets[country]
+        price, distance, rating = (column[start:end] for column in self.columns[normalize])
+        return price * weights.price + distance * weights.distance - rating * weights.rating
+
+    def after_mask(self, country: str, country_scores, after):
+        """Which of a country's candidates rank strictly after the (score, name, stadium_name) key `after`"""
+        start, _ = self.offsets[country]
+        score, name, stadium_name = after
+        mask = country_scores > score
+        # Equal scores fall back to the tie-break order
+        for i in np.flatnonzero(country_scores == score):
+            mask[i] = candidate_key(self.rows[start + i]) > (name, stadium_name)
+        return mask
+
+    def top_k_indices(self, country: str, k: int, country_scores, max_price: float = None, after=None):
+        """Global row indices of a country's best `k` candidates (after the key `after`, if given), best first"""
+        if country not in self.offsets or k <= 0:
+            return np.empty(0, dtype=np.intp)
+        start, end = self.offsets[country]
+        if max_price is not None:
+            country_scores = np.where(self.price[start:end] <= max_price, country_scores, np.inf)
+        if after is not None:
+            country_scores = np.where(self.after_mask(country, country_scores, after), country_scores, np.inf)
+        if max_price is not None or after is not None:
+            k = min(k, int(np.count_nonzero(np.isfinite(country_scores))))
+        else:
+            k = min(k, end - start)
+        if k == 0:
+            return np.empty(0, dtype=np.intp)
+
+        if k < len(country_scores):
+            # argpartition finds the k-th best score in O(n); ties at that score
+            # are then filled in row order so the result is deterministic
+            kth = country_scores[np.argpartition(country_scores, k - 1)[k - 1]]
+            below = np.flatnonzero(country_scores < kth)
+            tied = np.flatnonzero(country_scores == kth)[:k - len(below)]
+            chosen = np.concatenate([below, tied])
+        else:
+            chosen = np.arange(len(country_scores))
+        order = chosen[np.argsort(country_scores[chosen], kind="stable")]
+        return order + start
+
+    def top_k(self, country: str, k: int, weights: Weights = DEFAULT_WEIGHTS, max_price: float = None,
+              normalize: str = "none", scores=None, after=None):
+        """Response-shaped rows for a country's best `k` candidates
+
+        `scores` may be a precomputed all-country array from scores();
+        `after` is a (score, name, stadium_name) key to page past.
+        """
+        if country not in self.offsets:
+            return []
+        start, end = self.offsets[country]
+        country_scores = scores[start:end] if scores is not None else self.country_scores(country, weights, normalize)
+        indices = self.top_k_indices(country, k, country_scores, max_price, after)
+        return [self.result_row(i, country_scores[i - start]) for i in indices]
+
+    def rank_all(self, k: int, weights: Weights = DEFAULT_WEIGHTS, max_price: float = None, normalize: str = "none"):
+        """Top `k` rows for every country, scoring everything once"""
+        scores = self.scores(weights, normalize)
+        return {country: self.top_k(country, k, weights, max_price, normalize, scores) for country in self.offsets}
+
+    def result_row(self, index, score):
+        row = self.rows[index]
+        return {
+            "name": row["name"],
+            "stadium_name": row["stadium_name"],
+            "city": row["city"],
+            "price": row["price"],
+            "rating": row["rating"],
+            "distance_km": row["distance_km"],
+            "score": float(score),
+        }
@@ -1,28 +1,552 @@
-from app.database import get_session
-
-def get_best_hotels(country: str, max_price: float = None, limit: int = 5):
-    query = """
-    MATCH (c:Country {name:$country})-[:PLAYS_AT]->(s:Stadium)
-          -[r:HAS_NEARBY_HOTEL]->(h:Hotel)
-    WHERE ($max_price IS NULL OR h.price <= $max_price)
-    WITH h, r, s,
-         (h.price * 0.4 + r.distance_km * 0.4 - h.rating * 0.2) AS score
-    RETURN h.name AS name,
-           s.name AS stadium_name,
-           h.city AS city,
-           h.price AS price,
-           h.rating AS rating,
-           r.distance_km AS distance_km,
-           score
-    ORDER BY score ASC
-    LIMIT $limit
+from app.cache import MISSING, TTLCache
+from app.database import get_async_session, get_session
+from app.holds import HOLD_TTL_SECONDS, InsufficientCapacity, capacity_changed, expiry_iso, hold_stats, new_hold_id
+from app.itinerary import ItineraryPlanner
+from app.metrics import observe_query, registry
+from app.rankings import RankingIndex
+from app.scoring import DEFAULT_WEIGHTS, CandidateStore, Weights
+from app.singleflight import AsyncSingleFlight, SingleFlight
+import asyncio
+import json
+import os
+import time
+import urllib.request
+import uuid
+
+# Results are shared between callers, treat them as read-only
+best_hotels_cache = TTLCache(
+    maxsize=int(os.getenv("RESULT_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("RESULT_CACHE_TTL", "300"))
+)
+
+# Identical concurrent cache misses share one database call
+SINGLE_FLIGHT = os.getenv("SINGLE_FLIGHT", "true").lower() == "true"
+best_hotels_flight = SingleFlight()
+best_hotels_flight_async = AsyncSingleFlight()
+
+# Per-country rankings served from memory once loaded at startup
+MATERIALIZE_RANKINGS = os.getenv("MATERIALIZE_RANKINGS", "true").lower() == "true"
+ranking_index = RankingIndex()
+
+# Records pulled from Neo4j per round trip while streaming /export/rankings
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "1000"))
+
+# Without materialized rankings the dataset version is this process's count of
+# data changes; the token keeps versions from different processes apart
+_process_token = uuid.uuid4().hex[:8]
+_data_generation = 0
+
+# Built from Neo4j on the first itinerary request, dropped on data changes
+_itinerary_planner = None
+
+BEST_HOTELS_QUERY = """
+MATCH (c:Country {name:$country})-[:PLAYS_AT]->(s:Stadium)
+      -[r:HAS_NEARBY_HOTEL]->(h:Hotel)
+WHERE ($max_price IS NULL OR h.price <= $max_price)
+WITH h, r, s,
+     (h.price * $w_price + r.distance_km * $w_distance - h.rating * $w_rating) AS score
+RETURN h.name AS name,
+       s.name AS stadium_name,
+       h.city AS city,
+       h.price AS price,
+       h.rating AS rating,
+       r.distance_km AS distance_km,
+       score
+ORDER BY score ASC, name ASC, stadium_name ASC
+LIMIT $limit
+"""
+
+# Next page of BEST_HOTELS_QUERY after a cursor: a seek on the sort key
+# instead of SKIP, so a deep page costs the same as the first
+BEST_HOTELS_AFTER_QUERY = """
+MATCH (c:Country {name:$country})-[:PLAYS_AT]->(s:Stadium)
+      -[r:HAS_NEARBY_HOTEL]->(h:Hotel)
+WHERE ($max_price IS NULL OR h.price <= $max_price)
+WITH h, r, s,
+     (h.price * $w_price + r.distance_km * $w_distance - h.rating * $w_rating) AS score
+WHERE score > $after_score
+   OR (score = $after_score AND (h.name > $after_name OR (h.name = $after_name AND s.name > $after_stadium)))
+RETURN h.name AS name,
+       s.name AS stadium_name,
+       h.city AS city,
+       h.price AS price,
+       h.rating AS rating,
+       r.distance_km AS distance_km,
+       score
+ORDER BY score ASC, name ASC, stadium_name ASC
+LIMIT $limit
+"""
+
+# One round-trip for many countries: per-country top-k via ordered collect()
+BATCH_BEST_HOTELS_QUERY = """
+UNWIND $queries AS q
+MATCH (c:Country {name:q.country})-[:PLAYS_AT]->(s:Stadium)
+      -[r:HAS_NEARBY_HOTEL]->(h:Hotel)
+WHERE (q.max_price IS NULL OR h.price <= q.max_price)
+WITH q, h, r, s,
+     (h.price * q.w_price + r.distance_km * q.w_distance - h.rating * q.w_rating) AS score
+ORDER BY score ASC, h.name ASC, s.name ASC
+WITH q, collect({
+         name: h.name,
+         stadium_name: s.name,
+         city: h.city,
+         price: h.price,
+         rating: h.rating,
+         distance_km: r.distance_km,
+         score: score
+     })[0..q.limit] AS hotels
+RETURN q.country AS country, hotels
+"""
+
+# Bulk export of every ranking candidate, scored in memory by app.scoring
+RANKING_EXPORT_QUERY = """
+MATCH (c:Country)-[:PLAYS_AT]->(s:Stadium)
+      -[r:HAS_NEARBY_HOTEL]->(h:Hotel)
+WHERE ($countries IS NULL OR c.name IN $countries)
+RETURN c.name AS country,
+       h.name AS name,
+       s.name AS stadium_name,
+       h.city AS city,
+       h.price AS price,
+       h.rating AS rating,
+       r.distance_km AS distance_km
+"""
+
+# Every country's full ranking for /export/rankings. The subquery sorts one
+# country at a time, so the first country's rows stream out while the
+# others are still to be sorted and the server never sorts everything at once
+EXPORT_RANKINGS_QUERY = """
+MATCH (c:Country)
+WHERE ($countries IS NULL OR c.name IN $countries)
+WITH c
+ORDER BY c.name ASC
+CALL {
+  WITH c
+  MATCH (c)-[:PLAYS_AT]->(s:Stadium)-[r:HAS_NEARBY_HOTEL]->(h:Hotel)
+  WHERE ($max_price IS NULL OR h.price <= $max_price)
+  WITH h, r, s,
+       (h.price * $w_price + r.distance_km * $w_distance - h.rating * $w_rating) AS score
+  RETURN h.name AS name,
+         s.name AS stadium_name,
+         h.city AS city,
+         h.price AS price,
+         h.rating AS rating,
+         r.distance_km AS distance_km,
+         score
+  ORDER BY score ASC, name ASC, stadium_name ASC
+}
+RETURN c.name AS country, name, stadium_name, city, price, rating, distance_km, score
+"""
+
+# Ranking candidates plus hotel capacity, for app.allocation
+ALLOCATION_EXPORT_QUERY = """
+MATCH (c:Country)-[:PLAYS_AT]->(s:Stadium)
+      -[r:HAS_NEARBY_HOTEL]->(h:Hotel)
+RETURN c.name AS country,
+       h.name AS name,
+       s.name AS stadium_name,
+       h.price AS price,
+       h.rating AS rating,
+       r.distance_km AS distance_km,
+       h.capacity AS capacity
+"""
+
+# Everything the itinerary planner needs: stadiums, PLAYS_AT, and every
+# HAS_NEARBY_HOTEL edge with its hotel (hotels far from all stadiums are skipped)
+ITINERARY_STADIUMS_QUERY = """
+MATCH (s:Stadium)
+OPTIONAL MATCH (c:Country)-[:PLAYS_AT]->(s)
+RETURN s.name AS name,
+       s.city AS city,
+       s.location.latitude AS latitude,
+       s.location.longitude AS longitude,
+       collect(c.name) AS countries
+"""
+
+ITINERARY_EDGES_QUERY = """
+MATCH (s:Stadium)-[r:HAS_NEARBY_HOTEL]->(h:Hotel)
+RETURN s.name AS stadium,
+       h.name AS name,
+       h.city AS city,
+       h.price AS price,
+       h.rating AS rating,
+       h.location.latitude AS latitude,
+       h.location.longitude AS longitude,
+       r.travel_time_min AS travel_time_min
+"""
+
+UPDATE_HOTEL_PRICE_QUERY = """
+MATCH (h:Hotel {name:$name})
+SET h.price = $price
+RETURN h.name AS name
+"""
+
+# Holds lock the hotel before reading its capacity, so concurrent holds on one
+# hotel are serialized and the check-and-decrement cannot oversell. Setting
+# and removing _lock in one clause takes the node's write lock, which is held
+# until commit, and never leaves the property behind whatever matches later
+PLACE_HOLD_QUERY = """
+MATCH (h:Hotel {name:$hotel})
+SET h._lock = true REMOVE h._lock
+WITH h, coalesce(h.capacity, 0) >= $rooms AS available
+FOREACH (_ IN CASE WHEN available THEN [1] ELSE [] END |
+  SET h.capacity = h.capacity - $rooms
+  CREATE (:Hold {id:$id, rooms:$rooms, created_at:timestamp(), expires_at:timestamp() + $ttl_ms})-[:HOLDS]->(h)
+)
+RETURN available,
+       coalesce(h.capacity, 0) AS remaining,
+       timestamp() + $ttl_ms AS expires_at
+"""
+
+# The hold is matched again once its hotel is locked: a concurrent release
+# or expiry that got there first has deleted it and this one returns nothing
+RELEASE_HOLD_QUERY = """
+MATCH (:Hold {id:$id})-[:HOLDS]->(h:Hotel)
+SET h._lock = true REMOVE h._lock
+WITH h
+MATCH (hold:Hold {id:$id})-[:HOLDS]->(h)
+SET h.capacity = h.capacity + hold.rooms
+WITH h, hold, hold.rooms AS rooms
+DETACH DELETE hold
+RETURN h.name AS hotel,
+       rooms,
+       h.capacity AS remaining
+"""
+
+# Same re-match: holds a concurrent release or expiry already removed drop out
+EXPIRE_HOLDS_QUERY = """
+MATCH (expired:Hold)
+WHERE expired.expires_at <= timestamp()
+WITH expired LIMIT $batch
+MATCH (expired)-[:HOLDS]->(h:Hotel)
+WITH DISTINCT h
+SET h._lock = true REMOVE h._lock
+WITH h
+MATCH (hold:Hold)-[:HOLDS]->(h)
+WHERE hold.expires_at <= timestamp()
+WITH h, collect(hold) AS holds, sum(hold.rooms) AS rooms
+SET h.capacity = h.capacity + rooms
+FOREACH (hold IN holds | DETACH DELETE hold)
+RETURN sum(size(holds)) AS expired
+"""
+
+def run_query(session, name: str, query: str, **params):
+    """Run `query` and return its rows as dicts, recording client and server timings under `name`"""
+    start = time.perf_counter()
+    result = session.run(query, params)
+    rows = [record.data() for record in result]
+    observe_query(name, time.perf_counter() - start, result.consume())
+    return rows
+
+async def run_query_async(session, name: str, query: str, **params):
+    """Async variant of run_query"""
+    start = time.perf_counter()
+    result = await session.run(query, params)
+    rows = [record.data() async for record in result]
+    observe_query(name, time.perf_counter() - start, await result.consume())
+    return rows
+
+async def run_write_async(name: str, query: str, **params):
+    """Run a write in a managed transaction (retried on deadlocks and transient errors) and return its rows"""
+    async def work(tx):
+        result = await tx.run(query, params)
+        rows = [record.data() async for record in result]
+        return rows, await result.consume()
+
+    start = time.perf_counter()
+    async with get_async_session() as session:
+        rows, summary = await session.execute_write(work)
+    observe_query(name, time.perf_counter() - start, summary)
+    return rows
+
+def best_hotels_params(country: str, max_price: float, limit: int, weights: Weights):
+    return {
+        "country": country,
+        "max_price": max_price,
+        "limit": limit,
+        "w_price": weights.price,
+        "w_distance": weights.distance,
+        "w_rating": weights.rating,
+    }
+
+def best_hotels_query(country: str, max_price: float, limit: int, weights: Weights, after=None):
+    """(name, query, params) for one page; `after` is the (score, name, stadium_name) key of the previous page's last row"""
+    params = best_hotels_params(country, max_price, limit, weights)
+    if after is None:
+        return "best_hotels", BEST_HOTELS_QUERY, params
+    params["after_score"], params["after_name"], params["after_stadium"] = after
+    return "best_hotels_after", BEST_HOTELS_AFTER_QUERY, params
+
+def best_hotels_from_memory(country: str, max_price: float, limit: int, weights: Weights, normalize: str,
+                            after=None):
+    """Answer from the materialized rankings (default scoring) or candidate arrays"""
+    if weights == DEFAULT_WEIGHTS and normalize == "none":
+        return ranking_index.top(country, max_price, limit, after)
+    return ranking_index.top_k(country, limit, weights, max_price, normalize, after)
+
+def get_best_hotels(country: str, max_price: float = None, limit: int = 5,
+                    weights: Weights = DEFAULT_WEIGHTS, normalize: str = "none", after=None):
+    if ranking_index.loaded:
+        return best_hotels_from_memory(country, max_price, limit, weights, normalize, after)
+
+    key = (country, max_price, limit, weights, normalize, after)
+    cached = best_hotels_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    if SINGLE_FLIGHT:
+        return best_hotels_flight.do(key, fetch_best_hotels, country, max_price, limit, weights, normalize, after)
+    return fetch_best_hotels(country, max_price, limit, weights, normalize, after)
+
+def fetch_best_hotels(country: str, max_price: float, limit: int, weights: Weights, normalize: str, after=None):
+    """Query Neo4j for one recommendation and cache it"""
+    with get_session() as session:
+        if normalize == "none":
+            name, query, params = best_hotels_query(country, max_price, limit, weights, after)
+            hotels = run_query(session, name, query, **params)
+        else:
+            # Normalizing needs the country's full candidate set
+            rows = run_query(session, "ranking_export", RANKING_EXPORT_QUERY, countries=[country])
+            hotels = CandidateStore(rows).top_k(country, limit, weights, max_price, normalize, after=after)
+    best_hotels_cache.set((country, max_price, limit, weights, normalize, after), hotels)
+    return hotels
+
+async def get_best_hotels_async(country: str, max_price: float = None, limit: int = 5,
+                                weights: Weights = DEFAULT_WEIGHTS, normalize: str = "none", after=None):
+    """Async variant of get_best_hotels for use from async endpoints"""
+    if ranking_index.loaded:
+        return best_hotels_from_memory(country, max_price, limit, weights, normalize, after)
+
+    key = (country, max_price, limit, weights, normalize, after)
+    cached = best_hotels_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    if SINGLE_FLIGHT:
+        return await best_hotels_flight_async.do(
+            key, fetch_best_hotels_async, country, max_price, limit, weights, normalize, after
+        )
+    return await fetch_best_hotels_async(country, max_price, limit, weights, normalize, after)
+
+async def fetch_best_hotels_async(country: str, max_price: float, limit: int, weights: Weights, normalize: str,
+                                  after=None):
+    """Async variant of fetch_best_hotels"""
+    async with get_async_session() as session:
+        if normalize == "none":
+            name, query, params = best_hotels_query(country, max_price, limit, weights, after)
+            hotels = await run_query_async(session, name, query, **params)
+        else:
+            # Normalizing needs the country's full candidate set
+            rows = await run_query_async(session, "ranking_export", RANKING_EXPORT_QUERY, countries=[country])
+            hotels = CandidateStore(rows).top_k(country, limit, weights, max_price, normalize, after=after)
+    best_hotels_cache.set((country, max_price, limit, weights, normalize, after), hotels)
+    return hotels
+
+async def get_best_hotels_batch_async(queries: list):
+    """Recommendations for several countries at once, keyed by country
+
+    Each query is a dict with country, max_price, limit, weights and normalize,
+    plus an optional `after` key to page past.
     """
+    results = {query["country"]: [] for query in queries}
+    if ranking_index.loaded:
+        for query in queries:
+            results[query["country"]] = best_hotels_from_memory(
+                query["country"], query["max_price"], query["limit"], query["weights"], query["normalize"],
+                query.get("after")
+            )
+        return results
+
+    # Only first pages of raw scores fit the single batch query; the rest seek one by one
+    raw = [query for query in queries if query["normalize"] == "none" and query.get("after") is None]
+    for query in queries:
+        if query["normalize"] != "none" or query.get("after") is not None:
+            results[query["country"]] = await get_best_hotels_async(
+                query["country"], query["max_price"], query["limit"], query["weights"], query["normalize"],
+                query.get("after")
+            )
+    if raw:
+        params = [best_hotels_params(q["country"], q["max_price"], q["limit"], q["weights"]) for q in raw]
+        async with get_async_session() as session:
+            for row in await run_query_async(session, "best_hotels_batch", BATCH_BEST_HOTELS_QUERY, queries=params):
+                results[row["country"]] = row["hotels"]
+    return results
 
+def load_rankings(countries: list = None):
+    """Materialize rankings from one bulk export; only `countries` when given"""
     with get_session() as session:
-        result = session.run(
-            query,
-            country=country,
-            max_price=max_price,
-            limit=limit
+        rows = run_query(session, "ranking_export", RANKING_EXPORT_QUERY, countries=countries)
+    if countries is None:
+        return ranking_index.build(rows)
+    return ranking_index.refresh(rows, countries)
+
+async def load_rankings_async(countries: list = None):
+    """Async variant of load_rankings used by the API lifespan"""
+    async with get_async_session() as session:
+        rows = await run_query_async(session, "ranking_export", RANKING_EXPORT_QUERY, countries=countries)
+    if countries is None:
+        return ranking_index.build(rows)
+    return ranking_index.refresh(rows, countries)
+
+async def update_hotel_price_async(name: str, price: float):
+    """Admin write: change a hotel's price and re-rank only the countries it serves
+
+    Only this process re-ranks incrementally; the API servers in
+    API_INVALIDATE_URLS are told to rebuild (see notify_data_changed).
+    """
+    async with get_async_session() as session:
+        rows = await run_query_async(session, "update_hotel_price", UPDATE_HOTEL_PRICE_QUERY, name=name, price=price)
+    if not rows:
+        return None
+    await asyncio.to_thread(notify_data_changed)
+    return ranking_index.update_hotel(name, price=price)
+
+async def load_allocation_rows_async():
+    """Candidate rows with hotel capacity for the fan allocator"""
+    async with get_async_session() as session:
+        return await run_query_async(session, "allocation_export", ALLOCATION_EXPORT_QUERY)
+
+async def stream_rankings_async(countries: list = None, max_price: float = None,
+                                weights: Weights = DEFAULT_WEIGHTS, fetch_size: int = EXPORT_FETCH_SIZE):
+    """Yield every country's ranking rows straight off the Neo4j cursor, `fetch_size` records at a time
+
+    Nothing is collected: memory stays the same however many rows the export has.
+    """
+    params = {
+        "countries": countries,
+        "max_price": max_price,
+        "w_price": weights.price,
+        "w_distance": weights.distance,
+        "w_rating": weights.rating,
+    }
+    start = time.perf_counter()
+    async with get_async_session(fetch_size=fetch_size) as session:
+        result = await session.run(EXPORT_RANKINGS_QUERY, params)
+        async for record in result:
+            yield record.data()
+        observe_query("export_rankings", time.perf_counter() - start, await result.consume())
+
+async def get_itinerary_planner_async():
+    """ItineraryPlanner over the current database, loaded once and reused until the data changes"""
+    global _itinerary_planner
+    if _itinerary_planner is None:
+        async with get_async_session() as session:
+            stadiums = await run_query_async(session, "itinerary_stadiums", ITINERARY_STADIUMS_QUERY)
+            edges = await run_query_async(session, "itinerary_edges", ITINERARY_EDGES_QUERY)
+        hotels = {row["name"]: row for row in edges}
+        _itinerary_planner = ItineraryPlanner(
+            stadiums,
+            hotels.values(),
+            [(row["stadium"], row["name"], row["travel_time_min"]) for row in edges],
+            [(country, stadium["name"]) for stadium in stadiums for country in stadium["countries"]],
         )
-        return [record.data() for record in result]
+    return _itinerary_planner
+
+async def place_hold_async(hotel: str, rooms: int, ttl_seconds: int = HOLD_TTL_SECONDS):
+    """Hold `rooms` at `hotel`; None if the hotel does not exist, InsufficientCapacity if it is full"""
+    hold_id = new_hold_id()
+    rows = await run_write_async("place_hold", PLACE_HOLD_QUERY, hotel=hotel, rooms=rooms, id=hold_id,
+                                 ttl_ms=ttl_seconds * 1000)
+    if not rows:
+        return None
+    row = rows[0]
+    if not row["available"]:
+        hold_stats.rejected += 1
+        raise InsufficientCapacity(hotel, rooms, row["remaining"])
+    hold_stats.placed += 1
+    capacity_changed()
+    return {"id": hold_id, "hotel": hotel, "rooms": rooms, "expires_at": expiry_iso(row["expires_at"]),
+            "remaining_capacity": row["remaining"]}
+
+async def release_hold_async(hold_id: str):
+    """Give a hold's rooms back; None if it does not exist (already released or expired)"""
+    rows = await run_write_async("release_hold", RELEASE_HOLD_QUERY, id=hold_id)
+    if not rows:
+        return None
+    hold_stats.released += 1
+    capacity_changed()
+    row = rows[0]
+    return {"id": hold_id, "hotel": row["hotel"], "rooms": row["rooms"], "remaining_capacity": row["remaining"]}
+
+async def expire_holds_async(batch: int = 1000):
+    """Release every expired hold, `batch` at a time; returns how many"""
+    total = 0
+    while True:
+        rows = await run_write_async("expire_holds", EXPIRE_HOLDS_QUERY, batch=batch)
+        expired = rows[0]["expired"] if rows else 0
+        total += expired
+        if expired < batch:
+            break
+    hold_stats.expired += total
+    if total:
+        capacity_changed()
+    return total
+
+def invalidate_caches():
+    """Drop cached recommendations in this process after a data change"""
+    global _data_generation, _itinerary_planner
+    best_hotels_cache.clear()
+    _itinerary_planner = None
+    _data_generation += 1
+
+def dataset_version():
+    """Identifier of the data responses are computed from (used for ETags)
+
+    With materialized rankings it is a content hash, so every process
+    serving the same data agrees on it.
+    """
+    if ranking_index.loaded:
+        return ranking_index.version
+    return f"{_process_token}-{_data_generation}"
+
+async def refresh_after_data_change():
+    """Clear caches and rebuild the materialized rankings if they are in use"""
+    invalidate_caches()
+    if ranking_index.loaded:
+        await load_rankings_async()
+
+def notify_data_changed():
+    """Invalidation hook for writers: clears local caches and tells running API servers
+
+    API servers are listed in API_INVALIDATE_URLS (comma separated base URLs)
+    and are only called when ADMIN_TOKEN is set, since they reject anything else.
+    """
+    invalidate_caches()
+    urls = [url.strip().rstrip("/") for url in os.getenv("API_INVALIDATE_URLS", "").split(",") if url.strip()]
+    token = os.getenv("ADMIN_TOKEN")
+    if urls and not token:
+        print("⚠️  ADMIN_TOKEN is not set; skipping API cache invalidation")
+        return
+    for base_url in urls:
+        request = urllib.request.Request(
+            f"{base_url}/admin/invalidate-cache",
+            data=json.dumps({}).encode(),
+            headers={
+                "Content-Type": "application/json",
+                "X-Admin-Token": token,
+            },
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=5):
+                print(f"✓ Invalidated API cache at {base_url}")
+        except Exception as e:
+            print(f"⚠️  Could not invalidate API cache at {base_url}: {e}")
+
+@registry.register_collector
+def service_metrics():
+    """Result cache, single-flight and ranking gauges for /metrics"""
+    cache = best_hotels_cache.stats()
+    yield "result_cache_entries", "gauge", "Entries in the result cache", [({}, cache["size"])]
+    yield "result_cache_hit_ratio", "gauge", "Result cache hit rate since start", [({}, cache["hit_rate"])]
+    for counter in ("hits", "misses", "evictions", "expirations", "invalidations"):
+        yield f"result_cache_{counter}_total", "counter", f"Result cache {counter}", [({}, cache[counter])]
+
+    flights = {"sync": best_hotels_flight.stats(), "async": best_hotels_flight_async.stats()}
+    for counter in ("requests", "executions", "shared"):
+        yield (f"singleflight_{counter}_total", "counter", f"Single-flight {counter}",
+               [({"path": path}, stats[counter]) for path, stats in flights.items()])
+    yield ("singleflight_dedup_ratio", "gauge", "Share of requests served by another caller's query",
+           [({"path": path}, stats["dedup_ratio"]) for path, stats in flights.items()])
+
+    rankings = ranking_index.stats()
+    yield "rankings_loaded", "gauge", "1 when rankings are materialized", [({}, int(rankings["loaded"]))]
+    yield "rankings_rows", "gauge", "Candidate rows in the materialized rankings", [({}, rankings["rows"])]
@@ -3,32 +3,56 @@ Mock service for testing without Neo4j database
 Use this to test the API endpoints when database is not available
 """
 
-# Mock data for testing
+# Mock data for testing (same row shape as the real backends)
 MOCK_DATA = {
     "Egypt": [
-        {"name": "Le Meridien Cairo", "price": 180.0, "rating": 4.7, "distance_km": 3.5, "score": 73.46},
-        {"name": "Cairo Marriott Hotel", "price": 150.0, "rating": 4.5, "distance_km": 5.2, "score": 61.18},
-        {"name": "Ramses Hilton", "price": 120.0, "rating": 4.2, "distance_km": 6.8, "score": 50.88},
-        {"name": "Budget Inn Cairo", "price": 50.0, "rating": 3.5, "distance_km": 8.0, "score": 23.2},
+        {"name": "Le Meridien Cairo", "stadium_name": "Cairo International Stadium", "city": "Cairo", "price": 180.0, "rating": 4.7, "distance_km": 3.5, "score": 73.46},
+        {"name": "Cairo Marriott Hotel", "stadium_name": "Cairo International Stadium", "city": "Cairo", "price": 150.0, "rating": 4.5, "distance_km": 5.2, "score": 61.18},
+        {"name": "Ramses Hilton", "stadium_name": "Cairo International Stadium", "city": "Cairo", "price": 120.0, "rating": 4.2, "distance_km": 6.8, "score": 50.88},
+        {"name": "Budget Inn Cairo", "stadium_name": "Cairo International Stadium", "city": "Cairo", "price": 50.0, "rating": 3.5, "distance_km": 8.0, "score": 23.2},
     ],
     "Morocco": [
-        {"name": "Hyatt Regency Casablanca", "price": 160.0, "rating": 4.6, "distance_km": 4.5, "score": 66.88},
-        {"name": "Kenzi Tower Hotel", "price": 140.0, "rating": 4.3, "distance_km": 5.0, "score": 58.14},
-        {"name": "Ibis Casa Voyageurs", "price": 70.0, "rating": 3.8, "distance_km": 6.5, "score": 30.84},
+        {"name": "Hyatt Regency Casablanca", "stadium_name": "Mohammed V Stadium", "city": "Casablanca", "price": 160.0, "rating": 4.6, "distance_km": 4.5, "score": 66.88},
+        {"name": "Kenzi Tower Hotel", "stadium_name": "Mohammed V Stadium", "city": "Casablanca", "price": 140.0, "rating": 4.3, "distance_km": 5.0, "score": 58.14},
+        {"name": "Ibis Casa Voyageurs", "stadium_name": "Mohammed V Stadium", "city": "Casablanca", "price": 70.0, "rating": 3.8, "distance_km": 6.5, "score": 30.84},
     ],
     "Algeria": [
-        {"name": "Sofitel Algiers", "price": 200.0, "rating": 4.8, "distance_km": 3.0, "score": 81.24},
-        {"name": "Sheraton Algiers", "price": 170.0, "rating": 4.4, "distance_km": 4.0, "score": 69.72},
-        {"name": "Hotel Aurassi", "price": 90.0, "rating": 3.9, "distance_km": 7.0, "score": 39.02},
+        {"name": "Sofitel Algiers", "stadium_name": "Stade du 5 Juillet", "city": "Algiers", "price": 200.0, "rating": 4.8, "distance_km": 3.0, "score": 81.24},
+        {"name": "Sheraton Algiers", "stadium_name": "Stade du 5 Juillet", "city": "Algiers", "price": 170.0, "rating": 4.4, "distance_km": 4.0, "score": 69.72},
+        {"name": "Hotel Aurassi", "stadium_name": "Stade du 5 Juillet", "city": "Algiers", "price": 90.0, "rating": 3.9, "distance_km": 7.0, "score": 39.02},
     ],
     "Senegal": [
-        {"name": "Radisson Blu Dakar", "price": 155.0, "rating": 4.5, "distance_km": 8.0, "score": 65.2},
-        {"name": "King Fahd Palace", "price": 250.0, "rating": 4.9, "distance_km": 9.0, "score": 103.82},
-        {"name": "Dakar Budget Hotel", "price": 60.0, "rating": 3.6, "distance_km": 12.0, "score": 29.28},
+        {"name": "Radisson Blu Dakar", "stadium_name": "Stade Leopold Senghor", "city": "Dakar", "price": 155.0, "rating": 4.5, "distance_km": 8.0, "score": 65.2},
+        {"name": "King Fahd Palace", "stadium_name": "Stade Leopold Senghor", "city": "Dakar", "price": 250.0, "rating": 4.9, "distance_km": 9.0, "score": 103.82},
+        {"name": "Dakar Budget Hotel", "stadium_name": "Stade Leopold Senghor", "city": "Dakar", "price": 60.0, "rating": 3.6, "distance_km": 12.0, "score": 29.28},
     ]
 }
 
-def get_best_hotels_mock(country: str, max_price: float = None, limit: int = 5):
+# Rooms per sample hotel, for holds
+MOCK_CAPACITY = {
+    "Le Meridien Cairo": 120, "Cairo Marriott Hotel": 200, "Ramses Hilton": 150, "Budget Inn Cairo": 40,
+    "Hyatt Regency Casablanca": 140, "Kenzi Tower Hotel": 110, "Ibis Casa Voyageurs": 60,
+    "Sofitel Algiers": 130, "Sheraton Algiers": 160, "Hotel Aurassi": 80,
+    "Radisson Blu Dakar": 120, "King Fahd Palace": 180, "Dakar Budget Hotel": 35,
+}
+
+class MockHotel:
+    """Sample hotel as the hold ledger sees it: a name and a mutable capacity"""
+    __slots__ = ("name", "capacity")
+
+    def __init__(self, name, capacity):
+        self.name = name
+        self.capacity = capacity
+
+def mock_hotels():
+    """Fresh hold records for every hotel in MOCK_DATA"""
+    names = sorted({row["name"] for rows in MOCK_DATA.values() for row in rows})
+    return [MockHotel(name, MOCK_CAPACITY[name]) for name in names]
+
+# Mock data never changes, so its version is fixed
+MOCK_VERSION = "mock-1"
+
+def get_best_hotels_mock(country: str, max_price: float = None, limit: int = 5, after=None):
     """
     Mock version of get_best_hotels that returns sample data
     Use this when Neo4j database is not available
@@ -40,6 +64,17 @@ def get_best_hotels_mock(country: str, max_price: float = None, limit: int = 5):
         hotels = [h for h in hotels if h["price"] <= max_price]
     
     # Sort by score and limit results
-    hotels = sorted(hotels, key=lambda x: x["score"])[:limit]
+    hotels = sorted(hotels, key=lambda x: (x["score"], x["name"], x["stadium_name"]))
     
-    return hotels
+    # Keyset pagination: only rows ranked after the cursor's (score, name, stadium_name)
+    if after is not None:
+        hotels = [h for h in hotels if (h["score"], h["name"], h["stadium_name"]) > after]
+    
+    return hotels[:limit]
+
+async def get_best_hotels_batch_mock_async(queries: list):
+    """Mock counterpart of get_best_hotels_batch_async"""
+    return {
+        query["country"]: get_best_hotels_mock(query["country"], query["max_price"], query["limit"], query.get("after"))
+        for query in queries
+    }
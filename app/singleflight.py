@@ -0,0 +1,99 @@
+"""
+Request coalescing ("single-flight")
+Concurrent calls with the same key share one execution: the first caller
+runs it and every caller that arrives while it is in flight gets the same
+result (or exception). Nothing is kept once the call finishes, so this
+only merges overlapping requests; caching is TTLCache's job.
+"""
+import asyncio
+import threading
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class FlightStats:
+    """Counters shared by the sync and async variants"""
+
+    def __init__(self):
+        self.requests = 0
+        self.executions = 0
+        self.shared = 0
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "executions": self.executions,
+            "shared": self.shared,
+            "dedup_ratio": self.shared / self.requests if self.requests else 0.0,
+        }
+
+class SingleFlight(FlightStats):
+    """Single-flight for blocking calls made from worker threads"""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+class AsyncSingleFlight(FlightStats):
+    """Single-flight for coroutines on one event loop
+
+    The shared call runs as its own task, so a cancelled caller does not
+    cancel it for the others.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._tasks = {}
+
+    async def do(self, key, fn, *args, **kwargs):
+        self.requests += 1
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self.executions += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller was cancelled
+            task.exception()
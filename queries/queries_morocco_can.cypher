@@ -3,6 +3,9 @@
 // Copy and paste these queries into Neo4j Browser (http://localhost:7474)
 // ================================================================
 
+// Ranking weights used by the recommendation queries (app.scoring.DEFAULT_WEIGHTS)
+:params {w_price: 0.4, w_distance: 0.4, w_rating: 0.2}
+
 // ---------------------------------
 // 1. VIEW ALL DATA
 // ---------------------------------
@@ -102,7 +105,7 @@ LIMIT 5;
 MATCH (c:Country {name:"Nigeria"})-[:PLAYS_AT]->(s:Stadium)
       -[r:HAS_NEARBY_HOTEL]->(h:Hotel)
 WITH h, r, s,
-     (h.price * 0.4 + r.distance_km * 0.4 - h.rating * 0.2) AS score
+     (h.price * $w_price + r.distance_km * $w_distance - h.rating * $w_rating) AS score
 RETURN h.name AS hotel,
        s.name AS stadium,
        s.city AS city,
@@ -118,7 +121,7 @@ LIMIT 5;
 MATCH (c:Country {name:"Morocco"})-[:PLAYS_AT]->(s:Stadium)
       -[r:HAS_NEARBY_HOTEL]->(h:Hotel)
 WITH h, r, s,
-     (h.price * 0.4 + r.distance_km * 0.4 - h.rating * 0.2) AS score
+     (h.price * $w_price + r.distance_km * $w_distance - h.rating * $w_rating) AS score
 RETURN h.name AS hotel,
        s.name AS stadium,
        s.city AS city,
@@ -133,7 +136,7 @@ LIMIT 5;
 MATCH (c:Country {name:"Egypt"})-[:PLAYS_AT]->(s:Stadium)
       -[r:HAS_NEARBY_HOTEL]->(h:Hotel)
 WITH h, r, s,
-     (h.price * 0.4 + r.distance_km * 0.4 - h.rating * 0.2) AS score
+     (h.price * $w_price + r.distance_km * $w_distance - h.rating * $w_rating) AS score
 RETURN h.name AS hotel,
        s.name AS stadium,
        s.city AS city,
@@ -205,6 +208,16 @@ RETURN s.name AS stadium,
        r.distance_km AS distance_km
 ORDER BY r.distance_km ASC;
 
+// Hotels within 5 km of a stadium (uses the hotel_location point index)
+MATCH (s:Stadium {name:"Mohammed V Stadium"})
+MATCH (h:Hotel)
+WHERE point.distance(h.location, s.location) <= 5000
+RETURN h.name AS hotel,
+       h.price AS price,
+       h.rating AS rating,
+       round(point.distance(h.location, s.location) / 1000.0, 1) AS distance_km
+ORDER BY distance_km ASC;
+
 // ---------------------------------
 // 10. COMPREHENSIVE RECOMMENDATION
 // ---------------------------------
@@ -213,7 +226,7 @@ ORDER BY r.distance_km ASC;
 MATCH (c:Country)-[:PLAYS_AT]->(s:Stadium)
       -[r:HAS_NEARBY_HOTEL]->(h:Hotel)
 WITH c, h, r, s,
-     (h.price * 0.4 + r.distance_km * 0.4 - h.rating * 0.2) AS score
+     (h.price * $w_price + r.distance_km * $w_distance - h.rating * $w_rating) AS score
 ORDER BY c.name, score ASC
 RETURN c.name AS country,
        h.name AS hotel,
@@ -0,0 +1,387 @@
+"""
+HTTP load benchmark for the API
+Drives /best-hotels, /health and /best-hotels/batch over keep-alive
+connections, either closed-loop (--concurrency connections sending back to
+back) or open-loop (--rate requests/sec, latency measured from each request's
+scheduled start so a stalled server is not hidden). Results (throughput,
+latency percentiles and histogram, error rate) are written to a JSON file
+that --compare can diff against a run from another commit.
+
+  python scripts/benchmark_api.py --spawn memory --duration 20 --concurrency 64
+  python scripts/benchmark_api.py --url http://127.0.0.1:8000 --rate 500 --compare old.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COUNTRIES = ["Nigeria", "Morocco", "Senegal", "Egypt", "Cameroon", "Algeria", "Tunisia", "Ivory Coast"]
+# Upper bounds in ms; the last bucket catches everything slower
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+DEFAULT_MIX = "best-hotels=8,health=1,batch=1"
+
+def best_hotels_request(i):
+    params = {"country": COUNTRIES[i % len(COUNTRIES)], "limit": 3 + i % 5}
+    if i % 3 == 0:
+        params["max_price"] = 150
+    return "GET", "/best-hotels?" + urlencode(params), None
+
+def health_request(i):
+    return "GET", "/health", None
+
+def batch_request(i):
+    queries = [{"country": COUNTRIES[(i + j) % len(COUNTRIES)], "limit": 3} for j in range(3)]
+    return "POST", "/best-hotels/batch", json.dumps({"queries": queries}).encode()
+
+ENDPOINTS = {
+    "best-hotels": best_hotels_request,
+    "health": health_request,
+    "batch": batch_request,
+}
+
+def parse_mix(mix):
+    """'best-hotels=8,health=1' -> weighted round-robin schedule of endpoint names"""
+    schedule = []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"✗ Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        schedule.extend([name] * int(weight or 1))
+    return schedule
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sorted list of samples"""
+    if not samples:
+        return None
+    index = max(0, min(len(samples) - 1, round(pct / 100 * len(samples)) - 1))
+    return samples[index]
+
+def histogram(latencies_ms):
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for latency in latencies_ms:
+        for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if latency <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client on asyncio streams"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.body = b""
+
+    async def request(self, method, path, body=None):
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        if body is not None:
+            head += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        payload = ("\r\n".join(head) + "\r\n\r\n").encode() + (body or b"")
+
+        reused = self.writer is not None
+        try:
+            return await self._send(payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+        # The server may close an idle or failed keep-alive connection
+        # between requests; retry once on a fresh one like a real client
+        try:
+            return await self._send(payload)
+        except Exception:
+            self.close()
+            raise
+
+    async def _send(self, payload):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(payload)
+        return await self._read_response()
+
+    async def _read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        # The last response body stays on the connection for callers that need it
+        if headers.get("transfer-encoding") == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                chunks.append((await self.reader.readexactly(size + 2))[:size])
+                if size == 0:
+                    break
+            self.body = b"".join(chunks)
+        else:
+            self.body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection") == "close":
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+class Recorder:
+    """Per-endpoint latencies and outcomes collected during the measured window"""
+
+    def __init__(self):
+        self.latencies = {name: [] for name in ENDPOINTS}
+        self.errors = {name: 0 for name in ENDPOINTS}
+        self.statuses = {}
+
+    def record(self, name, latency, status):
+        self.latencies[name].append(latency * 1000)
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors[name] += 1
+
+async def send(connection, recorder, schedule, i, started):
+    name = schedule[i % len(schedule)]
+    method, path, body = ENDPOINTS[name](i)
+    try:
+        status = await connection.request(method, path, body)
+    except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+        status = type(e).__name__
+    recorder.record(name, time.perf_counter() - started, status)
+
+async def closed_loop(host, port, schedule, concurrency, duration, recorder):
+    """`concurrency` connections, each sending its next request as soon as the last completes"""
+    deadline = time.perf_counter() + duration
+    counter = iter(range(sys.maxsize))
+
+    async def worker():
+        connection = Connection(host, port)
+        while time.perf_counter() < deadline:
+            await send(connection, recorder, schedule, next(counter), time.perf_counter())
+        connection.close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+async def open_loop(host, port, schedule, rate, concurrency, duration, recorder):
+    """Requests start on a fixed `rate` schedule; at most `concurrency` connections are used
+
+    Latency counts from the scheduled start, so queueing behind a saturated
+    pool shows up in the percentiles instead of silently lowering the rate.
+    """
+    idle = asyncio.Queue()
+    for _ in range(concurrency):
+        idle.put_nowait(Connection(host, port))
+
+    async def one(i, scheduled):
+        connection = await idle.get()
+        try:
+            await send(connection, recorder, schedule, i, scheduled)
+        finally:
+            idle.put_nowait(connection)
+
+    start = time.perf_counter()
+    total = int(rate * duration)
+    tasks = []
+    for i in range(total):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i, scheduled)))
+    await asyncio.gather(*tasks)
+    while not idle.empty():
+        idle.get_nowait().close()
+
+async def run(args, host, port, schedule):
+    if args.warmup > 0:
+        # Warm connection pools and caches; these results are discarded
+        await closed_loop(host, port, schedule, args.concurrency, args.warmup, Recorder())
+
+    recorder = Recorder()
+    start = time.perf_counter()
+    if args.rate:
+        await open_loop(host, port, schedule, args.rate, args.concurrency, args.duration, recorder)
+    else:
+        await closed_loop(host, port, schedule, args.concurrency, args.duration, recorder)
+    return recorder, time.perf_counter() - start
+
+def summarize(latencies_ms, errors, elapsed):
+    ordered = sorted(latencies_ms)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "error_rate": errors / len(ordered) if ordered else 0.0,
+        "throughput_rps": len(ordered) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": sum(ordered) / len(ordered) if ordered else None,
+            "p50": percentile(ordered, 50),
+            "p90": percentile(ordered, 90),
+            "p99": percentile(ordered, 99),
+            "max": ordered[-1] if ordered else None,
+        },
+        "histogram": histogram(ordered),
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_results(args, recorder, elapsed, target):
+    everything = [latency for latencies in recorder.latencies.values() for latency in latencies]
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "target": target,
+        "python": platform.python_version(),
+        "config": {
+            "mode": "open" if args.rate else "closed",
+            "rate": args.rate,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "mix": args.mix,
+        },
+        "elapsed_s": elapsed,
+        "statuses": recorder.statuses,
+        "overall": summarize(everything, sum(recorder.errors.values()), elapsed),
+        "endpoints": {
+            name: summarize(latencies, recorder.errors[name], elapsed)
+            for name, latencies in recorder.latencies.items() if latencies
+        },
+    }
+
+def print_results(results):
+    print("\n" + "=" * 72)
+    print(f"API BENCHMARK ({results['target']}, {results['config']['mode']} loop, commit {results['commit']})")
+    print("=" * 72)
+    print(f"{'endpoint':<14}{'requests':>9}{'req/s':>10}{'p50':>9}{'p90':>9}{'p99':>9}{'errors':>9}")
+    rows = [("overall", results["overall"])] + list(results["endpoints"].items())
+    for name, summary in rows:
+        latency = summary["latency_ms"]
+        fmt = lambda value: f"{value:8.2f}" if value is not None else "       -"
+        print(f"{name:<14}{summary['requests']:>9}{summary['throughput_rps']:>10.1f} "
+              f"{fmt(latency['p50'])} {fmt(latency['p90'])} {fmt(latency['p99'])}"
+              f"{summary['error_rate'] * 100:>8.2f}%")
+    print("\nLatency histogram (all endpoints)")
+    total = results["overall"]["requests"] or 1
+    for bucket, count in results["overall"]["histogram"].items():
+        print(f"  {bucket:>9} {count:>8}  {'#' * round(40 * count / total)}")
+    print("=" * 72)
+
+def print_comparison(baseline, current):
+    """Relative change of the headline numbers against an earlier results file"""
+    print(f"\nCOMPARISON: {baseline.get('commit')} -> {current.get('commit')}")
+    for name in ["overall"] + sorted(current["endpoints"]):
+        old = baseline["overall"] if name == "overall" else baseline["endpoints"].get(name)
+        new = current["overall"] if name == "overall" else current["endpoints"][name]
+        if not old:
+            continue
+        changes = []
+        for label, before, after in [
+            ("req/s", old["throughput_rps"], new["throughput_rps"]),
+            ("p50", old["latency_ms"]["p50"], new["latency_ms"]["p50"]),
+            ("p99", old["latency_ms"]["p99"], new["latency_ms"]["p99"]),
+        ]:
+            if before and after is not None:
+                changes.append(f"{label} {before:.1f} -> {after:.1f} ({(after - before) / before * 100:+.1f}%)")
+        changes.append(f"errors {old['error_rate'] * 100:.2f}% -> {new['error_rate'] * 100:.2f}%")
+        print(f"  {name:<12} " + ", ".join(changes))
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def spawn_server(backend, workers):
+    """Start uvicorn on a free port: the mock or in-memory backend, or app.main against Neo4j"""
+    port = free_port()
+    env = dict(os.environ)
+    if backend == "neo4j":
+        module = "app.main:app"
+    else:
+        module = "app.main_flexible:app"
+        env["RECOMMENDATION_BACKEND"] = backend
+    command = [sys.executable, "-m", "uvicorn", module, "--port", str(port), "--log-level", "warning",
+               "--workers", str(workers)]
+    process = subprocess.Popen(command, cwd=ROOT, env=env)
+
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"✗ Server exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(url + "/health", timeout=1).read()
+            print(f"✓ Started {module} ({backend}) on {url}")
+            return process, url
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("✗ Server did not become ready within 30s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL (ignored with --spawn)")
+    parser.add_argument("--spawn", choices=["mock", "memory", "neo4j"], help="Start a local uvicorn server for the run")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when spawning")
+    parser.add_argument("--duration", type=float, default=15.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured warm-up seconds")
+    parser.add_argument("--concurrency", type=int, default=32, help="Connections (closed loop) or max connections (open loop)")
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate in requests/sec")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted endpoint mix (default {DEFAULT_MIX})")
+    parser.add_argument("--output", default="api_benchmark.json", help="Results file to write")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    schedule = parse_mix(args.mix)
+    process = None
+    url = args.url
+    if args.spawn:
+        process, url = spawn_server(args.spawn, args.workers)
+
+    try:
+        parts = urlsplit(url)
+        recorder, elapsed = asyncio.run(run(args, parts.hostname, parts.port or 80, schedule))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    results = build_results(args, recorder, elapsed, args.spawn or url)
+    print_results(results)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Load benchmark comparing the sync and async service paths
+Runs the same /best-hotels workload through fetch_best_hotels (on a thread
+pool sized like Starlette's default) and fetch_best_hotels_async (on the event
+loop) and reports p50/p99 latency and requests/sec for each. The fetch_*
+functions always query Neo4j, bypassing the result cache, single-flight and
+materialized rankings, so both runs measure the driver paths and neither
+warms anything for the other.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scoring import DEFAULT_WEIGHTS
+from app.services import fetch_best_hotels, fetch_best_hotels_async
+
+COUNTRIES = ["Nigeria", "Morocco", "Senegal", "Egypt", "Cameroon", "Algeria", "Tunisia", "Ivory Coast"]
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def workload(requests):
+    """Deterministic mix of fetch_best_hotels argument tuples"""
+    return [
+        (COUNTRIES[i % len(COUNTRIES)], None if i % 3 else 150.0, 5 + i % 4, DEFAULT_WEIGHTS, "none")
+        for i in range(requests)
+    ]
+
+def run_sync(queries, threadpool):
+    """Run the workload through the blocking driver on a thread pool"""
+    def timed(query):
+        start = time.perf_counter()
+        fetch_best_hotels(*query)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threadpool) as executor:
+        latencies = list(executor.map(timed, queries))
+    return latencies, time.perf_counter() - start
+
+async def run_async(queries, concurrency):
+    """Run the workload through the async driver with bounded concurrency"""
+    semaphore = asyncio.Semaphore(concurrency)
+    # Warm the async pool on this event loop so connection setup isn't counted
+    await fetch_best_hotels_async(*queries[0])
+
+    async def timed(query):
+        async with semaphore:
+            start = time.perf_counter()
+            await fetch_best_hotels_async(*query)
+            return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(timed(query) for query in queries))
+    return list(latencies), time.perf_counter() - start
+
+def report(name, latencies, elapsed):
+    """Print latency percentiles and throughput for one run"""
+    print(f"\n{name}")
+    print(f"  Requests:  {len(latencies)}")
+    print(f"  p50:       {percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"  p99:       {percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"  Mean:      {statistics.mean(latencies) * 1000:.2f} ms")
+    print(f"  Req/sec:   {len(latencies) / elapsed:.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Total queries per run")
+    parser.add_argument("--concurrency", type=int, default=200, help="In-flight queries for the async run")
+    parser.add_argument("--threadpool", type=int, default=40, help="Worker threads for the sync run (Starlette default is 40)")
+    args = parser.parse_args()
+
+    queries = workload(args.requests)
+
+    print("=" * 60)
+    print("SYNC vs ASYNC SERVICE BENCHMARK")
+    print("=" * 60)
+
+    # Warm the sync pool so connection setup isn't counted
+    fetch_best_hotels(*queries[0])
+
+    report(f"Sync (threadpool={args.threadpool})", *run_sync(queries, args.threadpool))
+    report(f"Async (concurrency={args.concurrency})", *asyncio.run(run_async(queries, args.concurrency)))
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark the streaming /export/rankings endpoint
+Downloads the export (NDJSON or CSV) and reports time to first byte, total
+time, rows and rows/sec. With --spawn the server's resident memory is sampled
+while it streams, to check it stays flat as the export grows:
+
+  python scripts/generate_dataset.py --hotels 1000000 --format neo4j --yes
+  python scripts/benchmark_export.py --spawn neo4j --format csv --repeat 3
+  python scripts/benchmark_export.py --url http://127.0.0.1:8000 --country Morocco
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import urllib.request
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.benchmark_api import spawn_server
+
+def rss_mb(pid):
+    """Resident set size of a process in MB (Linux /proc)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+class MemorySampler(threading.Thread):
+    """Peak RSS of `pid` while running"""
+
+    def __init__(self, pid, interval=0.05):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = rss_mb(pid) or 0.0
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            self.peak = max(self.peak, rss_mb(self.pid) or 0.0)
+
+    def stop(self):
+        self.done.set()
+        self.join()
+
+def download(url, chunk_size=65536):
+    """(time to first byte, total time, bytes, rows) for one export"""
+    start = time.perf_counter()
+    first_byte = None
+    size = rows = 0
+    with urllib.request.urlopen(url, timeout=600) as response:
+        if response.status != 200:
+            raise SystemExit(f"✗ Export returned {response.status}")
+        while True:
+            chunk = response.read1(chunk_size)
+            if not chunk:
+                break
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            size += len(chunk)
+            rows += chunk.count(b"\n")
+    return first_byte or 0.0, time.perf_counter() - start, size, rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL (ignored with --spawn)")
+    parser.add_argument("--spawn", choices=["mock", "memory", "neo4j"], help="Start a local uvicorn server for the run")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson", help="Export format")
+    parser.add_argument("--country", action="append", help="Export only these countries (repeatable)")
+    parser.add_argument("--max-price", type=float, help="Maximum price per night")
+    parser.add_argument("--repeat", type=int, default=1, help="Downloads to run")
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if args.spawn:
+        process, url = spawn_server(args.spawn, 1)
+    params = [("format", args.format)] + [("country", country) for country in args.country or []]
+    if args.max_price is not None:
+        params.append(("max_price", args.max_price))
+    export_url = f"{url}/export/rankings?{urlencode(params)}"
+
+    try:
+        baseline = rss_mb(process.pid) if process else None
+        print("=" * 84)
+        print(f"{'run':>4}{'first byte':>12}{'total':>10}{'rows':>14}{'MB':>10}{'rows/sec':>14}{'server RSS':>14}")
+        print("=" * 84)
+        for run in range(1, args.repeat + 1):
+            sampler = MemorySampler(process.pid) if process else None
+            if sampler:
+                sampler.start()
+            first_byte, total, size, rows = download(export_url)
+            if sampler:
+                sampler.stop()
+            # The CSV header line is not a row
+            rows -= args.format == "csv"
+            peak = f"{sampler.peak:>11.1f} MB" if sampler else f"{'-':>14}"
+            print(f"{run:>4}{first_byte * 1000:>10.1f}ms{total:>9.2f}s{rows:>14,}{size / 1e6:>10.1f}"
+                  f"{rows / total if total else 0:>14,.0f}{peak}")
+        print("=" * 84)
+        if baseline is not None:
+            print(f"Server RSS before the first export: {baseline:.1f} MB")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Concurrency benchmark for room holds (POST /holds, DELETE /holds/{id})
+Hundreds of clients hold rooms at the same few hotels until every one is
+sold out, then release everything. Reports holds/sec and releases/sec and
+checks nothing was oversold: each successful hold reports the capacity it
+left, so under correct serialization those values are distinct, never
+negative, and account for exactly the rooms the hotel started with. After
+the release phase every hotel must be back at its starting capacity.
+
+  python scripts/benchmark_holds.py --spawn memory --clients 200
+  python scripts/benchmark_holds.py --spawn neo4j --workers 4 --clients 400
+  python scripts/benchmark_holds.py --url http://127.0.0.1:8000 --hotels "Hotel Atlas" "Riad Fes"
+
+The in-memory ledger is per process, so memory/mock runs use one worker.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import quote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import dataset
+from app.services_mock import MOCK_CAPACITY
+from scripts.benchmark_api import Connection, percentile, spawn_server
+
+class Run:
+    """Holds and outcomes collected by all clients"""
+
+    def __init__(self, hotels):
+        self.open = set(hotels)
+        self.holds = {hotel: [] for hotel in hotels}
+        self.statuses = {}
+        self.latencies = []
+
+    def record(self, status, latency):
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+        self.latencies.append(latency * 1000)
+
+async def hold_until_sold_out(host, port, run, rooms, ttl, seed):
+    rng = random.Random(seed)
+    connection = Connection(host, port)
+    while run.open:
+        hotel = rng.choice(sorted(run.open))
+        body = json.dumps({"hotel": hotel, "rooms": rooms, "ttl_seconds": ttl}).encode()
+        start = time.perf_counter()
+        try:
+            status = await connection.request("POST", "/holds", body)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            status = type(e).__name__
+        run.record(status, time.perf_counter() - start)
+        if status == 201:
+            hold = json.loads(connection.body)
+            run.holds[hotel].append((hold["id"], hold["remaining_capacity"]))
+        elif status == 409:
+            run.open.discard(hotel)
+        elif status == 404:
+            raise SystemExit(f"✗ Hotel '{hotel}' not found")
+    connection.close()
+
+async def release_all(host, port, queue, remaining, failures):
+    connection = Connection(host, port)
+    while not queue.empty():
+        hotel, hold_id = queue.get_nowait()
+        try:
+            status = await connection.request("DELETE", f"/holds/{quote(hold_id)}")
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            status = type(e).__name__
+        if status == 200:
+            remaining[hotel] = max(remaining.get(hotel, 0), json.loads(connection.body)["remaining_capacity"])
+        else:
+            failures.append(status)
+    connection.close()
+
+def verify(run, rooms):
+    """Starting capacity per hotel, plus the problems found in the hold phase"""
+    capacities, problems = {}, []
+    for hotel, holds in run.holds.items():
+        left = sorted((remaining for _, remaining in holds), reverse=True)
+        if not left:
+            capacities[hotel] = 0
+            continue
+        capacities[hotel] = left[0] + rooms
+        if left[-1] < 0:
+            problems.append(f"{hotel}: capacity went negative ({left[-1]})")
+        if len(set(left)) != len(left):
+            problems.append(f"{hotel}: {len(left) - len(set(left))} holds saw the same remaining capacity")
+        if left[-1] >= rooms:
+            problems.append(f"{hotel}: rejected with {left[-1]} rooms still free")
+        expected = list(range(left[0], left[0] - rooms * len(left), -rooms))
+        if left != expected and len(set(left)) == len(left):
+            problems.append(f"{hotel}: remaining capacities do not step down by {rooms}")
+    return capacities, problems
+
+async def benchmark(host, port, hotels, clients, rooms, ttl, seed):
+    run = Run(hotels)
+    start = time.perf_counter()
+    await asyncio.gather(*(hold_until_sold_out(host, port, run, rooms, ttl, seed + i) for i in range(clients)))
+    hold_elapsed = time.perf_counter() - start
+
+    queue = asyncio.Queue()
+    for hotel, holds in run.holds.items():
+        for hold_id, _ in holds:
+            queue.put_nowait((hotel, hold_id))
+    released, failures = {}, []
+    start = time.perf_counter()
+    await asyncio.gather(*(release_all(host, port, queue, released, failures) for _ in range(clients)))
+    release_elapsed = time.perf_counter() - start
+    return run, hold_elapsed, released, failures, release_elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL (ignored with --spawn)")
+    parser.add_argument("--spawn", choices=["mock", "memory", "neo4j"], help="Start a local uvicorn server for the run")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when spawning (neo4j only)")
+    parser.add_argument("--clients", type=int, default=200, help="Parallel clients, one connection each")
+    parser.add_argument("--hotels", nargs="+", help="Hotels to sell out (default: the first --hotel-count bundled or, with --spawn mock, sample hotels)")
+    parser.add_argument("--hotel-count", type=int, default=4, help="How many hotels to use without --hotels")
+    parser.add_argument("--rooms", type=int, default=1, help="Rooms per hold")
+    parser.add_argument("--ttl", type=int, default=3600, help="Hold TTL in seconds (longer than the run)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    if args.spawn in ("memory", "mock") and args.workers != 1:
+        print("✗ The in-memory hold ledger is per process; use --workers 1 with memory/mock")
+        sys.exit(1)
+    # The mock backend only holds its own sample hotels
+    names = list(MOCK_CAPACITY) if args.spawn == "mock" else [hotel["name"] for hotel in dataset.HOTELS]
+    hotels = args.hotels or names[:args.hotel_count]
+
+    process = None
+    url = args.url
+    if args.spawn:
+        process, url = spawn_server(args.spawn, args.workers)
+    try:
+        parts = urlsplit(url)
+        run, hold_elapsed, released, failures, release_elapsed = asyncio.run(
+            benchmark(parts.hostname, parts.port or 80, hotels, args.clients, args.rooms, args.ttl, args.seed)
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    capacities, problems = verify(run, args.rooms)
+    placed = sum(len(holds) for holds in run.holds.values())
+    latencies = sorted(run.latencies)
+    print("=" * 72)
+    print(f"{args.clients} clients, {len(hotels)} hotels, {args.rooms} room(s) per hold")
+    print(f"Hold requests:  {len(latencies):,} in {hold_elapsed:.2f}s ({len(latencies) / hold_elapsed:,.0f} req/sec)")
+    print(f"Holds placed:   {placed:,} ({placed / hold_elapsed:,.0f} holds/sec)")
+    print(f"Statuses:       {', '.join(f'{status}: {count:,}' for status, count in sorted(run.statuses.items()))}")
+    print(f"Latency:        p50 {percentile(latencies, 50):.1f}ms  p99 {percentile(latencies, 99):.1f}ms  "
+          f"max {latencies[-1]:.1f}ms")
+    print(f"Releases:       {placed - len(failures):,} in {release_elapsed:.2f}s "
+          f"({(placed - len(failures)) / release_elapsed if release_elapsed else 0:,.0f} releases/sec)")
+    print("=" * 72)
+    for hotel in hotels:
+        holds = len(run.holds[hotel])
+        print(f"  {hotel}: capacity {capacities[hotel]}, {holds} holds, "
+              f"back to {released.get(hotel, capacities[hotel])} after release")
+        if released.get(hotel, capacities[hotel]) != capacities[hotel]:
+            problems.append(f"{hotel}: capacity {released.get(hotel)} after release, expected {capacities[hotel]}")
+
+    errors = sum(count for status, count in run.statuses.items() if status not in ("201", "409"))
+    if errors:
+        problems.append(f"{errors} hold requests failed")
+    if failures:
+        problems.append(f"{len(failures)} releases failed ({', '.join(sorted(set(map(str, failures))))})")
+    if problems:
+        for problem in problems:
+            print(f"✗ {problem}")
+        sys.exit(1)
+    print(f"✓ No overselling: {placed * args.rooms:,} of {sum(capacities.values()):,} rooms held, all capacity restored")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark lookup latency vs hotel count, with and without the schema
+For each inventory size the database is CLEARED, loaded with synthetic
+hotels, and the hot lookups are timed first without constraints/indexes and
+then after app.migrations.apply_schema.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.bulk_loader import CREATE_COUNTRIES_QUERY, CREATE_HOTELS_QUERY, load_batches
+from app.database import get_session
+from app.migrations import apply_schema, drop_schema
+
+CITIES = 50
+
+LOOKUPS = {
+    "country by name": ("MATCH (c:Country {name:$country}) RETURN c.name", lambda i: {"country": f"Country {i % 8}"}),
+    "hotel by name": ("MATCH (h:Hotel {name:$name}) RETURN h.price", None),
+    "hotels by city": ("MATCH (h:Hotel {city:$city}) RETURN count(h)", lambda i: {"city": f"City {i % CITIES}"}),
+    "hotels by price": ("MATCH (h:Hotel) WHERE h.price <= $price RETURN count(h)", lambda i: {"price": 60 + i % 40}),
+}
+
+def synthetic_hotels(count):
+    for i in range(count):
+        yield {
+            "name": f"Hotel {i}",
+            "city": f"City {i % CITIES}",
+            "price": 50 + (i * 37) % 250,
+            "rating": round(3.0 + (i * 13) % 20 / 10, 1),
+            "capacity": 100 + i % 300,
+        }
+
+def load(session, hotels):
+    session.run("MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS").consume()
+    load_batches(session, CREATE_COUNTRIES_QUERY, [{"name": f"Country {i}"} for i in range(8)], label="countries")
+    load_batches(session, CREATE_HOTELS_QUERY, synthetic_hotels(hotels), label="hotels", total=hotels)
+
+def time_lookups(session, hotels, repeats):
+    """Median latency in ms per lookup"""
+    results = {}
+    for name, (query, params) in LOOKUPS.items():
+        samples = []
+        for i in range(repeats):
+            parameters = params(i) if params else {"name": f"Hotel {(i * 7919) % hotels}"}
+            start = time.perf_counter()
+            session.run(query, **parameters).consume()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = statistics.median(samples)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Hotel counts to test")
+    parser.add_argument("--repeats", type=int, default=200, help="Timed executions per lookup")
+    parser.add_argument("--yes", action="store_true", help="Confirm the database may be cleared")
+    args = parser.parse_args()
+
+    if not args.yes:
+        print("✗ This benchmark clears the database. Re-run with --yes to continue.")
+        sys.exit(1)
+
+    rows = []
+    with get_session() as session:
+        for size in args.sizes:
+            drop_schema(session)
+            load(session, size)
+            without_schema = time_lookups(session, size, args.repeats)
+            apply_schema(session)
+            with_schema = time_lookups(session, size, args.repeats)
+            rows.append((size, without_schema, with_schema))
+
+    print("\n" + "=" * 72)
+    print("LOOKUP LATENCY (median ms): without schema -> with schema")
+    print("=" * 72)
+    for size, without_schema, with_schema in rows:
+        print(f"\n{size:,} hotels")
+        for name in LOOKUPS:
+            speedup = without_schema[name] / with_schema[name] if with_schema[name] else float("inf")
+            print(f"  {name:<18} {without_schema[name]:8.2f} -> {with_schema[name]:8.2f}  ({speedup:.1f}x)")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark of /best-hotels response serialization
+Serializes a large batch of limit=20 responses through FastAPI's default
+response_model path (validation + jsonable_encoder + stdlib json) and
+through app.responses (validated or HotelRow fast path, orjson), and
+reports the cost per response.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.responses import hotel_list_adapter
+from app.schemas import HotelResponse, HotelRow
+
+def synthetic_responses(count, limit):
+    """`count` result lists of `limit` rows, shaped like record.data() output"""
+    return [
+        [
+            {
+                "name": f"Hotel {i}-{j}",
+                "stadium_name": f"Stadium {j % 5}",
+                "city": f"City {j % 5}",
+                "price": 60 + (i * 7 + j * 13) % 240,
+                "rating": round(3.0 + (i + j) % 20 / 10, 1),
+                "distance_km": round(0.5 + (i * 3 + j) % 140 / 10, 1),
+                "score": 30.0 + j + i % 7 * 0.25,
+            }
+            for j in range(limit)
+        ]
+        for i in range(count)
+    ]
+
+def fastapi_default(responses):
+    """What FastAPI does for response_model=List[HotelResponse] with a returned list"""
+    field = create_response_field(name="response", type_=List[HotelResponse])
+
+    async def render_all():
+        for rows in responses:
+            content = await serialize_response(field=field, response_content=rows)
+            JSONResponse(content).body
+    asyncio.run(render_all())
+
+def validated_orjson(responses):
+    for rows in responses:
+        ORJSONResponse(hotel_list_adapter.dump_python(hotel_list_adapter.validate_python(rows), mode="json")).body
+
+def hotel_row_orjson(responses):
+    for rows in responses:
+        ORJSONResponse([HotelRow.from_row(row) for row in rows]).body
+
+def raw_orjson(responses):
+    for rows in responses:
+        orjson.dumps(rows)
+
+PATHS = [
+    ("FastAPI response_model + json", fastapi_default),
+    ("TypeAdapter validate + orjson", validated_orjson),
+    ("HotelRow + orjson (default)", hotel_row_orjson),
+    ("orjson on raw dicts (floor)", raw_orjson),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=20000, help="Responses serialized per path")
+    parser.add_argument("--limit", type=int, default=20, help="Rows per response")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per path (best is reported)")
+    args = parser.parse_args()
+
+    responses = synthetic_responses(args.responses, args.limit)
+
+    print("=" * 66)
+    print(f"SERIALIZATION: {args.responses:,} responses x {args.limit} rows")
+    print("=" * 66)
+    baseline = None
+    for name, path in PATHS:
+        best = float("inf")
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            path(responses)
+            best = min(best, time.perf_counter() - start)
+        per_response = best / args.responses * 1e6
+        baseline = baseline or per_response
+        print(f"  {name:<32} {per_response:8.1f} µs/response  ({baseline / per_response:4.1f}x)")
+    print("=" * 66)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Deterministic synthetic dataset generator for scale testing
+Generates N countries, M stadiums and up to millions of hotels with the same
+row shapes as app.dataset. Hotels cluster around stadium cities and extra
+towns (Zipf-weighted), prices are log-normal, ratings follow price with
+noise. Rows are produced one at a time, so output is streamed:
+
+  python scripts/generate_dataset.py --hotels 100000 --format csv --out data/100k
+  python scripts/generate_dataset.py --hotels 10000000 --format parquet --out data/10m
+  python scripts/generate_dataset.py --hotels 100000 --format neo4j --yes   # clears the DB
+
+The same --seed and sizes always produce the same rows. Parquet needs pyarrow.
+"""
+import argparse
+from bisect import bisect_right
+import csv
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import dataset
+
+# Latitude/longitude box stadiums and towns are placed in (roughly Morocco)
+REGION = (27.7, 35.9, -13.2, -1.0)
+KM_PER_DEGREE = 111.32
+
+COUNTRY_FIELDS = ["name"]
+STADIUM_FIELDS = ["name", "city", "capacity", "latitude", "longitude"]
+HOTEL_FIELDS = ["name", "city", "price", "rating", "capacity", "latitude", "longitude"]
+PLAYS_AT_FIELDS = ["country", "stadium"]
+
+BRANDS = ["Hotel", "Riad", "Grand Hotel", "Suites", "Inn", "Palace", "Resort", "Residence", "Kasbah", "Lodge"]
+
+def _rng(seed, stream):
+    # One independent stream per entity type, so changing --hotels does not
+    # move the stadiums or the PLAYS_AT assignment
+    return random.Random(f"{seed}:{stream}")
+
+def generate_countries(count: int):
+    """Tournament countries first, then numbered ones"""
+    for i in range(count):
+        yield dataset.COUNTRIES[i] if i < len(dataset.COUNTRIES) else f"Nation {i + 1}"
+
+def generate_cities(stadiums: int, towns: int, seed: int = 42):
+    """(name, latitude, longitude, weight, spread_km): stadium cities first, then smaller towns"""
+    rng = _rng(seed, "cities")
+    lat_min, lat_max, lon_min, lon_max = REGION
+    cities = []
+    # Only as many real stadium cities as stadiums; the rest are towns
+    real = min(stadiums, len(dataset.STADIUMS))
+    for i in range(stadiums + towns):
+        if i < real:
+            s = dataset.STADIUMS[i]
+            name, latitude, longitude = s["city"], s["latitude"], s["longitude"]
+        else:
+            name = f"City {i + 1}" if i < stadiums else f"Town {i - stadiums + 1}"
+            latitude = round(rng.uniform(lat_min, lat_max), 4)
+            longitude = round(rng.uniform(lon_min, lon_max), 4)
+        # Zipf-like sizes: big cities hold most of the inventory and spread wider
+        weight = 1.0 / (i + 1) ** 0.9
+        spread_km = 2.0 + 6.0 * weight ** 0.5
+        cities.append((name, latitude, longitude, weight, spread_km))
+    return cities
+
+def generate_stadiums(cities, count: int, seed: int = 42):
+    """One stadium per stadium city, a few km from its centre"""
+    rng = _rng(seed, "stadiums")
+    for i in range(count):
+        if i < len(dataset.STADIUMS):
+            yield dict(dataset.STADIUMS[i])
+            continue
+        city, latitude, longitude, _, _ = cities[i]
+        latitude, longitude = _offset(rng, latitude, longitude, 3.0)
+        yield {
+            "name": f"{city} Stadium",
+            "city": city,
+            "capacity": rng.randrange(15000, 70000, 5),
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+
+def generate_plays_at(countries, stadiums, per_country: int = 2, seed: int = 42):
+    """(country, stadium) pairs: each country plays at `per_country` distinct stadiums"""
+    rng = _rng(seed, "plays_at")
+    names = [stadium["name"] for stadium in stadiums]
+    per_country = min(per_country, len(names))
+    for country in countries:
+        for stadium in rng.sample(names, per_country):
+            yield country, stadium
+
+def _offset(rng, latitude, longitude, scale_km):
+    """Random point around (latitude, longitude), exponentially distributed distance"""
+    distance = rng.expovariate(1.0 / scale_km)
+    bearing = rng.uniform(0.0, 2.0 * math.pi)
+    dlat = distance * math.cos(bearing) / KM_PER_DEGREE
+    dlon = distance * math.sin(bearing) / (KM_PER_DEGREE * math.cos(math.radians(latitude)))
+    return round(latitude + dlat, 5), round(longitude + dlon, 5)
+
+def generate_hotels(cities, count: int, seed: int = 42):
+    """`count` hotel rows, streamed"""
+    rng = _rng(seed, "hotels")
+    cumulative = []
+    total = 0.0
+    for city in cities:
+        total += city[3]
+        cumulative.append(total)
+    # Locals: this loop runs millions of times
+    random_, lognormvariate, gauss, choice = rng.random, rng.lognormvariate, rng.gauss, rng.choice
+    log, last = math.log, len(cities) - 1
+    price_mu = [log(70 + 40 * city[3] ** 0.5) for city in cities]
+    for i in range(count):
+        index = min(bisect_right(cumulative, random_() * total), last)
+        city, latitude, longitude, _, spread_km = cities[index]
+        latitude, longitude = _offset(rng, latitude, longitude, spread_km)
+        # Bigger cities are pricier; median around $110 for the largest
+        price = int(min(max(lognormvariate(price_mu[index], 0.5), 25), 2000))
+        # Rating tracks log price with noise, clipped to the 1-5 scale
+        rating = round(min(max(3.6 + 0.8 * log(price / 110) + gauss(0.0, 0.35), 1.0), 5.0), 1)
+        capacity = int(min(max(lognormvariate(4.79, 0.6), 10), 2000))
+        yield {
+            "name": f"{choice(BRANDS)} {city} {i + 1}",
+            "city": city,
+            "price": price,
+            "rating": rating,
+            "capacity": capacity,
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+
+def generate(countries: int, stadiums: int, hotels: int, towns: int = None, plays_per_country: int = 2, seed: int = 42):
+    """(countries, stadiums, hotels, plays_at); hotels is a generator, the rest are small lists"""
+    towns = stadiums * 2 if towns is None else towns
+    cities = generate_cities(stadiums, towns, seed)
+    country_rows = list(generate_countries(countries))
+    stadium_rows = list(generate_stadiums(cities, stadiums, seed))
+    plays_at = list(generate_plays_at(country_rows, stadium_rows, plays_per_country, seed))
+    return country_rows, stadium_rows, generate_hotels(cities, hotels, seed), plays_at
+
+def write_csv(path, fields, rows):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow([row[field] for field in fields])
+            count += 1
+    return count
+
+def write_parquet(path, fields, rows, chunk_size: int = 100000):
+    """Write rows in row groups of `chunk_size` so memory stays bounded"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("✗ Parquet output needs pyarrow (pip install pyarrow)")
+        sys.exit(1)
+    from app.bulk_loader import batched
+
+    writer = None
+    count = 0
+    try:
+        for batch in batched(rows, chunk_size):
+            table = pa.Table.from_pylist(batch).select(fields)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+def write_files(out, extension, writer, countries, stadiums, hotels, plays_at):
+    os.makedirs(out, exist_ok=True)
+    outputs = [
+        ("countries", COUNTRY_FIELDS, ({"name": name} for name in countries)),
+        ("stadiums", STADIUM_FIELDS, stadiums),
+        ("hotels", HOTEL_FIELDS, hotels),
+        ("plays_at", PLAYS_AT_FIELDS, ({"country": c, "stadium": s} for c, s in plays_at)),
+    ]
+    for name, fields, rows in outputs:
+        path = os.path.join(out, f"{name}.{extension}")
+        start = time.perf_counter()
+        count = writer(path, fields, rows)
+        elapsed = time.perf_counter() - start
+        print(f"✓ Wrote {count:,} {name} to {path} in {elapsed:.2f}s ({count / elapsed if elapsed else 0:,.0f} rows/sec)")
+
+def load_neo4j(countries, stadiums, hotels, plays_at, hotel_count, radius_km=None, batch_size=None):
+    """Clear the database and stream everything through the bulk loader"""
+    from app.bulk_loader import (
+        CREATE_COUNTRIES_QUERY, CREATE_HOTELS_QUERY, CREATE_STADIUMS_QUERY, PLAYS_AT_QUERY,
+        link_nearby_hotels, load_batches,
+    )
+    from app.database import get_session
+    from app.migrations import apply_schema
+    from app.services import notify_data_changed
+
+    with get_session() as session:
+        session.run("MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS").consume()
+        print("✓ Database cleared")
+        apply_schema(session)
+        print("✓ Schema ready")
+        load_batches(session, CREATE_COUNTRIES_QUERY, ({"name": name} for name in countries),
+                     batch_size=batch_size, label="countries", total=len(countries))
+        load_batches(session, CREATE_STADIUMS_QUERY, stadiums,
+                     batch_size=batch_size, label="stadiums", total=len(stadiums))
+        load_batches(session, CREATE_HOTELS_QUERY, hotels,
+                     batch_size=batch_size, label="hotels", total=hotel_count)
+        load_batches(session, PLAYS_AT_QUERY, ({"country": c, "stadium": s} for c, s in plays_at),
+                     batch_size=batch_size, label="PLAYS_AT relationships", total=len(plays_at))
+        link_nearby_hotels(session, [stadium["name"] for stadium in stadiums], radius_km, batch_size=1)
+    notify_data_changed()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--countries", type=int, default=24, help="Number of countries")
+    parser.add_argument("--stadiums", type=int, default=12, help="Number of stadiums (one per city)")
+    parser.add_argument("--hotels", type=int, default=100000, help="Number of hotels")
+    parser.add_argument("--towns", type=int, help="Extra non-stadium towns with hotels (default 2 x stadiums)")
+    parser.add_argument("--plays-per-country", type=int, default=2, help="Stadiums each country plays at")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--format", choices=["csv", "parquet", "neo4j"], default="csv", help="Output target")
+    parser.add_argument("--out", default="data/generated", help="Output directory for csv/parquet")
+    parser.add_argument("--batch-size", type=int, help="Bulk loader batch size (neo4j)")
+    parser.add_argument("--radius-km", type=float, help="HAS_NEARBY_HOTEL radius (neo4j)")
+    parser.add_argument("--yes", action="store_true", help="Confirm --format neo4j may clear the database")
+    args = parser.parse_args()
+
+    if args.format == "neo4j" and not args.yes:
+        print("✗ Loading into Neo4j clears the database. Re-run with --yes to continue.")
+        sys.exit(1)
+
+    countries, stadiums, hotels, plays_at = generate(
+        args.countries, args.stadiums, args.hotels, args.towns, args.plays_per_country, args.seed
+    )
+    print(f"Generating {len(countries)} countries, {len(stadiums)} stadiums, {args.hotels:,} hotels "
+          f"(seed {args.seed})")
+    if args.format == "csv":
+        write_files(args.out, "csv", write_csv, countries, stadiums, hotels, plays_at)
+    elif args.format == "parquet":
+        write_files(args.out, "parquet", write_parquet, countries, stadiums, hotels, plays_at)
+    else:
+        load_neo4j(countries, stadiums, hotels, plays_at, args.hotels, args.radius_km, args.batch_size)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,21 @@
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.bulk_loader import (
+    CREATE_COUNTRIES_QUERY,
+    CREATE_HOTELS_QUERY,
+    CREATE_STADIUMS_QUERY,
+    NEARBY_RADIUS_KM,
+    PLAYS_AT_QUERY,
+    link_nearby_hotels,
+    load_batches,
+)
+from app.migrations import apply_schema, print_index_report
+from app.services import notify_data_changed
 
 load_dotenv()
 
@@ -16,6 +31,11 @@ def clear_database():
         session.run("MATCH (n) DETACH DELETE n")
         print("Database cleared")
 
+def create_schema():
+    """Apply uniqueness constraints and indexes before loading"""
+    with driver.session() as session:
+        print_index_report(apply_schema(session))
+
 def populate_database():
     """Populate database with sample CAN data"""
     with driver.session() as session:
@@ -25,23 +45,18 @@ def populate_database():
             "Cameroon", "Nigeria", "Tunisia", "Ivory Coast"
         ]
         
-        for country in countries:
-            session.run("CREATE (:Country {name: $name})", name=country)
+        load_batches(session, CREATE_COUNTRIES_QUERY, [{"name": country} for country in countries], label="countries")
         print(f"Created {len(countries)} countries")
         
         # Create stadiums with locations
         stadiums = [
-            {"name": "Cairo International Stadium", "city": "Cairo", "capacity": 75000},
-            {"name": "Stade Mohammed V", "city": "Casablanca", "capacity": 45000},
-            {"name": "Stade du 5 Juillet", "city": "Algiers", "capacity": 64000},
-            {"name": "Stade Abdoulaye Wade", "city": "Diamniadio", "capacity": 50000},
+            {"name": "Cairo International Stadium", "city": "Cairo", "capacity": 75000, "latitude": 30.0690, "longitude": 31.3121},
+            {"name": "Stade Mohammed V", "city": "Casablanca", "capacity": 45000, "latitude": 33.5828, "longitude": -7.6469},
+            {"name": "Stade du 5 Juillet", "city": "Algiers", "capacity": 64000, "latitude": 36.7526, "longitude": 3.0161},
+            {"name": "Stade Abdoulaye Wade", "city": "Diamniadio", "capacity": 50000, "latitude": 14.7365, "longitude": -17.1923},
         ]
         
-        for stadium in stadiums:
-            session.run(
-                "CREATE (:Stadium {name: $name, city: $city, capacity: $capacity})",
-                **stadium
-            )
+        load_batches(session, CREATE_STADIUMS_QUERY, stadiums, label="stadiums")
         print(f"Created {len(stadiums)} stadiums")
         
         # Assign countries to stadiums (where they will play)
@@ -56,64 +71,49 @@ def populate_database():
             ("Ivory Coast", "Stade du 5 Juillet"),
         ]
         
-        for country, stadium in matches:
-            session.run(
-                """
-                MATCH (c:Country {name: $country})
-                MATCH (s:Stadium {name: $stadium})
-                CREATE (c)-[:PLAYS_AT]->(s)
-                """,
-                country=country,
-                stadium=stadium
-            )
+        load_batches(
+            session,
+            PLAYS_AT_QUERY,
+            [{"country": country, "stadium": stadium} for country, stadium in matches],
+            label="PLAYS_AT relationships"
+        )
         print(f"Created {len(matches)} PLAYS_AT relationships")
         
-        # Create hotels near each stadium
+        # Create hotels with locations; the coordinates put each one at its
+        # listed distance from its stadium, so the radius linking below
+        # derives the same distances populate_morocco_can.py would
         hotels_data = [
             # Near Cairo International Stadium
-            {"name": "Cairo Marriott Hotel", "price": 150.0, "rating": 4.5, "stadium": "Cairo International Stadium", "distance": 5.2},
-            {"name": "Ramses Hilton", "price": 120.0, "rating": 4.2, "stadium": "Cairo International Stadium", "distance": 6.8},
-            {"name": "Le Meridien Cairo", "price": 180.0, "rating": 4.7, "stadium": "Cairo International Stadium", "distance": 3.5},
-            {"name": "Budget Inn Cairo", "price": 50.0, "rating": 3.5, "stadium": "Cairo International Stadium", "distance": 8.0},
+            {"name": "Cairo Marriott Hotel", "city": "Cairo", "price": 150.0, "rating": 4.5, "capacity": 250, "latitude": 30.1048, "longitude": 31.3468},  # 5.2 km
+            {"name": "Ramses Hilton", "city": "Cairo", "price": 120.0, "rating": 4.2, "capacity": 220, "latitude": 30.0243, "longitude": 31.3602},  # 6.8 km
+            {"name": "Le Meridien Cairo", "city": "Cairo", "price": 180.0, "rating": 4.7, "capacity": 180, "latitude": 30.0505, "longitude": 31.2827},  # 3.5 km
+            {"name": "Budget Inn Cairo", "city": "Cairo", "price": 50.0, "rating": 3.5, "capacity": 60, "latitude": 30.1318, "longitude": 31.2718},  # 8.0 km
             
             # Near Stade Mohammed V
-            {"name": "Hyatt Regency Casablanca", "price": 160.0, "rating": 4.6, "stadium": "Stade Mohammed V", "distance": 4.5},
-            {"name": "Kenzi Tower Hotel", "price": 140.0, "rating": 4.3, "stadium": "Stade Mohammed V", "distance": 5.0},
-            {"name": "Ibis Casa Voyageurs", "price": 70.0, "rating": 3.8, "stadium": "Stade Mohammed V", "distance": 6.5},
+            {"name": "Hyatt Regency Casablanca", "city": "Casablanca", "price": 160.0, "rating": 4.6, "capacity": 200, "latitude": 33.5979, "longitude": -7.6019},  # 4.5 km
+            {"name": "Kenzi Tower Hotel", "city": "Casablanca", "price": 140.0, "rating": 4.3, "capacity": 160, "latitude": 33.5394, "longitude": -7.6330},  # 5.0 km
+            {"name": "Ibis Casa Voyageurs", "city": "Casablanca", "price": 70.0, "rating": 3.8, "capacity": 120, "latitude": 33.5747, "longitude": -7.7163},  # 6.5 km
             
             # Near Stade du 5 Juillet
-            {"name": "Sheraton Algiers", "price": 170.0, "rating": 4.4, "stadium": "Stade du 5 Juillet", "distance": 4.0},
-            {"name": "Sofitel Algiers", "price": 200.0, "rating": 4.8, "stadium": "Stade du 5 Juillet", "distance": 3.0},
-            {"name": "Hotel Aurassi", "price": 90.0, "rating": 3.9, "stadium": "Stade du 5 Juillet", "distance": 7.0},
+            {"name": "Sheraton Algiers", "city": "Algiers", "price": 170.0, "rating": 4.4, "capacity": 190, "latitude": 36.7885, "longitude": 3.0153},  # 4.0 km
+            {"name": "Sofitel Algiers", "city": "Algiers", "price": 200.0, "rating": 4.8, "capacity": 170, "latitude": 36.7498, "longitude": 3.0495},  # 3.0 km
+            {"name": "Hotel Aurassi", "city": "Algiers", "price": 90.0, "rating": 3.9, "capacity": 140, "latitude": 36.6913, "longitude": 2.9985},  # 7.0 km
             
             # Near Stade Abdoulaye Wade
-            {"name": "Radisson Blu Dakar", "price": 155.0, "rating": 4.5, "stadium": "Stade Abdoulaye Wade", "distance": 8.0},
-            {"name": "King Fahd Palace", "price": 250.0, "rating": 4.9, "stadium": "Stade Abdoulaye Wade", "distance": 9.0},
-            {"name": "Dakar Budget Hotel", "price": 60.0, "rating": 3.6, "stadium": "Stade Abdoulaye Wade", "distance": 12.0},
+            {"name": "Radisson Blu Dakar", "city": "Dakar", "price": 155.0, "rating": 4.5, "capacity": 160, "latitude": 14.7611, "longitude": -17.2621},  # 8.0 km
+            {"name": "King Fahd Palace", "city": "Dakar", "price": 250.0, "rating": 4.9, "capacity": 120, "latitude": 14.8085, "longitude": -17.1543},  # 9.0 km
+            {"name": "Dakar Budget Hotel", "city": "Dakar", "price": 60.0, "rating": 3.6, "capacity": 80, "latitude": 14.6762, "longitude": -17.0999},  # 12.0 km
         ]
         
-        for hotel in hotels_data:
-            # Create hotel
-            session.run(
-                "CREATE (:Hotel {name: $name, price: $price, rating: $rating})",
-                name=hotel["name"],
-                price=hotel["price"],
-                rating=hotel["rating"]
-            )
-            
-            # Create relationship with stadium
-            session.run(
-                """
-                MATCH (s:Stadium {name: $stadium})
-                MATCH (h:Hotel {name: $hotel_name})
-                CREATE (s)-[:HAS_NEARBY_HOTEL {distance_km: $distance}]->(h)
-                """,
-                stadium=hotel["stadium"],
-                hotel_name=hotel["name"],
-                distance=hotel["distance"]
-            )
+        load_batches(session, CREATE_HOTELS_QUERY, hotels_data, label="hotels")
+        print(f"Created {len(hotels_data)} hotels")
         
-        print(f"Created {len(hotels_data)} hotels with relationships")
+        # Link every stadium to the hotels within NEARBY_RADIUS_KM (distance and travel time)
+        link_nearby_hotels(session, [stadium["name"] for stadium in stadiums])
+        relationship_count = session.run(
+            "MATCH ()-[r:HAS_NEARBY_HOTEL]->() RETURN count(r) AS count"
+        ).single()["count"]
+        print(f"Created {relationship_count} HAS_NEARBY_HOTEL relationships within {NEARBY_RADIUS_KM} km")
 
 def verify_data():
     """Verify the data was created correctly"""
@@ -133,7 +133,9 @@ def verify_data():
 if __name__ == "__main__":
     print("Starting database population...")
     clear_database()
+    create_schema()
     populate_database()
+    notify_data_changed()
     verify_data()
     driver.close()
     print("\nDatabase populated successfully!")
@@ -0,0 +1,252 @@
+"""
+Query plan inspection and regression check for the Cypher catalogue
+Parses queries/queries_morocco_can.cypher (plus the queries embedded in
+app/services.py and app/bulk_loader.py), runs PROFILE on every read query and
+EXPLAIN on every write query, and records db hits, rows and the operator
+tree. Operators that usually mean a missing index or pattern problem
+(AllNodesScan, NodeByLabelScan, CartesianProduct, Eager) are flagged.
+
+Results are compared with queries/plan_baseline.json; the script exits 1
+when a query's db hits grow past the tolerance, when the baseline file is
+missing, or when a query has no baseline entry. The baseline depends on the
+data, so generate it against the seeded CAN dataset and commit it:
+
+  python scripts/profile_queries.py --seed --yes --update-baseline
+  python scripts/profile_queries.py                   # check against the baseline
+  python scripts/profile_queries.py --only "Best hotels" --tree
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.bulk_loader import NEARBY_HOTELS_BY_RADIUS_QUERY, NEARBY_RADIUS_KM, CITY_SPEED_KMH
+from app.database import get_session
+from app.dataset import COUNTRIES, HOTELS, STADIUMS
+from app.scoring import DEFAULT_WEIGHTS
+from app.services import (
+    BATCH_BEST_HOTELS_QUERY,
+    BEST_HOTELS_QUERY,
+    RANKING_EXPORT_QUERY,
+    UPDATE_HOTEL_PRICE_QUERY,
+    best_hotels_params,
+    best_hotels_query,
+)
+
+CATALOGUE = os.path.join(ROOT, "queries", "queries_morocco_can.cypher")
+BASELINE = os.path.join(ROOT, "queries", "plan_baseline.json")
+
+FLAGGED_OPERATORS = {"AllNodesScan", "NodeByLabelScan", "CartesianProduct", "Eager"}
+WRITE_CLAUSE = re.compile(r"\b(CREATE|MERGE|DELETE|SET|REMOVE|DROP|LOAD\s+CSV|FOREACH)\b", re.IGNORECASE)
+
+def service_queries():
+    """(name, query, params) for the queries the application runs"""
+    return [
+        ("service: best_hotels", BEST_HOTELS_QUERY, best_hotels_params("Morocco", None, 5, DEFAULT_WEIGHTS)),
+        ("service: best_hotels max_price", BEST_HOTELS_QUERY, best_hotels_params("Morocco", 150.0, 5, DEFAULT_WEIGHTS)),
+        ("service: best_hotels_after", *best_hotels_query("Morocco", None, 5, DEFAULT_WEIGHTS, (50.0, "", ""))[1:]),
+        ("service: best_hotels_batch", BATCH_BEST_HOTELS_QUERY, {"queries": [
+            best_hotels_params(country, None, 5, DEFAULT_WEIGHTS) for country in COUNTRIES[:3]
+        ]}),
+        ("service: ranking_export", RANKING_EXPORT_QUERY, {"countries": None}),
+        ("service: ranking_export one country", RANKING_EXPORT_QUERY, {"countries": ["Morocco"]}),
+        ("service: update_hotel_price", UPDATE_HOTEL_PRICE_QUERY, {"name": HOTELS[0]["name"], "price": HOTELS[0]["price"]}),
+        ("loader: nearby_hotels_by_radius", NEARBY_HOTELS_BY_RADIUS_QUERY, {
+            "rows": [{"stadium": STADIUMS[0]["name"]}],
+            "radius_m": NEARBY_RADIUS_KM * 1000,
+            "speed_kmh": CITY_SPEED_KMH,
+        }),
+    ]
+
+def parse_params(line):
+    """`:params {w_price: 0.4, country: "Egypt"}` -> dict (flat maps of numbers and strings only)"""
+    params = {}
+    for key, value in re.findall(r"(\w+)\s*:\s*([^,}]+)", line.split(None, 1)[1]):
+        value = value.strip()
+        if value[:1] in "\"'":
+            params[key] = value[1:-1]
+        elif value.lower() in ("true", "false"):
+            params[key] = value.lower() == "true"
+        else:
+            params[key] = float(value) if "." in value else int(value)
+    return params
+
+def catalogue_queries(path=CATALOGUE):
+    """(name, query, params) for each statement; the comment line above a query names it"""
+    queries = []
+    params = {}
+    names = {}
+    title = None
+    body = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith(":params"):
+                params.update(parse_params(stripped))
+                continue
+            if stripped.startswith("//"):
+                text = stripped.lstrip("/ ").strip()
+                # Section rulers and numbered headings are not query names
+                if not body and text and not text.startswith(("-", "=")) and not re.match(r"\d+\.\s", text):
+                    title = text
+                continue
+            if not stripped:
+                continue
+            body.append(line.rstrip())
+            if stripped.endswith(";"):
+                query = "\n".join(body).rstrip(";").strip()
+                name = f"catalogue: {title or 'query'}"
+                names[name] = names.get(name, 0) + 1
+                if names[name] > 1:
+                    name = f"{name} #{names[name]}"
+                queries.append((name, query, dict(params)))
+                body = []
+                title = None
+    return queries
+
+def operator_name(plan):
+    return plan["operatorType"].split("@")[0]
+
+def walk(plan, depth=0):
+    yield depth, plan
+    for child in plan.get("children", []):
+        yield from walk(child, depth + 1)
+
+def plan_tree(plan):
+    lines = []
+    for depth, node in walk(plan):
+        details = node.get("args", {}).get("Details", "")
+        hits = f" dbHits={node['dbHits']}" if "dbHits" in node else ""
+        rows = f" rows={node['rows']}" if "rows" in node else ""
+        lines.append(f"{'  ' * depth}{operator_name(node)}{hits}{rows}" + (f"  [{details}]" if details else ""))
+    return lines
+
+def inspect(session, name, query, params):
+    """PROFILE (or EXPLAIN for writes) one query and summarize its plan"""
+    writes = bool(WRITE_CLAUSE.search(query))
+    mode = "EXPLAIN" if writes else "PROFILE"
+    summary = session.run(f"{mode} {query}", params).consume()
+    plan = summary.profile if mode == "PROFILE" else summary.plan
+    operators = [operator_name(node) for _, node in walk(plan)]
+    return {
+        "mode": mode,
+        "db_hits": sum(node.get("dbHits", 0) for _, node in walk(plan)) if mode == "PROFILE" else None,
+        "rows": plan.get("rows") if mode == "PROFILE" else None,
+        "operators": operators,
+        "flags": sorted(set(operators) & FLAGGED_OPERATORS),
+        "tree": plan_tree(plan),
+    }
+
+def regression(current, baseline, tolerance, slack):
+    """Description of a db-hit regression, or None"""
+    if not baseline or current["db_hits"] is None or baseline.get("db_hits") is None:
+        return None
+    allowed = baseline["db_hits"] * (1 + tolerance) + slack
+    if current["db_hits"] > allowed:
+        return f"db hits {baseline['db_hits']} -> {current['db_hits']} (allowed {allowed:.0f})"
+    return None
+
+def seed():
+    from scripts.populate_morocco_can import main as populate
+    populate()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="Clear the database and load the CAN dataset first")
+    parser.add_argument("--yes", action="store_true", help="Confirm --seed may clear the database")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the current results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative db-hit growth (default 0.10)")
+    parser.add_argument("--slack", type=int, default=10, help="Allowed absolute db-hit growth on top of the tolerance")
+    parser.add_argument("--only", help="Only queries whose name contains this text")
+    parser.add_argument("--tree", action="store_true", help="Print each operator tree")
+    parser.add_argument("--list", action="store_true", help="Print the parsed queries and exit (no database needed)")
+    args = parser.parse_args()
+
+    if args.seed:
+        if not args.yes:
+            print("✗ --seed clears the database. Re-run with --yes to continue.")
+            sys.exit(1)
+        seed()
+
+    queries = catalogue_queries() + service_queries()
+    if args.only:
+        queries = [query for query in queries if args.only.lower() in query[0].lower()]
+
+    if args.list:
+        for name, query, params in queries:
+            print(f"-- {name}  {params}")
+            print(query.strip())
+            print()
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    elif not args.update_baseline:
+        # Without a baseline nothing can regress, so the check would pass on any plan
+        print(f"✗ No baseline at {os.path.relpath(args.baseline, ROOT)}; "
+              f"run with --seed --yes --update-baseline against the CAN dataset first")
+        sys.exit(1)
+
+    results = {}
+    regressions = []
+    failures = []
+    print("=" * 96)
+    print(f"{'query':<52}{'mode':<9}{'db hits':>10}{'baseline':>10}{'rows':>7}  flags")
+    print("=" * 96)
+    with get_session() as session:
+        for name, query, params in queries:
+            try:
+                result = inspect(session, name, query, params)
+            except Exception as e:
+                failures.append(name)
+                print(f"{name[:51]:<52}✗ {e}")
+                continue
+            results[name] = result
+            before = baseline.get(name, {}).get("db_hits")
+            hits = "-" if result["db_hits"] is None else result["db_hits"]
+            rows = "-" if result["rows"] is None else result["rows"]
+            print(f"{name[:51]:<52}{result['mode']:<9}{hits:>10}{'-' if before is None else before:>10}{rows:>7}  "
+                  f"{', '.join(result['flags'])}")
+            if args.tree:
+                for line in result["tree"]:
+                    print(f"    {line}")
+            problem = regression(result, baseline.get(name), args.tolerance, args.slack)
+            if problem:
+                regressions.append((name, problem))
+    print("=" * 96)
+
+    flagged = [name for name, result in results.items() if result["flags"]]
+    if flagged:
+        print(f"⚠️  {len(flagged)} queries use flagged operators ({', '.join(sorted(FLAGGED_OPERATORS))})")
+    new = [name for name in results if name not in baseline]
+
+    if args.update_baseline:
+        # With --only the other queries keep their stored entries
+        stored = dict(baseline) if args.only else {}
+        stored.update({name: {key: result[key] for key in ("mode", "db_hits", "rows", "operators")}
+                       for name, result in results.items()})
+        with open(args.baseline, "w") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"✓ Baseline written to {os.path.relpath(args.baseline, ROOT)} ({len(stored)} queries)")
+        return
+
+    for name, problem in regressions:
+        print(f"✗ {name}: {problem}")
+    for name in new:
+        print(f"✗ {name}: no baseline entry (re-run with --update-baseline)")
+    if failures:
+        print(f"✗ {len(failures)} queries failed to run")
+    if regressions or new or failures:
+        sys.exit(1)
+    print(f"✓ {len(results)} queries within {args.tolerance:.0%} (+{args.slack}) of the baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Conformance and parity test for the recommendation backends
+Runs the same query workload (countries x price caps x limits x weight
+profiles x normalization) through every selected backend's sync, async and
+batch paths, checks each row against the HotelResponse schema, asserts every
+backend returns the same rows as the first one, and reports per-backend
+latency. The mock backend serves different sample data, so it is only
+checked for conformance.
+
+It also walks /best-hotels page by page through X-Next-Cursor style cursors
+(async and batch paths) and checks every backend returns the same pages,
+and that each backend's pages add up to its unpaged ranking. That pits the
+seek implementations against each other: the Cypher seek (neo4j), the
+ranking bisect and CandidateStore.after_mask (neo4j-rankings) and the graph
+filter (memory).
+
+Finally it races holds on each backend: one hold released twice at once,
+and an expired hold released while the expiry runs. Exactly one side may
+win, capacity must come back exactly once, and on Neo4j no Hotel may be
+left with the `_lock` property the hold queries take.
+
+  python scripts/test_backend_parity.py                      # memory vs Neo4j (Cypher and materialized)
+  python scripts/test_backend_parity.py --backends memory mock
+"""
+import argparse
+import asyncio
+import math
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Measure the backends themselves, not the result cache
+os.environ.setdefault("RESULT_CACHE_SIZE", "0")
+
+from app.backends import MemoryBackend, MockBackend, Neo4jBackend, RecommendationBackend
+from app.database import get_async_session
+from app.dataset import COUNTRIES
+from app.pagination import decode_cursor, paginate
+from app.schemas import HotelResponse
+from app.scoring import NORMALIZATIONS, Weights
+
+VARIANTS = {
+    "neo4j": lambda: Neo4jBackend(materialize=False),
+    "neo4j-rankings": lambda: Neo4jBackend(materialize=True),
+    "memory": MemoryBackend,
+    "mock": MockBackend,
+}
+# Backends whose data is not the populated dataset
+CONFORMANCE_ONLY = {"mock"}
+
+WEIGHT_PROFILES = [Weights(), Weights(1.0, 0.0, 0.0), Weights(0.1, 2.0, 5.0)]
+SCORE_TOLERANCE = 1e-6
+# Rounds of each hold race per backend
+HOLD_RACES = 20
+# Cursor walks: small pages so every country spans several of them
+PAGE_SIZE = 3
+FULL_RANKING = 10000
+MAX_PAGES = 1000
+
+def workload():
+    """Every combination of the query parameters, plus an unknown country"""
+    return [
+        {"country": country, "max_price": max_price, "limit": limit, "weights": weights, "normalize": normalize}
+        for country in COUNTRIES + ["Atlantis"]
+        for max_price in (None, 100.0, 150.0, 250.0)
+        for limit in (1, 5, 20)
+        for weights in WEIGHT_PROFILES
+        for normalize in NORMALIZATIONS
+    ]
+
+def cursor_workload():
+    """Queries to walk page by page (raw and normalized scores, with and without a price cap)"""
+    return [
+        {"country": country, "max_price": max_price, "weights": weights, "normalize": normalize}
+        for country in COUNTRIES + ["Atlantis"]
+        for max_price in (None, 150.0)
+        for weights in (WEIGHT_PROFILES[0], WEIGHT_PROFILES[2])
+        for normalize in ("none", "minmax")
+    ]
+
+def query_args(query):
+    return query["country"], query["max_price"], query["limit"], query["weights"], query["normalize"]
+
+async def walk_pages(backend, query):
+    """Pages of one query following cursors like a /best-hotels client: (async pages, batch pages, unpaged rows)"""
+    country, max_price, weights, normalize = (query[key] for key in ("country", "max_price", "weights", "normalize"))
+    fingerprint = (country, max_price, weights, normalize)
+    pages, batch_pages = [], []
+    after = None
+    while len(pages) < MAX_PAGES:
+        # One row more than the page shows whether another page follows
+        rows = await backend.best_hotels_async(country, max_price, PAGE_SIZE + 1, weights, normalize, after)
+        batch = await backend.best_hotels_batch_async([dict(query, limit=PAGE_SIZE + 1, after=after)])
+        page, cursor = paginate(rows, PAGE_SIZE, *fingerprint)
+        pages.append(page)
+        batch_pages.append(batch.get(country, [])[:PAGE_SIZE])
+        if cursor is None:
+            break
+        after = decode_cursor(cursor, *fingerprint)
+    full = await backend.best_hotels_async(country, max_price, FULL_RANKING, weights, normalize)
+    return pages, batch_pages, full
+
+async def run_backend(name, queries):
+    """Results and per-call latencies for each access path of one backend"""
+    backend = VARIANTS[name]()
+    if not isinstance(backend, RecommendationBackend):
+        raise TypeError(f"{name} does not implement RecommendationBackend")
+    await backend.start()
+    try:
+        results = {"sync": [], "async": []}
+        latencies = {"sync": [], "async": [], "batch": []}
+        for query in queries:
+            start = time.perf_counter()
+            results["sync"].append(backend.best_hotels(*query_args(query)))
+            latencies["sync"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            results["async"].append(await backend.best_hotels_async(*query_args(query)))
+            latencies["async"].append(time.perf_counter() - start)
+
+        # Batches must not repeat a country, so group one query per country
+        batch_results = {}
+        for offset in range(0, len(queries), len(COUNTRIES) + 1):
+            batch = queries[offset:offset + len(COUNTRIES) + 1]
+            start = time.perf_counter()
+            answer = await backend.best_hotels_batch_async(batch)
+            latencies["batch"].append(time.perf_counter() - start)
+            for i, query in enumerate(batch):
+                batch_results[offset + i] = answer.get(query["country"], [])
+        results["batch"] = [batch_results[i] for i in range(len(queries))]
+
+        hold_errors = await hold_race_errors(name, backend)
+
+        walks = []
+        for query in cursor_workload():
+            start = time.perf_counter()
+            walks.append(await walk_pages(backend, query))
+            latencies.setdefault("walk", []).append(time.perf_counter() - start)
+        return results, latencies, walks, hold_errors
+    finally:
+        await backend.close()
+
+def batch_order(queries):
+    """Reorder the workload so consecutive slices hold each country exactly once"""
+    groups = {}
+    for query in queries:
+        key = (query["max_price"], query["limit"], query["weights"], query["normalize"])
+        groups.setdefault(key, []).append(query)
+    return [query for group in groups.values() for query in group]
+
+def conformance_errors(name, results):
+    errors = []
+    for path, answers in results.items():
+        for answer in answers:
+            for row in answer:
+                try:
+                    HotelResponse(**row)
+                except Exception as e:
+                    errors.append(f"{name}/{path}: row {row} does not match HotelResponse ({e})")
+                    break
+    return errors
+
+def rows_differ(expected, actual):
+    if len(expected) != len(actual):
+        return f"{len(expected)} rows vs {len(actual)}"
+    for position, (a, b) in enumerate(zip(expected, actual)):
+        for field in ("name", "stadium_name", "city", "price", "rating", "distance_km"):
+            if a[field] != b[field]:
+                return f"row {position} {field}: {a[field]!r} vs {b[field]!r}"
+        if not math.isclose(a["score"], b["score"], rel_tol=SCORE_TOLERANCE, abs_tol=SCORE_TOLERANCE):
+            return f"row {position} score: {a['score']} vs {b['score']}"
+    return None
+
+def parity_errors(reference, name, results, expected, queries):
+    errors = []
+    for path, answers in results.items():
+        for query, want, got in zip(queries, expected, answers):
+            difference = rows_differ(want, got)
+            if difference:
+                errors.append(f"{name}/{path} vs {reference}/sync for {query}: {difference}")
+    return errors
+
+async def stray_locks(backend):
+    """Hotels left with the hold queries' _lock property (Neo4j only)"""
+    if backend.name != "neo4j":
+        return 0
+    async with get_async_session() as session:
+        result = await session.run("MATCH (h:Hotel) WHERE h._lock IS NOT NULL RETURN count(h) AS locked")
+        return (await result.single())["locked"]
+
+async def hold_race_errors(name, backend):
+    """Double release and release-vs-expiry on one hotel: one winner, capacity restored exactly once"""
+    errors = []
+    hotel = (await backend.best_hotels_async("Morocco", limit=1))[0]["name"]
+    probe = await backend.place_hold(hotel, 1)
+    capacity = probe["remaining_capacity"] + 1
+    await backend.release_hold(probe["id"])
+
+    for _ in range(HOLD_RACES):
+        hold = await backend.place_hold(hotel, 1)
+        first, second = await asyncio.gather(backend.release_hold(hold["id"]), backend.release_hold(hold["id"]))
+        if (first is None) == (second is None):
+            errors.append(f"{name}: double release of one hold returned {first} and {second}")
+
+        # A TTL of 0 is expired as soon as it is written
+        hold = await backend.place_hold(hotel, 1, 0)
+        released, expired = await asyncio.gather(backend.release_hold(hold["id"]), backend.expire_holds())
+        if released is not None and expired:
+            errors.append(f"{name}: hold both released and expired")
+        if released is None and not expired:
+            errors.append(f"{name}: hold neither released nor expired")
+
+    check = await backend.place_hold(hotel, 1)
+    await backend.release_hold(check["id"])
+    if check["remaining_capacity"] + 1 != capacity:
+        errors.append(f"{name}: {hotel} capacity {check['remaining_capacity'] + 1} after the races, expected {capacity}")
+    locked = await stray_locks(backend)
+    if locked:
+        errors.append(f"{name}: {locked} hotels left with a _lock property")
+    return errors
+
+def walk_errors(name, walks):
+    """A backend's own pages must agree between paths and add up to its unpaged ranking"""
+    errors = []
+    for query, (pages, batch_pages, full) in zip(cursor_workload(), walks):
+        for number, (page, batch_page) in enumerate(zip(pages, batch_pages), 1):
+            difference = rows_differ(page, batch_page)
+            if difference:
+                errors.append(f"{name}/batch page {number} vs async for {query}: {difference}")
+        if len(pages) == MAX_PAGES:
+            errors.append(f"{name}: cursor walk for {query} did not end after {MAX_PAGES} pages")
+        difference = rows_differ(full, [row for page in pages for row in page])
+        if difference:
+            errors.append(f"{name}: pages vs unpaged ranking for {query}: {difference}")
+    return errors
+
+def walk_parity_errors(reference, name, walks, expected):
+    errors = []
+    for query, (want, _, _), (got, _, _) in zip(cursor_workload(), expected, walks):
+        if len(want) != len(got):
+            errors.append(f"{name} vs {reference} for {query}: {len(got)} pages vs {len(want)}")
+            continue
+        for number, (a, b) in enumerate(zip(want, got), 1):
+            difference = rows_differ(a, b)
+            if difference:
+                errors.append(f"{name} vs {reference} page {number} for {query}: {difference}")
+                break
+    return errors
+
+def report(name, latencies):
+    print(f"\n{name}")
+    for path, samples in latencies.items():
+        ordered = sorted(samples)
+        p99 = ordered[max(0, round(0.99 * len(ordered)) - 1)]
+        print(f"  {path:<6} calls={len(samples):<5} p50={statistics.median(ordered) * 1000:8.3f} ms  "
+              f"p99={p99 * 1000:8.3f} ms  mean={statistics.mean(ordered) * 1000:8.3f} ms")
+
+async def run(backends):
+    queries = batch_order(workload())
+    print("=" * 72)
+    print(f"BACKEND PARITY: {', '.join(backends)} ({len(queries)} queries)")
+    print("=" * 72)
+
+    errors = []
+    reference = None
+    timings = {}
+    for name in backends:
+        try:
+            results, latencies, walks, hold_errors = await run_backend(name, queries)
+        except Exception as e:
+            print(f"✗ {name}: could not run ({e})")
+            errors.append(f"{name}: {e}")
+            continue
+        timings[name] = latencies
+        backend_errors = conformance_errors(name, results) + walk_errors(name, walks) + hold_errors
+        if name not in CONFORMANCE_ONLY:
+            if reference is None:
+                reference = (name, results["sync"], walks)
+            backend_errors += parity_errors(reference[0], name, results, reference[1], queries)
+            backend_errors += walk_parity_errors(reference[0], name, walks, reference[2])
+        if backend_errors:
+            print(f"✗ {name}: {len(backend_errors)} mismatches")
+            for error in backend_errors[:5]:
+                print(f"    {error}")
+        else:
+            checked = "conformance" if name in CONFORMANCE_ONLY else f"parity with {reference[0]}"
+            print(f"✓ {name}: {checked} on sync, async and batch paths, {len(walks)} cursor walks "
+                  f"and {2 * HOLD_RACES} hold races")
+        errors += backend_errors
+
+    print("\nLATENCY PER CALL")
+    for name, latencies in timings.items():
+        report(name, latencies)
+    print("=" * 72)
+    return errors
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", choices=list(VARIANTS),
+                        default=["memory", "neo4j", "neo4j-rankings"], help="Backends to compare (first is the reference)")
+    args = parser.parse_args()
+
+    errors = asyncio.run(run(args.backends))
+    if errors:
+        print(f"✗ {len(errors)} problems found")
+        sys.exit(1)
+    print("✓ All backends agree")
+
+if __name__ == "__main__":
+    main()